@@ -0,0 +1,73 @@
+"""
+Cancelamento cooperativo de operações longas (processamento e exportação).
+A interface cria um CancellationToken e o repassa à operação, que verifica
+o token em pontos seguros e interrompe com OperationCancelled.
+Recursos que não verificam o token (ex: processos de trabalho) registram um
+callback com add_callback para serem encerrados imediatamente no cancelamento.
+"""
+import threading
+
+
+class OperationCancelled(Exception):
+    """Operação interrompida a pedido do usuário."""
+    pass
+
+
+class CancellationToken:
+    """
+    Sinal de cancelamento compartilhado entre a interface e a thread de trabalho.
+    """
+    
+    def __init__(self):
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._callbacks = []
+    
+    def cancel(self):
+        """Solicita o cancelamento da operação e executa os callbacks registrados."""
+        with self._lock:
+            if self._event.is_set():
+                return
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception:
+                # Um callback com erro não deve impedir os demais
+                pass
+    
+    def add_callback(self, callback):
+        """
+        Registra uma função chamada (uma única vez) quando o token for cancelado.
+        Se o token já estiver cancelado, a função é chamada imediatamente.
+        
+        Args:
+            callback: Função sem argumentos (ex: pool.terminate)
+        """
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return
+        callback()
+    
+    def remove_callback(self, callback):
+        """Remove um callback registrado (ex: quando o recurso já foi liberado)."""
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+    
+    @property
+    def cancelled(self) -> bool:
+        """True se o cancelamento foi solicitado."""
+        return self._event.is_set()
+    
+    def raise_if_cancelled(self):
+        """
+        Interrompe a operação se o cancelamento foi solicitado.
+        
+        Raises:
+            OperationCancelled: Se o token foi cancelado
+        """
+        if self._event.is_set():
+            raise OperationCancelled("Operação cancelada pelo usuário")
@@ -0,0 +1,205 @@
+"""
+Persistência colunar (Feather/Parquet) dos resultados processados.
+Permite recarregar sessões anteriores e combinar vários dias de resultados
+sem reprocessar PDFs nem ler arquivos Excel.
+"""
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from data_processor import calculate_seller_statistics
+
+# Tentar importar pyarrow (opcional, necessário para Feather/Parquet)
+try:
+    import pyarrow.feather as feather
+    import pyarrow.parquet as parquet
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# Importar logger
+try:
+    from logger import get_logger
+    logger = get_logger()
+except ImportError:
+    # Se logger não estiver disponível, criar um logger silencioso
+    class DummyLogger:
+        def info(self, *args, **kwargs): pass
+        def debug(self, *args, **kwargs): pass
+        def warning(self, *args, **kwargs): pass
+        def error(self, *args, **kwargs): pass
+        def separador(self, *args, **kwargs): pass
+    logger = DummyLogger()
+
+
+# Sufixos dos arquivos gerados a partir do nome base
+RECEIPTS_SUFFIX = '.recibos'
+STATS_SUFFIX = '.estatisticas'
+FORMAT_EXTENSIONS = {'feather': '.feather', 'parquet': '.parquet'}
+
+
+def _require_pyarrow():
+    """Garante que pyarrow está disponível."""
+    if not PYARROW_AVAILABLE:
+        raise ImportError(
+            "pyarrow não está instalado.\n"
+            "Instale com: pip install pyarrow"
+        )
+
+
+def _base_path(path) -> Path:
+    """
+    Remove extensões conhecidas do caminho para obter o nome base.
+    Ex: "dia.xlsx", "dia.recibos.feather" -> "dia"
+    """
+    path = Path(path)
+    name = path.name
+    for ext in ['.xlsx'] + list(FORMAT_EXTENSIONS.values()):
+        if name.lower().endswith(ext):
+            name = name[:-len(ext)]
+            break
+    for suffix in (RECEIPTS_SUFFIX, STATS_SUFFIX):
+        if name.endswith(suffix):
+            name = name[:-len(suffix)]
+            break
+    return path.with_name(name)
+
+
+def results_paths(path, formato: str = 'feather') -> Tuple[Path, Path]:
+    """
+    Retorna os caminhos dos arquivos de recibos e de estatísticas para um nome base.
+    
+    Args:
+        path: Caminho base (pode ser o .xlsx exportado ou um dos arquivos colunares)
+        formato: 'feather' ou 'parquet'
+    
+    Returns:
+        Tupla (caminho_recibos, caminho_estatisticas)
+    """
+    ext = FORMAT_EXTENSIONS[formato]
+    base = _base_path(path)
+    return (base.with_name(base.name + RECEIPTS_SUFFIX + ext),
+            base.with_name(base.name + STATS_SUFFIX + ext))
+
+
+def _receipts_file(path: Path, formato: str) -> Path:
+    """
+    Arquivo de recibos de um resultado gravado: "<nome>.recibos.<ext>" (save_results) ou,
+    se ele não existir, o próprio arquivo informado (exportação Parquet com o nome escolhido).
+    """
+    receipts_path, _ = results_paths(path, formato)
+    if not receipts_path.exists() and path.exists() and not path.stem.endswith(STATS_SUFFIX):
+        return path
+    return receipts_path
+
+
+def write_table(df: pd.DataFrame, path: Path, formato: str):
+    """Grava um DataFrame no formato colunar escolhido."""
+    df = df.reset_index(drop=True)
+    if formato == 'feather':
+        # Sem compressão para permitir leitura por memory-map (sem cópia)
+        feather.write_feather(df, str(path), compression='uncompressed')
+    else:
+        df.to_parquet(path, index=False)
+
+
+def read_table(path: Path, memory_map: bool = True) -> pd.DataFrame:
+    """Lê um arquivo colunar (formato detectado pela extensão)."""
+    if path.suffix.lower() == FORMAT_EXTENSIONS['feather']:
+        return feather.read_table(str(path), memory_map=memory_map).to_pandas()
+    return parquet.read_table(str(path), memory_map=memory_map).to_pandas()
+
+
+def save_results(df: pd.DataFrame, df_stats: Optional[pd.DataFrame], path, formato: str = 'feather') -> Dict[str, str]:
+    """
+    Grava o DataFrame processado e as estatísticas em formato colunar.
+    
+    Args:
+        df: DataFrame processado (aba Recibos)
+        df_stats: Estatísticas por vendedor (opcional)
+        path: Caminho base, por exemplo o .xlsx exportado ("dia.xlsx" -> "dia.recibos.feather")
+        formato: 'feather' (padrão, permite memory-map) ou 'parquet'
+    
+    Returns:
+        Dicionário com os caminhos gravados ('recibos' e, se houver, 'estatisticas')
+    """
+    _require_pyarrow()
+    if formato not in FORMAT_EXTENSIONS:
+        raise ValueError(f"Formato colunar desconhecido: {formato}")
+    
+    receipts_path, stats_path = results_paths(path, formato)
+    receipts_path.parent.mkdir(parents=True, exist_ok=True)
+    
+    write_table(df, receipts_path, formato)
+    written = {'recibos': str(receipts_path)}
+    
+    if df_stats is not None and not df_stats.empty:
+        write_table(df_stats, stats_path, formato)
+        written['estatisticas'] = str(stats_path)
+    
+    logger.info(f"Resultados gravados em formato {formato}: {', '.join(written.values())}")
+    return written
+
+
+def load_results(path, memory_map: bool = True) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Recarrega resultados gravados por save_results (ou exportados pelo backend Parquet).
+    Se o arquivo de estatísticas não existir, as estatísticas são recalculadas.
+    
+    Args:
+        path: Caminho de um dos arquivos gravados (ou o nome base / .xlsx correspondente)
+        memory_map: Se True, usa memory-map na leitura
+    
+    Returns:
+        Tupla (DataFrame processado, estatísticas por vendedor)
+    """
+    _require_pyarrow()
+    path = Path(path)
+    formato = 'parquet' if path.suffix.lower() == FORMAT_EXTENSIONS['parquet'] else 'feather'
+    _, stats_path = results_paths(path, formato)
+    receipts_path = _receipts_file(path, formato)
+    
+    df = read_table(receipts_path, memory_map)
+    if stats_path.exists():
+        df_stats = read_table(stats_path, memory_map)
+    else:
+        df_stats = calculate_seller_statistics(df)
+    
+    logger.info(f"Resultados recarregados de {receipts_path}: {len(df)} linha(s)")
+    return df, df_stats
+
+
+def merge_results(paths: List, memory_map: bool = True) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Combina resultados de várias sessões gravadas e recalcula as estatísticas.
+    Recibos presentes em mais de um arquivo (relatórios diários e mensais se sobrepõem)
+    são mantidos apenas na primeira ocorrência.
+    
+    Args:
+        paths: Lista de caminhos (qualquer um dos arquivos de cada sessão)
+        memory_map: Se True, usa memory-map na leitura
+    
+    Returns:
+        Tupla (DataFrame combinado, estatísticas por vendedor)
+    """
+    _require_pyarrow()
+    frames = []
+    seen = set()
+    
+    for path in paths:
+        path = Path(path)
+        formato = 'parquet' if path.suffix.lower() == FORMAT_EXTENSIONS['parquet'] else 'feather'
+        df = read_table(_receipts_file(path, formato), memory_map)
+        if 'Nº Recibo' in df.columns:
+            numeros = df['Nº Recibo'].astype(str)
+            df = df[~numeros.isin(seen)]
+            seen.update(numeros.unique())
+        frames.append(df)
+    
+    if not frames:
+        return pd.DataFrame(), pd.DataFrame()
+    
+    merged = pd.concat(frames, ignore_index=True)
+    logger.info(f"{len(frames)} sessão(ões) combinadas: {len(merged)} linha(s)")
+    return merged, calculate_seller_statistics(merged)
@@ -1,6 +1,7 @@
 """
 Módulo para processamento e estruturação de dados extraídos de PDFs.
 """
+import numpy as np
 import pandas as pd
 import re
 from typing import Dict, List, Optional, Tuple
@@ -20,6 +21,125 @@ except ImportError:
     logger = DummyLogger()
 
 
+# Escalas da representação inteira dos valores:
+# - 'Valor Unitário' e totais monetários são guardados em centavos (int64)
+# - 'Quantidade' é guardada em milésimos de unidade (int64), como no PDF (2,000)
+# - Preços por MG são guardados em milésimos de centavo: com muitos MG por unidade, o
+#   preço por MG é uma fração de centavo e arredondá-lo para centavos o zeraria
+# A conversão para formato de exibição acontece apenas nos exportadores e no preview.
+CENTS_SCALE = 100
+QUANTITY_SCALE = 1000
+PRICE_PER_MG_SCALE = CENTS_SCALE * QUANTITY_SCALE
+
+
+def _scale_digits(scale: int) -> int:
+    """Retorna o número de casas decimais de uma escala (100 -> 2, 1000 -> 3)."""
+    return len(str(scale)) - 1
+
+
+def _round_div(numerator, denominator):
+    """
+    Divisão inteira com arredondamento "meio para cima" (vetorizada).
+    
+    Args:
+        numerator: Array/Series de inteiros
+        denominator: Array/Series de inteiros positivos
+        
+    Returns:
+        Array de inteiros int64
+    """
+    numerator = np.asarray(numerator, dtype=np.int64)
+    denominator = np.asarray(denominator, dtype=np.int64)
+    return (2 * numerator + denominator) // (2 * denominator)
+
+
+def parse_brazilian_scaled(values: pd.Series, scale: int) -> pd.Series:
+    """
+    Converte números no formato brasileiro (1.080,00) para inteiros escalados.
+    A conversão é feita sobre os dígitos da string, sem passar por float,
+    portanto é exata. Casas decimais além da escala são arredondadas.
+    
+    Exemplos (scale=100):
+        "1.080,00" -> 108000
+        "900,000"  -> 90000
+        ""         -> 0
+    
+    Args:
+        values: Series com os valores (strings no formato brasileiro ou números em unidades)
+        scale: Escala inteira (CENTS_SCALE ou QUANTITY_SCALE)
+        
+    Returns:
+        Series int64 com os valores escalados (valores inválidos viram 0)
+    """
+    if pd.api.types.is_numeric_dtype(values):
+        # Valores já numéricos (em unidades): apenas escalar e arredondar
+        return (pd.to_numeric(values, errors='coerce').fillna(0) * scale).round().astype('int64')
+    
+    digits = _scale_digits(scale)
+    text = values.astype(str).str.strip().str.replace('.', '', regex=False)
+    parts = text.str.extract(r'^(-?)(\d+)(?:,(\d*))?$')
+    
+    inteiro = pd.to_numeric(parts[1], errors='coerce').fillna(0).astype('int64')
+    # Completar a parte decimal com zeros até (casas + 1) dígitos; o último serve para arredondar
+    fracao = parts[2].fillna('').astype(str).str.ljust(digits + 1, '0')
+    decimais = pd.to_numeric(fracao.str[:digits], errors='coerce').fillna(0).astype('int64') if digits else 0
+    arredonda = (fracao.str[digits] >= '5').astype('int64')
+    
+    result = inteiro * scale + decimais + arredonda
+    result = result.where(parts[0] != '-', -result)
+    result = result.where(parts[1].notna(), 0)
+    return result.astype('int64')
+
+
+def to_scaled(values: pd.Series, scale: int) -> pd.Series:
+    """
+    Garante a representação inteira escalada de uma coluna.
+    Colunas inteiras já estão escaladas e são mantidas; floats (em unidades)
+    e strings (formato brasileiro) são convertidos com parse_brazilian_scaled.
+    
+    Args:
+        values: Series com os valores
+        scale: Escala inteira (CENTS_SCALE ou QUANTITY_SCALE)
+        
+    Returns:
+        Series int64 com os valores escalados
+    """
+    if pd.api.types.is_integer_dtype(values):
+        return values.astype('int64')
+    return parse_brazilian_scaled(values, scale)
+
+
+def format_brazilian_scaled(values: pd.Series, scale: int) -> pd.Series:
+    """
+    Formata inteiros escalados no formato brasileiro para exibição.
+    Valores zero ou ausentes viram string vazia.
+    
+    Exemplos:
+        108000 (scale=100)  -> "1.080,00"
+        2000   (scale=1000) -> "2,000"
+    
+    Args:
+        values: Series de inteiros escalados
+        scale: Escala inteira (CENTS_SCALE ou QUANTITY_SCALE)
+        
+    Returns:
+        Series de strings formatadas
+    """
+    digits = _scale_digits(scale)
+    numeric = pd.to_numeric(values, errors='coerce').fillna(0).astype('int64')
+    absolute = numeric.abs()
+    inteiro = (absolute // scale).map('{:,}'.format).str.replace(',', '.', regex=False)
+    decimais = (absolute % scale).astype(str).str.zfill(digits)
+    sinal = pd.Series(np.where(numeric < 0, '-', ''), index=values.index)
+    formatted = sinal + inteiro + ',' + decimais
+    return formatted.where(numeric != 0, '')
+
+
+def scaled_to_float(values: pd.Series, scale: int) -> pd.Series:
+    """Converte inteiros escalados para float em unidades (ex: centavos -> reais)."""
+    return pd.to_numeric(values, errors='coerce').fillna(0) / scale
+
+
 def extract_mg_from_product(product_name: str) -> float:
     """
     Extrai o valor de MG do nome do produto.
@@ -144,7 +264,8 @@ def normalize_data(receipt_data: Dict) -> pd.DataFrame:
             'Cliente': receipt_data.get('cliente', ''),
             'Descrição do Produto': '',
             'Quantidade': '',
-            'Valor Unitário': ''
+            'Valor Unitário': '',
+            'Data da Venda': receipt_data.get('data_venda') or ''
         })
     else:
         # Criar uma linha para cada produto
@@ -167,7 +288,8 @@ def normalize_data(receipt_data: Dict) -> pd.DataFrame:
                 'Cliente': receipt_data.get('cliente', ''),
                 'Descrição do Produto': descricao_limpa,
                 'Quantidade': quantidade_original,
-                'Valor Unitário': valor_original
+                'Valor Unitário': valor_original,
+                'Data da Venda': receipt_data.get('data_venda') or ''
             })
             
             logger.debug(f"Produto {idx} normalizado: Qtd='{quantidade_original}', Valor='{valor_original}', Desc='{descricao_limpa[:50]}...'")
@@ -203,30 +325,27 @@ def clean_data(df: pd.DataFrame) -> pd.DataFrame:
             df[col] = df[col].replace('nan', '')
             df[col] = df[col].replace('None', '')
     
-    # Converter valores numéricos
+    # Converter valores numéricos para inteiros escalados (exatos)
     if 'Quantidade' in df.columns:
-        # Manter quantidade como string original (formato brasileiro: 2,000)
-        # Apenas limpar espaços e valores inválidos, mas preservar zeros válidos
-        quantidade_antes = df['Quantidade'].copy()
-        df['Quantidade'] = df['Quantidade'].astype(str).str.strip()
-        df['Quantidade'] = df['Quantidade'].replace('nan', '').replace('None', '')
-        # Log se houve mudanças
-        mudancas_qtd = (quantidade_antes.astype(str) != df['Quantidade']).any()
-        if mudancas_qtd:
-            logger.debug(f"Mudanças detectadas na coluna Quantidade durante limpeza")
+        # Quantidade no formato brasileiro (2,000) -> milésimos de unidade (2000)
+        quantidade_antes = df['Quantidade'].copy().astype(str)
+        df['Quantidade'] = to_scaled(df['Quantidade'], QUANTITY_SCALE)
+        
+        for idx in range(min(5, len(df))):
+            logger.debug(f"Linha {idx}: Quantidade convertida - Original: '{quantidade_antes.iloc[idx]}' -> Milésimos: {df['Quantidade'].iloc[idx]}")
     
     if 'Valor Unitário' in df.columns:
-        # Converter formato brasileiro (1.080,00) para float
+        # Valor no formato brasileiro (1.080,00) -> centavos (108000)
         valor_antes = df['Valor Unitário'].copy().astype(str)
-        df['Valor Unitário'] = df['Valor Unitário'].astype(str).str.replace('.', '', regex=False).str.replace(',', '.', regex=False)
-        df['Valor Unitário'] = pd.to_numeric(df['Valor Unitário'], errors='coerce').fillna(0.0)
+        df['Valor Unitário'] = to_scaled(df['Valor Unitário'], CENTS_SCALE)
         
         # Log de conversão de valores
         for idx in range(min(5, len(df))):
-            valor_antigo = valor_antes.iloc[idx] if idx < len(valor_antes) else ''
-            valor_novo = df['Valor Unitário'].iloc[idx]
-            if str(valor_antigo) != str(valor_novo):
-                logger.debug(f"Linha {idx}: Valor convertido - Original: '{valor_antigo}' -> Numérico: {valor_novo}")
+            logger.debug(f"Linha {idx}: Valor convertido - Original: '{valor_antes.iloc[idx]}' -> Centavos: {df['Valor Unitário'].iloc[idx]}")
+    
+    if 'Data da Venda' in df.columns:
+        # Data/hora da venda (ISO) -> datetime64 (vazio vira NaT)
+        df['Data da Venda'] = pd.to_datetime(df['Data da Venda'], format='ISO8601', errors='coerce')
     
     logger.debug(f"Limpando dados - DataFrame tem {len(df)} linhas DEPOIS da limpeza")
     return df
@@ -266,28 +385,25 @@ def post_validate_and_clean(df: pd.DataFrame) -> pd.DataFrame:
         descricao_str = pd.Series([''] * len(df_clean))
     
     if 'Quantidade' in df_clean.columns:
-        quantidade_str = df_clean['Quantidade'].astype(str).str.strip()
-        # Remover valores inválidos
-        quantidade_str = quantidade_str.replace('nan', '').replace('None', '').replace('', pd.NA)
+        quantidade = to_scaled(df_clean['Quantidade'], QUANTITY_SCALE)
     else:
-        quantidade_str = pd.Series([pd.NA] * len(df_clean))
+        quantidade = pd.Series([0] * len(df_clean), index=df_clean.index)
     
     if 'Valor Unitário' in df_clean.columns:
-        # Para valor unitário, verificar se é 0 ou vazio
-        valor_unitario = df_clean['Valor Unitário']
-        # Converter para numérico se necessário
-        if valor_unitario.dtype == 'object':
-            valor_unitario = pd.to_numeric(valor_unitario, errors='coerce')
+        # Para valor unitário (centavos), verificar se é 0 ou vazio
+        valor_unitario = to_scaled(df_clean['Valor Unitário'], CENTS_SCALE)
     else:
-        valor_unitario = pd.Series([0.0] * len(df_clean))
+        valor_unitario = pd.Series([0] * len(df_clean), index=df_clean.index)
     
-    # Criar máscara: linha é válida se tem descrição E (quantidade OU valor unitário > 0)
+    # Criar máscara: linha é válida se tem descrição E (quantidade informada OU valor unitário > 0)
     # Remover linhas onde:
     # - Descrição está vazia, ou
     # - Tanto quantidade quanto valor unitário estão vazios/zero
+    # Em milésimos, quantidade vazia e "0,000" são ambas 0: qualquer quantidade diferente de zero
+    # (inclusive negativa) conta como informada
     tem_descricao = (descricao_str != '') & (descricao_str != 'nan') & descricao_str.notna()
-    tem_quantidade = quantidade_str.notna()
-    tem_valor = (valor_unitario > 0) & valor_unitario.notna()
+    tem_quantidade = quantidade != 0
+    tem_valor = valor_unitario > 0
     
     # Linha é válida se tem descrição E (tem quantidade OU tem valor)
     linhas_validas = tem_descricao & (tem_quantidade | tem_valor)
@@ -338,15 +454,19 @@ def process_receipt_data(receipt_data: Dict) -> pd.DataFrame:
     return df
 
 
-def process_multiple_receipts(receipts_data: List[Dict]) -> pd.DataFrame:
+def process_multiple_receipts(receipts_data: List[Dict], cancel_token=None) -> pd.DataFrame:
     """
     Processa múltiplos recibos e retorna um único DataFrame.
     
     Args:
         receipts_data: Lista de dicionários com dados extraídos de cada recibo
+        cancel_token: CancellationToken (opcional), verificado a cada recibo
         
     Returns:
         DataFrame pandas com todos os recibos processados
+        
+    Raises:
+        OperationCancelled: Se o cancelamento for solicitado
     """
     logger.separador("PROCESSAMENTO DE MÚLTIPLOS RECIBOS")
     logger.info(f"Processando {len(receipts_data)} recibos...")
@@ -354,6 +474,8 @@ def process_multiple_receipts(receipts_data: List[Dict]) -> pd.DataFrame:
     all_dfs = []
     
     for idx, receipt_data in enumerate(receipts_data, 1):
+        if cancel_token is not None:
+            cancel_token.raise_if_cancelled()
         recibo_num = receipt_data.get('numero', 'N/A')
         num_produtos = len(receipt_data.get('produtos', []))
         logger.debug(f"Processando recibo {idx}/{len(receipts_data)}: Nº {recibo_num} - {num_produtos} produtos")
@@ -387,96 +509,208 @@ def process_multiple_receipts(receipts_data: List[Dict]) -> pd.DataFrame:
         return pd.DataFrame()
 
 
-def calculate_seller_statistics(df: pd.DataFrame) -> pd.DataFrame:
+# Colunas dos agregados por vendedor/produto (somáveis, permitem combinar lotes sem reler as linhas)
+AGGREGATE_COLUMNS = ['Vendedor', 'Produto', 'Quantidade_Mil', 'Valor_Total_Linha', 'MG_Mil',
+                     'Preco_Min_MG_Mil', 'Preco_Max_MG_Mil']
+
+
+def seller_aggregates(df: pd.DataFrame) -> pd.DataFrame:
     """
-    Calcula estatísticas agrupadas por vendedor e produto.
+    Calcula os agregados por vendedor e produto, em inteiros, a partir das linhas processadas.
+    Agregados de lotes diferentes podem ser combinados com merge_seller_aggregates.
     
     Args:
         df: DataFrame com dados dos recibos processados
         
     Returns:
-        DataFrame com estatísticas por vendedor:
-        - Vendedor
-        - Produto
-        - Quantidade Total
-        - Valor Total
-        - Preço Médio por MG
-        - Preço Mínimo por MG
-        - Preço Máximo por MG
+        DataFrame com as colunas de AGGREGATE_COLUMNS:
+        - Quantidade_Mil: soma das quantidades (milésimos)
+        - Valor_Total_Linha: soma de quantidade × valor unitário (milésimos × centavos)
+        - MG_Mil: MG do produto (milésimos de MG)
+        - Preco_Min_MG_Mil / Preco_Max_MG_Mil: menor e maior preço por MG (milésimos de centavo)
     """
-    if df.empty:
-        return pd.DataFrame()
+    if df.empty or 'Valor Unitário' not in df.columns:
+        return pd.DataFrame(columns=AGGREGATE_COLUMNS)
     
-    # Criar cópia para trabalhar
-    df_stats = df.copy()
+    # Trabalhar apenas com as colunas necessárias
+    df_stats = df[['Vendedor', 'Descrição do Produto']].copy()
     
-    # Converter quantidade para numérico (formato brasileiro)
-    if 'Quantidade' in df_stats.columns:
-        df_stats['Quantidade_Num'] = df_stats['Quantidade'].astype(str).str.replace('.', '', regex=False).str.replace(',', '.', regex=False)
-        df_stats['Quantidade_Num'] = pd.to_numeric(df_stats['Quantidade_Num'], errors='coerce').fillna(0.0)
+    # Quantidade em milésimos e valor unitário em centavos
+    if 'Quantidade' in df.columns:
+        df_stats['Quantidade_Mil'] = to_scaled(df['Quantidade'], QUANTITY_SCALE)
     else:
-        df_stats['Quantidade_Num'] = 0.0
+        df_stats['Quantidade_Mil'] = 0
+    df_stats['Valor_Cent'] = to_scaled(df['Valor Unitário'], CENTS_SCALE)
     
-    # Garantir que Valor Unitário está numérico
-    if 'Valor Unitário' not in df_stats.columns:
-        return pd.DataFrame()
+    # Valor total por linha (quantidade × valor unitário) em centavos × milésimos.
+    # Mantido sem arredondar até o fim da agregação.
+    df_stats['Valor_Total_Linha'] = df_stats['Quantidade_Mil'] * df_stats['Valor_Cent']
     
-    # Calcular valor total por linha (quantidade × valor unitário)
-    df_stats['Valor_Total_Linha'] = df_stats['Quantidade_Num'] * df_stats['Valor Unitário']
-    
-    # Extrair MG do produto
-    df_stats['MG'] = df_stats['Descrição do Produto'].apply(extract_mg_from_product)
+    # Extrair MG do produto (uma vez por produto distinto) em milésimos de MG
+    # Se MG for 0 ou não encontrado, usar 1 para evitar divisão por zero
+    produtos = df_stats['Descrição do Produto'].astype(str)
+    mg_por_produto = {produto: extract_mg_from_product(produto) for produto in produtos.unique()}
+    mg_mil = (produtos.map(mg_por_produto) * QUANTITY_SCALE).round().astype('int64')
+    df_stats['MG_Mil'] = mg_mil.where(mg_mil > 0, QUANTITY_SCALE)
     
-    # Calcular Preço por MG para cada linha (antes de agrupar)
+    # Calcular Preço por MG para cada linha (antes de agrupar), em milésimos de centavo
     # Fórmula: Valor Unitário / MG
-    # Se MG for 0 ou não encontrado, usar 1 para evitar divisão por zero
-    mg_safe = df_stats['MG'].replace(0, 1)
-    df_stats['Preco_Por_MG'] = df_stats['Valor Unitário'] / mg_safe
-    df_stats['Preco_Por_MG'] = df_stats['Preco_Por_MG'].replace([float('inf'), float('-inf')], 0)
-    df_stats['Preco_Por_MG'] = df_stats['Preco_Por_MG'].fillna(0)
+    df_stats['Preco_Por_MG'] = _round_div(df_stats['Valor_Cent'] * QUANTITY_SCALE * QUANTITY_SCALE,
+                                          df_stats['MG_Mil'])
     
     # Agrupar por Vendedor e Produto
     grouped = df_stats.groupby(['Vendedor', 'Descrição do Produto']).agg({
-        'Quantidade_Num': 'sum',
+        'Quantidade_Mil': 'sum',
         'Valor_Total_Linha': 'sum',
-        'MG': 'first',  # MG é o mesmo para o mesmo produto
+        'MG_Mil': 'first',  # MG é o mesmo para o mesmo produto
         'Preco_Por_MG': ['min', 'max']  # Preço mínimo e máximo por MG
     }).reset_index()
     
     # Renomear colunas (flatten do MultiIndex)
-    grouped.columns = ['Vendedor', 'Produto', 'Quantidade Total', 'Valor Total', 'MG', 'Preço Mínimo por MG', 'Preço Máximo por MG']
+    grouped.columns = AGGREGATE_COLUMNS
+    return grouped.astype({col: 'int64' for col in AGGREGATE_COLUMNS[2:]})
+
+
+def merge_seller_aggregates(*aggregates: pd.DataFrame) -> pd.DataFrame:
+    """
+    Combina agregados de lotes diferentes (somas somadas, mínimos/máximos combinados).
+    
+    Args:
+        *aggregates: DataFrames no formato de seller_aggregates
+        
+    Returns:
+        DataFrame no formato de seller_aggregates
+    """
+    frames = [agg for agg in aggregates if agg is not None and not agg.empty]
+    if not frames:
+        return pd.DataFrame(columns=AGGREGATE_COLUMNS)
+    
+    combined = pd.concat(frames, ignore_index=True)
+    merged = combined.groupby(['Vendedor', 'Produto']).agg({
+        'Quantidade_Mil': 'sum',
+        'Valor_Total_Linha': 'sum',
+        'MG_Mil': 'first',
+        'Preco_Min_MG_Mil': 'min',
+        'Preco_Max_MG_Mil': 'max'
+    }).reset_index()
+    return merged[AGGREGATE_COLUMNS].astype({col: 'int64' for col in AGGREGATE_COLUMNS[2:]})
+
+
+def statistics_from_aggregates(aggregates: pd.DataFrame) -> pd.DataFrame:
+    """
+    Calcula as estatísticas finais por vendedor a partir dos agregados.
+    
+    Args:
+        aggregates: DataFrame no formato de seller_aggregates
+        
+    Returns:
+        DataFrame no formato de calculate_seller_statistics
+    """
+    if aggregates is None or aggregates.empty:
+        return pd.DataFrame()
+    
+    grouped = aggregates.copy()
+    grouped['Quantidade Total'] = grouped['Quantidade_Mil']
+    grouped['Preço Mínimo por MG'] = grouped['Preco_Min_MG_Mil']
+    grouped['Preço Máximo por MG'] = grouped['Preco_Max_MG_Mil']
+    
+    # Valor Total em centavos
+    grouped['Valor Total'] = _round_div(grouped['Valor_Total_Linha'], QUANTITY_SCALE)
     
     # Calcular Preço Médio por MG
     # Fórmula: Valor Total / (Quantidade Total × MG)
     # Exemplo: 10 unidades de TIRZEPATIDE 50 MG a R$ 900 cada
     # Valor Total = 10 × 900 = 9.000
     # Preço Médio por MG = 9.000 / (10 × 50) = 18
-    
-    # Se MG for 0 ou não encontrado, usar 1 para evitar divisão por zero
-    mg_safe = grouped['MG'].replace(0, 1)
-    
-    # Calcular denominador (Quantidade Total × MG)
-    denominador = grouped['Quantidade Total'] * mg_safe
-    
-    # Calcular Preço Médio por MG
-    # Evitar divisão por zero
-    grouped['Preço Médio por MG'] = grouped['Valor Total'] / denominador
-    grouped['Preço Médio por MG'] = grouped['Preço Médio por MG'].replace([float('inf'), float('-inf')], 0)
-    grouped['Preço Médio por MG'] = grouped['Preço Médio por MG'].fillna(0)
-    
-    # Remover coluna MG (não é mais necessária no resultado final)
-    if 'MG' in grouped.columns:
-        grouped.drop(columns=['MG'], inplace=True)
+    # Em inteiros, em milésimos de centavo:
+    # (centavos × milésimos de qtd × 1000 × 1000) / (milésimos de qtd × milésimos de MG).
+    # Há um agregado por vendedor/produto: a conta usa inteiros do Python, sem risco de
+    # estouro do int64 no numerador
+    preco_medio = []
+    for valor, quantidade, mg in zip(grouped['Valor_Total_Linha'], grouped['Quantidade Total'], grouped['MG_Mil']):
+        denominador = int(quantidade) * int(mg)
+        numerador = int(valor) * QUANTITY_SCALE * QUANTITY_SCALE
+        preco_medio.append((2 * numerador + denominador) // (2 * denominador) if denominador > 0 else 0)
+    grouped['Preço Médio por MG'] = preco_medio
     
     # Ordenar por Vendedor e depois por Produto
     grouped = grouped.sort_values(['Vendedor', 'Produto']).reset_index(drop=True)
     
     # Selecionar e ordenar colunas finais
     result = grouped[['Vendedor', 'Produto', 'Quantidade Total', 'Valor Total', 'Preço Médio por MG', 'Preço Mínimo por MG', 'Preço Máximo por MG']].copy()
+    result = result.astype({col: 'int64' for col in result.columns[2:]})
     
     return result
 
 
+def calculate_seller_statistics(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Calcula estatísticas agrupadas por vendedor e produto.
+    Toda a agregação é feita em inteiros (centavos e milésimos), portanto é exata.
+    
+    Args:
+        df: DataFrame com dados dos recibos processados
+        
+    Returns:
+        DataFrame com estatísticas por vendedor:
+        - Vendedor
+        - Produto
+        - Quantidade Total (milésimos de unidade)
+        - Valor Total (centavos)
+        - Preço Médio por MG (milésimos de centavo, PRICE_PER_MG_SCALE)
+        - Preço Mínimo por MG (milésimos de centavo)
+        - Preço Máximo por MG (milésimos de centavo)
+    """
+    if df.empty:
+        return pd.DataFrame()
+    
+    # Garantir que Valor Unitário existe
+    if 'Valor Unitário' not in df.columns:
+        return pd.DataFrame()
+    
+    return statistics_from_aggregates(seller_aggregates(df))
+
+
+def summarize_rows(df: pd.DataFrame) -> Dict:
+    """
+    Resumo das linhas processadas (painel de estatísticas exibido durante o processamento).
+    
+    Args:
+        df: DataFrame com dados dos recibos processados
+    
+    Returns:
+        Dicionário com:
+        - recibos: número de recibos distintos
+        - linhas: número de linhas
+        - valor_total_linhas: soma de quantidade × valor unitário (milésimos × centavos, sem arredondar)
+        - vendedores: lista dos vendedores distintos
+    """
+    if df is None or df.empty:
+        return {'recibos': 0, 'linhas': 0, 'valor_total_linhas': 0, 'vendedores': []}
+    
+    valor_total = 0
+    if 'Quantidade' in df.columns and 'Valor Unitário' in df.columns:
+        quantidade = to_scaled(df['Quantidade'], QUANTITY_SCALE)
+        valor = to_scaled(df['Valor Unitário'], CENTS_SCALE)
+        valor_total = int((quantidade * valor).sum())
+    
+    return {
+        'recibos': int(df['Nº Recibo'].nunique()) if 'Nº Recibo' in df.columns else 0,
+        'linhas': len(df),
+        'valor_total_linhas': valor_total,
+        'vendedores': df['Vendedor'].dropna().astype(str).unique().tolist() if 'Vendedor' in df.columns else [],
+    }
+
+
+def format_summary(summary: Dict) -> str:
+    """Texto do painel de estatísticas (valor total em reais, arredondado para centavos)."""
+    valor_cent = int(_round_div([summary['valor_total_linhas']], QUANTITY_SCALE)[0])
+    valor = format_brazilian_scaled(pd.Series([valor_cent]), CENTS_SCALE).iloc[0]
+    valor = valor or '0,00'
+    return (f"Recibos: {summary['recibos']}  |  Linhas: {summary['linhas']}  |  "
+            f"Vendedores: {len(summary['vendedores'])}  |  Valor total: R$ {valor}")
+
+
 def validate_data(df: pd.DataFrame) -> Tuple[bool, List[str]]:
     """
     Valida se o DataFrame contém dados válidos.
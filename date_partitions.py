@@ -0,0 +1,265 @@
+"""
+Índice dos recibos particionado por data da venda.
+Os resultados acumulados são gravados em um arquivo por dia, agrupados em pastas por mês:
+    
+    dados/particoes/2025-10/2025-10-01.feather
+    dados/particoes/2025-10/2025-10-02.feather
+    dados/particoes/sem_data.feather   (recibos sem data de venda)
+
+Consultas por período leem apenas as partições do intervalo. O arquivo
+dados/particoes/recibos_particoes.feather guarda a partição de cada recibo, para que um
+recibo importado de novo com a data corrigida saia da partição antiga.
+"""
+from datetime import date, datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from columnar_store import PYARROW_AVAILABLE, read_table, write_table
+from data_processor import calculate_seller_statistics
+
+# Importar logger
+try:
+    from logger import get_logger
+    logger = get_logger()
+except ImportError:
+    # Se logger não estiver disponível, criar um logger silencioso
+    class DummyLogger:
+        def info(self, *args, **kwargs): pass
+        def debug(self, *args, **kwargs): pass
+        def warning(self, *args, **kwargs): pass
+        def error(self, *args, **kwargs): pass
+        def separador(self, *args, **kwargs): pass
+    logger = DummyLogger()
+
+
+# Pasta padrão das partições
+DEFAULT_PARTITIONS_DIR = Path("dados") / "particoes"
+
+DATE_COLUMN = 'Data da Venda'
+UNDATED_PARTITION = 'sem_data'
+PARTITION_EXTENSION = '.feather'
+# Partição (caminho relativo à pasta base) de cada recibo
+RECEIPT_MAP_FILE = 'recibos_particoes.feather'
+
+
+class DatePartitionedIndex:
+    """
+    Recibos acumulados particionados por dia (arquivos) e mês (pastas).
+    Partições lidas ficam em cache enquanto o arquivo não mudar.
+    """
+    
+    def __init__(self, base_dir=None):
+        """
+        Args:
+            base_dir: Pasta das partições. Se None, usa dados/particoes
+        """
+        if not PYARROW_AVAILABLE:
+            raise ImportError(
+                "pyarrow não está instalado.\n"
+                "Instale com: pip install pyarrow"
+            )
+        self.base_dir = Path(base_dir) if base_dir is not None else DEFAULT_PARTITIONS_DIR
+        self.base_dir.mkdir(parents=True, exist_ok=True)
+        self._cache: Dict[Path, Tuple[float, pd.DataFrame]] = {}
+        self._receipt_map: Optional[Dict[str, str]] = None
+    
+    def _partition_path(self, day: Optional[date]) -> Path:
+        """Caminho da partição de um dia (None = recibos sem data)."""
+        if day is None:
+            return self.base_dir / f"{UNDATED_PARTITION}{PARTITION_EXTENSION}"
+        return self.base_dir / f"{day:%Y-%m}" / f"{day:%Y-%m-%d}{PARTITION_EXTENSION}"
+    
+    def _load(self, path: Path) -> pd.DataFrame:
+        """Lê uma partição (usando o cache se o arquivo não mudou)."""
+        mtime = path.stat().st_mtime
+        cached = self._cache.get(path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        df = read_table(path)
+        self._cache[path] = (mtime, df)
+        return df
+    
+    def _load_receipt_map(self) -> Dict[str, str]:
+        """
+        Partição de cada recibo (Nº Recibo -> caminho relativo). Se o arquivo do mapa
+        tiver sido apagado, é reconstruído a partir das partições.
+        """
+        if self._receipt_map is None:
+            map_path = self.base_dir / RECEIPT_MAP_FILE
+            if map_path.exists():
+                df_map = read_table(map_path)
+                self._receipt_map = dict(zip(df_map['Nº Recibo'].astype(str), df_map['Partição'].astype(str)))
+            else:
+                self._receipt_map = {}
+                for path in self.partitions(incluir_sem_data=True):
+                    relativo = path.relative_to(self.base_dir).as_posix()
+                    for numero in self._load(path)['Nº Recibo'].astype(str).unique():
+                        self._receipt_map[numero] = relativo
+        return self._receipt_map
+    
+    def _save_receipt_map(self):
+        """Grava o mapa de recibos para partições."""
+        df_map = pd.DataFrame({'Nº Recibo': list(self._receipt_map.keys()),
+                               'Partição': list(self._receipt_map.values())})
+        write_table(df_map, self.base_dir / RECEIPT_MAP_FILE, 'feather')
+    
+    def add(self, df: pd.DataFrame) -> int:
+        """
+        Acrescenta recibos processados às partições do respectivo dia.
+        Apenas as partições dos dias presentes em df são reescritas. Recibos que já
+        estavam no índice (mesmo número) são substituídos pela versão nova, inclusive
+        quando a data mudou: a cópia antiga sai da partição do dia anterior.
+        
+        Args:
+            df: DataFrame processado (com a coluna 'Data da Venda')
+        
+        Returns:
+            Número de partições atualizadas
+        """
+        if df is None or df.empty:
+            return 0
+        
+        if DATE_COLUMN in df.columns:
+            dias = pd.to_datetime(df[DATE_COLUMN], errors='coerce').dt.date
+        else:
+            dias = pd.Series(None, index=df.index)
+        
+        grupos = []
+        novos = {}  # Nº Recibo -> partição nova
+        for dia, grupo in df.groupby(dias.where(dias.notna(), None), dropna=False, sort=True):
+            path = self._partition_path(None if pd.isna(dia) else dia)
+            grupos.append((path, grupo))
+            relativo = path.relative_to(self.base_dir).as_posix()
+            novos.update(dict.fromkeys(grupo['Nº Recibo'].astype(str).unique(), relativo))
+        
+        # Remover as cópias antigas de recibos que mudaram de partição (data corrigida)
+        receipt_map = self._load_receipt_map()
+        antigas: Dict[str, set] = {}
+        for numero, relativo in novos.items():
+            anterior = receipt_map.get(numero)
+            if anterior is not None and anterior != relativo:
+                antigas.setdefault(anterior, set()).add(numero)
+        
+        atualizadas = 0
+        for relativo, numeros in antigas.items():
+            path = self.base_dir / relativo
+            if not path.exists():
+                continue
+            existente = self._load(path)
+            restante = existente[~existente['Nº Recibo'].astype(str).isin(numeros)]
+            if restante.empty:
+                path.unlink()
+            else:
+                write_table(restante.reset_index(drop=True), path, 'feather')
+            self._cache.pop(path, None)
+            atualizadas += 1
+            logger.info(f"Índice por data: {len(numeros)} recibo(s) com data alterada removido(s) de {relativo}")
+        
+        for path, grupo in grupos:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            
+            if path.exists():
+                existente = self._load(path)
+                novos_recibos = grupo['Nº Recibo'].astype(str).unique()
+                existente = existente[~existente['Nº Recibo'].astype(str).isin(novos_recibos)]
+                grupo = pd.concat([existente, grupo], ignore_index=True)
+            
+            write_table(grupo, path, 'feather')
+            self._cache.pop(path, None)
+            atualizadas += 1
+        
+        receipt_map.update(novos)
+        self._save_receipt_map()
+        
+        logger.info(f"Índice por data: {atualizadas} partição(ões) diária(s) atualizada(s) em {self.base_dir}")
+        return atualizadas
+    
+    def partitions(self, inicio=None, fim=None, incluir_sem_data: bool = False) -> List[Path]:
+        """
+        Lista as partições diárias do período, podando primeiro pelas pastas de mês.
+        
+        Args:
+            inicio: Data inicial (inclusiva) - str ISO, date ou datetime
+            fim: Data final (exclusiva) - str ISO, date ou datetime
+            incluir_sem_data: Se True, inclui a partição de recibos sem data
+        
+        Returns:
+            Lista de caminhos das partições, em ordem cronológica
+        """
+        inicio_ts = pd.Timestamp(inicio) if inicio is not None else None
+        fim_ts = pd.Timestamp(fim) if fim is not None else None
+        # Dias que podem conter vendas do intervalo [inicio, fim)
+        primeiro_dia = inicio_ts.date() if inicio_ts is not None else None
+        ultimo_dia = (fim_ts - pd.Timedelta(microseconds=1)).date() if fim_ts is not None else None
+        
+        selecionadas = []
+        for month_dir in sorted(p for p in self.base_dir.iterdir() if p.is_dir()):
+            try:
+                mes = datetime.strptime(month_dir.name, "%Y-%m").date()
+            except ValueError:
+                continue
+            # Podar meses fora do intervalo sem listar os arquivos
+            if primeiro_dia is not None and (mes.year, mes.month) < (primeiro_dia.year, primeiro_dia.month):
+                continue
+            if ultimo_dia is not None and (mes.year, mes.month) > (ultimo_dia.year, ultimo_dia.month):
+                continue
+            
+            for day_file in sorted(month_dir.glob(f"*{PARTITION_EXTENSION}")):
+                try:
+                    dia = datetime.strptime(day_file.stem, "%Y-%m-%d").date()
+                except ValueError:
+                    continue
+                if primeiro_dia is not None and dia < primeiro_dia:
+                    continue
+                if ultimo_dia is not None and dia > ultimo_dia:
+                    continue
+                selecionadas.append(day_file)
+        
+        undated = self._partition_path(None)
+        if incluir_sem_data and undated.exists():
+            selecionadas.append(undated)
+        return selecionadas
+    
+    def query(self, inicio=None, fim=None, vendedor: Optional[str] = None,
+              incluir_sem_data: bool = False) -> pd.DataFrame:
+        """
+        Retorna as linhas de produto vendidas no período, lendo apenas as partições necessárias.
+        
+        Args:
+            inicio: Data/hora inicial (inclusiva)
+            fim: Data/hora final (exclusiva)
+            vendedor: Filtrar por vendedor (opcional)
+            incluir_sem_data: Se True, inclui recibos sem data de venda
+        
+        Returns:
+            DataFrame no formato do processamento
+        """
+        paths = self.partitions(inicio, fim, incluir_sem_data)
+        logger.debug(f"Índice por data: consultando {len(paths)} partição(ões)")
+        if not paths:
+            return pd.DataFrame()
+        
+        df = pd.concat([self._load(path) for path in paths], ignore_index=True)
+        
+        # Filtrar horários exatos nas partições das pontas do intervalo
+        datas = pd.to_datetime(df[DATE_COLUMN], errors='coerce')
+        mask = pd.Series(True, index=df.index)
+        if inicio is not None:
+            mask &= (datas >= pd.Timestamp(inicio)) | datas.isna()
+        if fim is not None:
+            mask &= (datas < pd.Timestamp(fim)) | datas.isna()
+        if vendedor is not None:
+            mask &= df['Vendedor'] == vendedor
+        
+        return df[mask].reset_index(drop=True)
+    
+    def seller_statistics(self, inicio=None, fim=None, vendedor: Optional[str] = None) -> pd.DataFrame:
+        """
+        Estatísticas por vendedor restritas ao período (apenas partições do intervalo).
+        
+        Returns:
+            DataFrame no formato de calculate_seller_statistics
+        """
+        return calculate_seller_statistics(self.query(inicio, fim, vendedor))
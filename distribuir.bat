@@ -15,6 +15,18 @@ copy main.py Sistema-Bruno-Distribuicao\
 copy pdf_extractor.py Sistema-Bruno-Distribuicao\
 copy data_processor.py Sistema-Bruno-Distribuicao\
 copy excel_exporter.py Sistema-Bruno-Distribuicao\
+copy receipt_store.py Sistema-Bruno-Distribuicao\
+copy columnar_store.py Sistema-Bruno-Distribuicao\
+copy date_partitions.py Sistema-Bruno-Distribuicao\
+copy cancellation.py Sistema-Bruno-Distribuicao\
+copy job_queue.py Sistema-Bruno-Distribuicao\
+copy lazy_modules.py Sistema-Bruno-Distribuicao\
+copy preview_index.py Sistema-Bruno-Distribuicao\
+copy event_loop_monitor.py Sistema-Bruno-Distribuicao\
+copy excel_appender.py Sistema-Bruno-Distribuicao\
+copy xlsx_reader.py Sistema-Bruno-Distribuicao\
+copy excel_loader.py Sistema-Bruno-Distribuicao\
+copy progress_state.py Sistema-Bruno-Distribuicao\
 copy logger.py Sistema-Bruno-Distribuicao\
 copy iniciar_sistema.py Sistema-Bruno-Distribuicao\
 copy requirements.txt Sistema-Bruno-Distribuicao\
@@ -0,0 +1,92 @@
+"""
+Monitor de travamentos da interface (loop de eventos do Tk).
+Um batimento agendado com root.after a cada HEARTBEAT_MS marca quando a thread principal
+volta a tratar eventos. Uma thread de vigia detecta batimentos atrasados além de
+STALL_THRESHOLD_MS e registra no log a pilha da thread principal naquele momento
+(o código que está segurando a interface); quando o batimento volta, a duração do
+travamento também é registrada. Ao fechar, o resumo dos travamentos vai para o log.
+"""
+import sys
+import threading
+import time
+import traceback
+
+# Intervalo do batimento na thread principal
+HEARTBEAT_MS = 50
+
+# Atraso do batimento a partir do qual a interface é considerada travada
+STALL_THRESHOLD_MS = 200
+
+
+class EventLoopMonitor:
+    """
+    Mede o atraso do loop de eventos do Tk e registra os travamentos no log.
+    Uso: monitor = EventLoopMonitor(root, logger); monitor.start(); ...; monitor.stop()
+    """
+    
+    def __init__(self, root, logger, heartbeat_ms: int = HEARTBEAT_MS, threshold_ms: int = STALL_THRESHOLD_MS):
+        """
+        Args:
+            root: Janela principal (Tk)
+            logger: Logger da sessão
+            heartbeat_ms: Intervalo do batimento
+            threshold_ms: Atraso mínimo registrado como travamento
+        """
+        self.root = root
+        self.logger = logger
+        self.heartbeat = heartbeat_ms / 1000
+        self.threshold = threshold_ms / 1000
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._main_thread_id = None
+        self._last_beat = time.perf_counter()
+        self._stack_logged = False
+        # Estatísticas da sessão
+        self.stall_count = 0
+        self.max_stall = 0.0
+        self.total_stall = 0.0
+    
+    def start(self):
+        """Inicia o batimento e a vigia (chamar na thread principal)."""
+        self._main_thread_id = threading.get_ident()
+        self._last_beat = time.perf_counter()
+        self.root.after(int(self.heartbeat * 1000), self._beat)
+        threading.Thread(target=self._watch, name="monitor-interface", daemon=True).start()
+    
+    def stop(self):
+        """Encerra o monitor e registra o resumo dos travamentos."""
+        self._stop.set()
+        self.logger.info(f"Monitor da interface: {self.stall_count} travamento(s) acima de "
+                         f"{self.threshold * 1000:.0f} ms (maior: {self.max_stall * 1000:.0f} ms, "
+                         f"total: {self.total_stall:.1f}s)")
+    
+    def _beat(self):
+        """Batimento na thread principal: mede o atraso desde o batimento anterior."""
+        now = time.perf_counter()
+        with self._lock:
+            delay = now - self._last_beat - self.heartbeat
+            self._last_beat = now
+            self._stack_logged = False
+        
+        if delay >= self.threshold:
+            self.stall_count += 1
+            self.total_stall += delay
+            self.max_stall = max(self.max_stall, delay)
+            self.logger.warning(f"Interface travada por {delay * 1000:.0f} ms")
+        
+        if not self._stop.is_set():
+            self.root.after(int(self.heartbeat * 1000), self._beat)
+    
+    def _watch(self):
+        """Vigia (thread de fundo): registra a pilha da thread principal durante um travamento."""
+        while not self._stop.wait(self.threshold / 2):
+            with self._lock:
+                late = time.perf_counter() - self._last_beat - self.heartbeat
+                if late < self.threshold or self._stack_logged:
+                    continue
+                self._stack_logged = True
+            
+            frame = sys._current_frames().get(self._main_thread_id)
+            stack = ''.join(traceback.format_stack(frame)) if frame is not None else "(indisponível)\n"
+            self.logger.warning(f"Interface sem responder há {late * 1000:.0f} ms. "
+                                f"Pilha da thread principal:\n{stack.rstrip()}")
@@ -0,0 +1,458 @@
+"""
+Anexação incremental de recibos a um arquivo Excel já exportado.
+As linhas existentes da aba Recibos são copiadas como XML, sem serem lidas célula
+a célula; apenas os recibos novos são convertidos e estilizados, e a aba de
+estatísticas é recalculada a partir dos agregados guardados na aba oculta _Agregados.
+O tempo de anexação cresce com o número de linhas novas, não com o total do arquivo.
+"""
+import numbers
+import os
+import re
+import tempfile
+import zipfile
+import xml.etree.ElementTree as ET
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+from xml.sax.saxutils import escape
+
+import pandas as pd
+from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+from openpyxl.styles.numbers import BUILTIN_FORMATS_REVERSE
+from openpyxl.utils import get_column_letter
+from openpyxl.utils.datetime import to_excel
+from openpyxl.xml.functions import tostring as openpyxl_tostring
+
+from data_processor import (AGGREGATE_COLUMNS, merge_seller_aggregates, seller_aggregates,
+                            statistics_from_aggregates)
+from excel_exporter import (AGGREGATES_SHEET, BLOCK_BORDER, BLOCK_FILL_DARK, BLOCK_FILL_LIGHT, DATA_ALIGNMENT,
+                            DATA_FONT, EXCEL_MAX_ROWS, HEADER_ALIGNMENT, HEADER_FONT, INDEX_SHEET,
+                            RECEIPTS_NUMBER_FORMATS, RECEIPTS_SHEET, ROW_GRAY, ROW_WHITE, STATS_HEADER_FILL,
+                            STATS_NUMBER_FORMATS, STATS_SHEET, VENDEDOR_FONT, _ExportProgress, _cell_value,
+                            _number_format_for, _receipts_for_display, _stats_for_display)
+from cancellation import OperationCancelled
+from xlsx_reader import (SharedStrings, WorkbookParts, aggregates_from_rows, qname, read_sheet_rows,
+                         row_values)
+
+# Importar logger
+try:
+    from logger import get_logger
+    logger = get_logger()
+except ImportError:
+    # Se logger não estiver disponível, criar um logger silencioso
+    class DummyLogger:
+        def info(self, *args, **kwargs): pass
+        def debug(self, *args, **kwargs): pass
+        def warning(self, *args, **kwargs): pass
+        def error(self, *args, **kwargs): pass
+        def separador(self, *args, **kwargs): pass
+    logger = DummyLogger()
+
+
+# Tamanho dos blocos lidos/gravados ao copiar a aba Recibos
+COPY_CHUNK_SIZE = 1 << 20
+
+# Linhas novas convertidas para XML por vez
+ROW_BATCH_SIZE = 1000
+
+_DIMENSION_RE = re.compile(rb'<dimension\b[^>]*/>')
+_SHEET_DATA_RE = re.compile(rb'<sheetData\b[^>]*?(/?)>')
+_HEADER_ROW_RE = re.compile(rb'<row r="1"[^>]*>(.*?)</row>', re.S)
+# Nº do recibo (coluna A) gravado como texto inline ou como índice de texto compartilhado
+_INLINE_RECEIPT_RE = re.compile(rb'<c r="A\d+"[^>]*?t="inlineStr"[^>]*><is><t[^>]*>([^<]*)</t>')
+_SHARED_RECEIPT_RE = re.compile(rb'<c r="A\d+"[^>]*?t="s"[^>]*><v>(\d+)</v>')
+
+
+def _canonical(element) -> bytes:
+    """Representação comparável de um elemento de estilo (sem namespace, atributos ordenados)."""
+    element = ET.fromstring(ET.tostring(element))
+    for el in element.iter():
+        el.tag = el.tag.split('}')[-1]
+        if el.attrib:
+            el.attrib = dict(sorted(el.attrib.items()))
+        el.text = el.text.strip() if el.text else None
+        el.tail = None
+    return ET.tostring(element)
+
+
+class _StyleRegistry:
+    """
+    Registra, no styles.xml existente, os estilos usados pelas linhas novas.
+    Estilos iguais aos já existentes são reaproveitados. O XML original é mantido
+    e os novos elementos são inseridos no fim de cada lista.
+    """
+    
+    # Listas do styles.xml, na ordem em que aparecem no arquivo
+    SECTIONS = [('numFmts', 'numFmt'), ('fonts', 'font'), ('fills', 'fill'),
+                ('borders', 'border'), ('cellXfs', 'xf')]
+    
+    def __init__(self, xml: bytes):
+        self._xml = xml.decode('utf-8')
+        root = ET.fromstring(xml)
+        
+        self._num_fmts = {el.get('formatCode'): int(el.get('numFmtId')) for el in root.iter(qname('numFmt'))}
+        self._next_num_fmt = max([163] + list(self._num_fmts.values())) + 1
+        
+        self._components: Dict[str, List[bytes]] = {}
+        for section, item in self.SECTIONS[1:4]:
+            parent = root.find(qname(section))
+            self._components[item] = [_canonical(el) for el in parent.findall(qname(item))] if parent is not None else []
+        
+        self._xfs: Dict[tuple, int] = {}
+        self._xf_count = 0
+        cell_xfs = root.find(qname('cellXfs'))
+        if cell_xfs is not None:
+            for idx, xf in enumerate(cell_xfs.findall(qname('xf'))):
+                alignment = xf.find(qname('alignment'))
+                key = (int(xf.get('numFmtId', 0)), int(xf.get('fontId', 0)), int(xf.get('fillId', 0)),
+                       int(xf.get('borderId', 0)),
+                       alignment.get('horizontal') if alignment is not None else None,
+                       alignment.get('vertical') if alignment is not None else None)
+                self._xfs.setdefault(key, idx)
+                self._xf_count = idx + 1
+        
+        self._added: Dict[str, List[str]] = {section: [] for section, _ in self.SECTIONS}
+        self._cache = {}
+    
+    def _num_fmt_id(self, number_format: Optional[str]) -> int:
+        if not number_format:
+            return 0
+        builtin = BUILTIN_FORMATS_REVERSE.get(number_format)
+        if builtin is not None:
+            return builtin
+        fmt_id = self._num_fmts.get(number_format)
+        if fmt_id is None:
+            fmt_id = self._next_num_fmt
+            self._next_num_fmt += 1
+            self._num_fmts[number_format] = fmt_id
+            self._added['numFmts'].append(
+                f'<numFmt numFmtId="{fmt_id}" formatCode="{escape(number_format, {chr(34): "&quot;"})}"/>')
+        return fmt_id
+    
+    def _component_id(self, section: str, item: str, style) -> int:
+        xml = openpyxl_tostring(style.to_tree()).decode('utf-8')
+        canonical = _canonical(ET.fromstring(xml))
+        existing = self._components[item]
+        if canonical in existing:
+            return existing.index(canonical)
+        existing.append(canonical)
+        self._added[section].append(xml)
+        return len(existing) - 1
+    
+    def xf_id(self, fill, font=DATA_FONT, alignment=DATA_ALIGNMENT,
+              number_format: Optional[str] = None, border=None) -> int:
+        """Índice do estilo de célula (cellXfs) para a combinação de estilos."""
+        cache_key = (id(fill), id(font), id(alignment), number_format, id(border))
+        xf = self._cache.get(cache_key)
+        if xf is not None:
+            return xf
+        
+        num_fmt_id = self._num_fmt_id(number_format)
+        font_id = self._component_id('fonts', 'font', font)
+        fill_id = self._component_id('fills', 'fill', fill)
+        border_id = self._component_id('borders', 'border', border) if border is not None else 0
+        key = (num_fmt_id, font_id, fill_id, border_id, alignment.horizontal, alignment.vertical)
+        
+        xf = self._xfs.get(key)
+        if xf is None:
+            align_attrs = ''.join(f' {name}="{value}"' for name, value in
+                                  (('horizontal', alignment.horizontal), ('vertical', alignment.vertical)) if value)
+            self._added['cellXfs'].append(
+                f'<xf numFmtId="{num_fmt_id}" fontId="{font_id}" fillId="{fill_id}" borderId="{border_id}" '
+                f'xfId="0" applyNumberFormat="1" applyFont="1" applyFill="1" applyBorder="1" '
+                f'applyAlignment="1"><alignment{align_attrs}/></xf>')
+            xf = self._xf_count
+            self._xf_count += 1
+            self._xfs[key] = xf
+        self._cache[cache_key] = xf
+        return xf
+    
+    def to_bytes(self) -> bytes:
+        """styles.xml com os estilos novos inseridos."""
+        xml = self._xml
+        for section, _ in self.SECTIONS:
+            added = self._added[section]
+            if not added:
+                continue
+            new_items = ''.join(added)
+            close_tag = f'</{section}>'
+            if close_tag in xml:
+                pos = xml.index(close_tag)
+                xml = xml[:pos] + new_items + xml[pos:]
+                xml = re.sub(rf'(<{section}\b[^>]*?\bcount=")(\d+)(")',
+                             lambda m: f'{m.group(1)}{int(m.group(2)) + len(added)}{m.group(3)}', xml, count=1)
+            elif section == 'numFmts':
+                # numFmts é o primeiro elemento de styleSheet
+                start = re.search(r'<styleSheet\b[^>]*>', xml).end()
+                xml = xml[:start] + f'<numFmts count="{len(added)}">{new_items}</numFmts>' + xml[start:]
+            else:
+                raise ValueError(f"styles.xml sem a lista {section}")
+        return xml.encode('utf-8')
+
+
+def _cell_xml(ref: str, value, style_id: int) -> str:
+    """XML de uma célula (textos gravados inline, como fazem os backends de exportação)."""
+    style = f' s="{style_id}"' if style_id else ''
+    value = _cell_value(value)
+    if value is None:
+        return f'<c r="{ref}"{style}/>'
+    if isinstance(value, str):
+        text = ILLEGAL_CHARACTERS_RE.sub('', value)
+        space = ' xml:space="preserve"' if text != text.strip() else ''
+        return f'<c r="{ref}"{style} t="inlineStr"><is><t{space}>{escape(text)}</t></is></c>'
+    if isinstance(value, bool):
+        return f'<c r="{ref}"{style} t="b"><v>{int(value)}</v></c>'
+    if isinstance(value, datetime):
+        value = to_excel(value)
+    if isinstance(value, numbers.Integral):
+        return f'<c r="{ref}"{style}><v>{int(value)}</v></c>'
+    if isinstance(value, numbers.Number):
+        return f'<c r="{ref}"{style}><v>{float(value)!r}</v></c>'
+    return _cell_xml(ref, str(value), style_id)
+
+
+def _row_xml(row_idx: int, letters: List[str], cells) -> str:
+    """XML de uma linha a partir de pares (valor, estilo)."""
+    return (f'<row r="{row_idx}">'
+            + ''.join(_cell_xml(f'{letter}{row_idx}', value, style_id)
+                      for letter, (value, style_id) in zip(letters, cells))
+            + '</row>')
+
+
+def _replace_sheet_data(xml: bytes, rows_xml: str) -> bytes:
+    """Substitui as linhas de uma aba pequena, mantendo larguras, painel congelado etc."""
+    xml = _DIMENSION_RE.sub(b'', xml, count=1)
+    match = _SHEET_DATA_RE.search(xml)
+    rows = rows_xml.encode('utf-8')
+    if match.group(1):
+        return xml[:match.start()] + b'<sheetData>' + rows + b'</sheetData>' + xml[match.end():]
+    end = xml.rindex(b'</sheetData>')
+    return xml[:match.end()] + rows + xml[end:]
+
+
+def _append_receipt_rows(src, dst, df_new: pd.DataFrame, styles: _StyleRegistry,
+                         shared: SharedStrings, progress: _ExportProgress) -> pd.DataFrame:
+    """
+    Copia a aba Recibos de src para dst e insere as linhas dos recibos novos no fim.
+    As linhas existentes são copiadas em blocos, sem interpretar as células; delas
+    só se extraem os números de recibo (para não duplicar) e o número da última linha.
+    
+    Returns:
+        Linhas de df_new efetivamente anexadas (recibos que ainda não estavam no arquivo)
+    """
+    header: Optional[List[str]] = None
+    inline_receipts: Set[bytes] = set()
+    shared_receipts: Set[bytes] = set()
+    last_row = 0
+    
+    # Cabeçalho da aba (até <sheetData>), sem a tag <dimension> (que ficaria desatualizada)
+    buffer = b''
+    while _SHEET_DATA_RE.search(buffer) is None:
+        chunk = src.read(COPY_CHUNK_SIZE)
+        if not chunk:
+            raise ValueError(f"Aba {RECEIPTS_SHEET} inválida")
+        buffer += chunk
+    if _SHEET_DATA_RE.search(buffer).group(1):
+        raise ValueError(f"Aba {RECEIPTS_SHEET} vazia")
+    buffer = _DIMENSION_RE.sub(b'', buffer, count=1)
+    
+    # Copiar as linhas existentes até a última </row> de cada bloco
+    while True:
+        progress.check()
+        cut = buffer.rfind(b'</row>')
+        if cut >= 0:
+            cut += len(b'</row>')
+            block = buffer[:cut]
+            if header is None:
+                header_row = _HEADER_ROW_RE.search(block)
+                if header_row is not None:
+                    header = [str(value) for value in row_values(header_row.group(1), shared)]
+            inline_receipts.update(_INLINE_RECEIPT_RE.findall(block))
+            shared_receipts.update(_SHARED_RECEIPT_RE.findall(block))
+            row_start = block.rfind(b'<row r="')
+            if row_start >= 0:
+                digits = block[row_start + 8:block.index(b'"', row_start + 8)]
+                last_row = int(digits)
+            dst.write(block)
+            buffer = buffer[cut:]
+        chunk = src.read(COPY_CHUNK_SIZE)
+        if not chunk:
+            break
+        buffer += chunk
+    
+    if header is None:
+        raise ValueError(f"Aba {RECEIPTS_SHEET} sem cabeçalho")
+    
+    # Recibos novos (os já presentes no arquivo são ignorados)
+    def already_exported(numero) -> bool:
+        numero = str(numero)
+        if escape(numero).encode('utf-8') in inline_receipts:
+            return True
+        if shared_receipts:
+            index = shared.index(numero)
+            return index is not None and str(index).encode('ascii') in shared_receipts
+        return False
+    
+    numeros = df_new['Nº Recibo'].astype(str)
+    novos = {numero for numero in numeros.unique() if not already_exported(numero)}
+    df_added = df_new[numeros.isin(novos)]
+    
+    df_display = _receipts_for_display(df_added)
+    if set(df_display.columns) != set(header):
+        raise ValueError(
+            f"As colunas do arquivo ({', '.join(header)}) não correspondem às dos recibos "
+            f"({', '.join(df_display.columns)})"
+        )
+    if last_row + len(df_display) > EXCEL_MAX_ROWS:
+        raise ValueError(
+            f"O arquivo ficaria com {last_row + len(df_display)} linhas, acima do limite do Excel "
+            f"({EXCEL_MAX_ROWS}). Exporte os dados em um novo arquivo."
+        )
+    
+    # Linhas novas, com o mesmo zebrado e formatos da exportação
+    progress.total = len(df_display)
+    letters = [get_column_letter(i) for i in range(1, len(header) + 1)]
+    formats = [RECEIPTS_NUMBER_FORMATS.get(col) for col in header]
+    batch = []
+    for row_idx, row in enumerate(df_display[header].itertuples(index=False, name=None), start=last_row + 1):
+        fill = ROW_WHITE if row_idx % 2 == 0 else ROW_GRAY
+        batch.append(_row_xml(row_idx, letters, [
+            (value, styles.xf_id(fill, number_format=_number_format_for(_cell_value(value), fmt)))
+            for value, fmt in zip(row, formats)
+        ]))
+        if len(batch) >= ROW_BATCH_SIZE:
+            dst.write(''.join(batch).encode('utf-8'))
+            progress.advance(len(batch), "Anexando linhas...")
+            batch = []
+    if batch:
+        dst.write(''.join(batch).encode('utf-8'))
+        progress.advance(len(batch), "Anexando linhas...")
+    
+    # Restante original (</sheetData> em diante)
+    dst.write(buffer)
+    return df_added
+
+
+def _stats_rows_xml(df_stats: pd.DataFrame, styles: _StyleRegistry) -> str:
+    """Linhas da aba de estatísticas (cabeçalho e blocos por vendedor), como na exportação."""
+    df_stats_export = _stats_for_display(df_stats)
+    columns = list(df_stats_export.columns)
+    letters = [get_column_letter(i) for i in range(1, len(columns) + 1)]
+    formats = [STATS_NUMBER_FORMATS.get(col) for col in columns]
+    
+    header_style = styles.xf_id(STATS_HEADER_FILL, font=HEADER_FONT, alignment=HEADER_ALIGNMENT)
+    rows = [_row_xml(1, letters, [(str(name), header_style) for name in columns])]
+    
+    current_vendedor = None
+    block_counter = 0
+    for row_idx, row in enumerate(df_stats_export.itertuples(index=False, name=None), start=2):
+        vendedor_value = row[0] if row[0] else ""
+        border = None
+        if vendedor_value != current_vendedor:
+            if current_vendedor is not None:
+                border = BLOCK_BORDER
+            current_vendedor = vendedor_value
+            block_counter += 1
+        fill = BLOCK_FILL_LIGHT if block_counter % 2 == 1 else BLOCK_FILL_DARK
+        
+        rows.append(_row_xml(row_idx, letters, [
+            (value, styles.xf_id(fill, font=VENDEDOR_FONT if col_idx == 0 else DATA_FONT,
+                                 number_format=_number_format_for(_cell_value(value), fmt), border=border))
+            for col_idx, (value, fmt) in enumerate(zip(row, formats))
+        ]))
+    return ''.join(rows)
+
+
+def _aggregates_rows_xml(aggregates: pd.DataFrame) -> str:
+    """Linhas da aba oculta de agregados (sem estilos)."""
+    letters = [get_column_letter(i) for i in range(1, len(AGGREGATE_COLUMNS) + 1)]
+    rows = [_row_xml(1, letters, [(name, 0) for name in AGGREGATE_COLUMNS])]
+    for row_idx, row in enumerate(aggregates[AGGREGATE_COLUMNS].itertuples(index=False, name=None), start=2):
+        rows.append(_row_xml(row_idx, letters, [(value, 0) for value in row]))
+    return ''.join(rows)
+
+
+def append_to_workbook(file_path: str, df_new: pd.DataFrame, progress_callback=None,
+                       cancel_token=None) -> Tuple[str, pd.DataFrame]:
+    """
+    Anexa recibos novos a um arquivo Excel exportado por export_to_excel_with_path.
+    Recibos que já estão no arquivo (mesmo número) são ignorados. A aba de estatísticas
+    é recalculada combinando os agregados guardados no arquivo com os dos recibos novos.
+    
+    Args:
+        file_path: Caminho do arquivo .xlsx existente
+        df_new: DataFrame processado com os recibos a anexar
+        progress_callback: Função callback(current, total, message) com as linhas anexadas
+        cancel_token: CancellationToken opcional (o arquivo original fica inalterado se cancelado)
+    
+    Returns:
+        Tupla (caminho do arquivo, linhas efetivamente anexadas)
+    
+    Raises:
+        ValueError: Se o arquivo não puder receber novas linhas (exportação dividida,
+                    exportado por versão anterior, colunas diferentes ou limite de linhas)
+        OperationCancelled: Se o cancelamento for solicitado
+    """
+    path = Path(file_path)
+    progress = _ExportProgress(len(df_new), progress_callback, cancel_token)
+    
+    with zipfile.ZipFile(path) as zin:
+        parts = WorkbookParts(zin)
+        if INDEX_SHEET in parts.sheets:
+            raise ValueError("Não é possível anexar a uma exportação dividida em várias partes. "
+                             "Exporte os dados em um novo arquivo.")
+        if RECEIPTS_SHEET not in parts.sheets:
+            raise ValueError(f"O arquivo não tem a aba {RECEIPTS_SHEET}")
+        if AGGREGATES_SHEET not in parts.sheets:
+            raise ValueError("O arquivo foi exportado por uma versão anterior do sistema (sem a aba de "
+                             "agregados). Exporte os dados em um novo arquivo.")
+        
+        shared = SharedStrings(zin, parts.shared_strings)
+        old_aggregates = aggregates_from_rows(read_sheet_rows(zin.read(parts.sheets[AGGREGATES_SHEET]), shared))
+        styles = _StyleRegistry(zin.read(parts.styles))
+        receipts_part = parts.sheets[RECEIPTS_SHEET]
+        stats_part = parts.sheets.get(STATS_SHEET)
+        aggregates_part = parts.sheets[AGGREGATES_SHEET]
+        rewritten = {receipts_part, stats_part, aggregates_part, parts.styles}
+        
+        # Gravar em um arquivo temporário na mesma pasta e substituir o original no fim
+        fd, tmp_name = tempfile.mkstemp(suffix='.tmp', prefix=f'.{path.stem}_', dir=str(path.parent))
+        os.close(fd)
+        try:
+            with zipfile.ZipFile(tmp_name, 'w', zipfile.ZIP_DEFLATED) as zout:
+                for info in zin.infolist():
+                    if info.filename not in rewritten:
+                        zout.writestr(info, zin.read(info.filename))
+                
+                with zin.open(receipts_part) as src, zout.open(receipts_part, 'w', force_zip64=True) as dst:
+                    df_added = _append_receipt_rows(src, dst, df_new, styles, shared, progress)
+                
+                aggregates = merge_seller_aggregates(old_aggregates, seller_aggregates(df_added))
+                if stats_part is not None:
+                    df_stats = statistics_from_aggregates(aggregates)
+                    zout.writestr(stats_part, _replace_sheet_data(zin.read(stats_part),
+                                                                  _stats_rows_xml(df_stats, styles)))
+                zout.writestr(aggregates_part, _replace_sheet_data(zin.read(aggregates_part),
+                                                                   _aggregates_rows_xml(aggregates)))
+                zout.writestr(parts.styles, styles.to_bytes())
+        except BaseException as e:
+            os.remove(tmp_name)
+            if isinstance(e, OperationCancelled):
+                logger.info(f"Anexação cancelada: {path}")
+            raise
+    
+    if df_added.empty:
+        os.remove(tmp_name)
+        logger.info(f"Nenhum recibo novo para anexar em {path}")
+        return str(path), df_added
+    
+    # O original só é substituído depois de fechado (necessário no Windows)
+    try:
+        os.replace(tmp_name, str(path))
+    except OSError:
+        os.remove(tmp_name)
+        raise
+    
+    logger.info(f"{len(df_added)} linha(s) anexada(s) a {path} "
+                f"({df_added['Nº Recibo'].nunique()} recibo(s) novo(s))")
+    return str(path), df_added
@@ -1,13 +1,19 @@
 """
 Módulo para exportação de dados para Excel.
+A gravação é feita por backends (openpyxl, xlsxwriter, CSV e Parquet),
+escolhidos pela extensão do arquivo e pelo número de linhas.
 """
 import sys
 import os
+import numbers
+import re
+import threading
 
 # Tentar importar openpyxl com tratamento de erro melhorado
 try:
-    from openpyxl import load_workbook
-    from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Font, Alignment, PatternFill, Border, Side, NamedStyle
     from openpyxl.utils import get_column_letter
 except ImportError as e:
     # Se for executável standalone, tentar adicionar _internal ao path
@@ -17,8 +23,9 @@ except ImportError as e:
         if os.path.exists(internal_path) and internal_path not in sys.path:
             sys.path.insert(0, internal_path)
         try:
-            from openpyxl import load_workbook
-            from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
+            from openpyxl import Workbook
+            from openpyxl.cell import WriteOnlyCell
+            from openpyxl.styles import Font, Alignment, PatternFill, Border, Side, NamedStyle
             from openpyxl.utils import get_column_letter
         except ImportError:
             raise ImportError(
@@ -29,198 +36,836 @@ except ImportError as e:
     else:
         raise
 
+# Tentar importar xlsxwriter (opcional, escritor xlsx mais rápido para exportações grandes)
+try:
+    import xlsxwriter
+    XLSXWRITER_AVAILABLE = True
+except ImportError:
+    XLSXWRITER_AVAILABLE = False
+
+import numpy as np
 import pandas as pd
+from abc import ABC, abstractmethod
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Dict, List, Optional, Tuple, Union
+
+from data_processor import (CENTS_SCALE, PRICE_PER_MG_SCALE, QUANTITY_SCALE, calculate_seller_statistics,
+                            scaled_to_float, seller_aggregates)
+from columnar_store import PYARROW_AVAILABLE, STATS_SUFFIX, write_table
+from cancellation import OperationCancelled
+
+# Importar logger
+try:
+    from logger import get_logger
+    logger = get_logger()
+except ImportError:
+    # Se logger não estiver disponível, criar um logger silencioso
+    class DummyLogger:
+        def info(self, *args, **kwargs): pass
+        def debug(self, *args, **kwargs): pass
+        def warning(self, *args, **kwargs): pass
+        def error(self, *args, **kwargs): pass
+        def separador(self, *args, **kwargs): pass
+    logger = DummyLogger()
+
+
+# Colunas monetárias da aba de estatísticas e suas escalas (centavos; preços por MG em milésimos de centavo)
+STATS_MONEY_COLUMNS = {
+    'Valor Total': CENTS_SCALE,
+    'Preço Médio por MG': PRICE_PER_MG_SCALE,
+    'Preço Mínimo por MG': PRICE_PER_MG_SCALE,
+    'Preço Máximo por MG': PRICE_PER_MG_SCALE,
+}
 
 
-def format_excel_file(file_path: str, has_stats: bool = False):
+# Intervalo (em linhas) entre atualizações de progresso e verificações de cancelamento
+PROGRESS_ROW_STEP = 2000
+
+
+class _ExportProgress:
+    """
+    Contagem das linhas gravadas. A cada PROGRESS_ROW_STEP linhas informa o
+    progresso e verifica se o cancelamento foi solicitado.
     """
-    Formata o arquivo Excel gerado com estilos e larguras de coluna.
     
-    Args:
-        file_path: Caminho para o arquivo Excel
-        has_stats: Se True, formata também a aba de estatísticas
+    def __init__(self, total: int, progress_callback=None, cancel_token=None):
+        """
+        Args:
+            total: Total de linhas de recibos a gravar
+            progress_callback: Função callback(current, total, message) para reportar progresso
+            cancel_token: CancellationToken opcional
+        """
+        self.total = total
+        self.done = 0
+        self.progress_callback = progress_callback
+        self.cancel_token = cancel_token
+        self._next_report = PROGRESS_ROW_STEP
+    
+    def check(self):
+        """Interrompe com OperationCancelled se o cancelamento foi solicitado."""
+        if self.cancel_token is not None:
+            self.cancel_token.raise_if_cancelled()
+    
+    def advance(self, rows: int = 1, message: str = "Gravando linhas...", force: bool = False):
+        """Registra linhas gravadas (force=True reporta imediatamente)."""
+        self.done += rows
+        if force or self.done >= self._next_report or self.done >= self.total:
+            self._next_report = self.done + PROGRESS_ROW_STEP
+            self.check()
+            if self.progress_callback:
+                self.progress_callback(min(self.done, self.total), self.total, message)
+
+
+def _wait_futures(futures: dict, progress: _ExportProgress, message: str):
+    """
+    Aguarda tarefas de um pool de processos, reportando o progresso a cada tarefa
+    concluída (futures: future -> número de linhas). Se o cancelamento for
+    solicitado, as tarefas ainda não iniciadas são canceladas.
     """
+    pending = set(futures)
     try:
-        wb = load_workbook(file_path)
-        
-        # Formatar aba de Recibos
-        if 'Recibos' in wb.sheetnames:
-            ws = wb['Recibos']
-            _format_receipts_sheet(ws)
-        
-        # Formatar aba de Estatísticas
-        if has_stats and 'Estatísticas por Vendedor' in wb.sheetnames:
-            ws_stats = wb['Estatísticas por Vendedor']
-            _format_stats_sheet(ws_stats)
+        while pending:
+            done, pending = wait(pending, timeout=0.2, return_when=FIRST_COMPLETED)
+            for future in done:
+                future.result()
+                progress.advance(futures[future], message, force=True)
+            progress.check()
+    except BaseException:
+        for future in pending:
+            future.cancel()
+        raise
+
+
+def _remove_files(paths: List[Path]):
+    """Remove arquivos parciais (ignora os inexistentes ou ainda em uso)."""
+    for path in paths:
+        try:
+            path.unlink()
+        except OSError:
+            pass
+
+
+def _remove_after_futures(futures, paths: List[Path]):
+    """Aguarda as tarefas em andamento terminarem e remove os arquivos que elas gravaram."""
+    wait(futures)
+    _remove_files(paths)
+
+
+def _receipts_for_display(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Converte as colunas inteiras (centavos/milésimos) da aba Recibos para reais/unidades.
+    Os valores continuam numéricos; a exibição no padrão brasileiro fica por conta
+    do formato numérico da coluna no Excel.
+    """
+    df_export = df.copy()
+    if 'Valor Unitário' in df_export.columns:
+        df_export['Valor Unitário'] = scaled_to_float(df_export['Valor Unitário'], CENTS_SCALE)
+    if 'Quantidade' in df_export.columns:
+        df_export['Quantidade'] = scaled_to_float(df_export['Quantidade'], QUANTITY_SCALE)
+    return df_export
+
+
+def _stats_for_display(df_stats: pd.DataFrame) -> pd.DataFrame:
+    """Converte as estatísticas em centavos/milésimos para reais/unidades (valores numéricos)."""
+    df_stats_export = df_stats.copy()
+    for col, scale in STATS_MONEY_COLUMNS.items():
+        if col in df_stats_export.columns:
+            df_stats_export[col] = scaled_to_float(df_stats_export[col], scale)
+    if 'Quantidade Total' in df_stats_export.columns:
+        df_stats_export['Quantidade Total'] = scaled_to_float(df_stats_export['Quantidade Total'], QUANTITY_SCALE)
+    return df_stats_export
+
+
+# Nomes das abas
+RECEIPTS_SHEET = 'Recibos'
+STATS_SHEET = 'Estatísticas por Vendedor'
+INDEX_SHEET = 'Índice'
+# Aba oculta com os agregados por vendedor/produto (inteiros), usada para anexar
+# novos recibos sem reler as linhas já exportadas (ver excel_appender)
+AGGREGATES_SHEET = '_Agregados'
+
+# Limite de linhas de uma aba do Excel (incluindo o cabeçalho)
+EXCEL_MAX_ROWS = 1048576
+
+# Larguras das colunas da aba Recibos
+RECEIPTS_COLUMN_WIDTHS = {
+    'A': 15,  # Nº Recibo
+    'B': 30,  # Vendedor
+    'C': 35,  # Cliente
+    'D': 40,  # Descrição do Produto
+    'E': 12,  # Quantidade
+    'F': 15,  # Valor Unitário
+    'G': 20   # Data da Venda
+}
+
+# Formatos numéricos da aba Recibos (aplicados a células numéricas/datas).
+# O Excel exibe os separadores conforme o idioma do sistema (1.080,00 em pt-BR)
+RECEIPTS_NUMBER_FORMATS = {
+    'Quantidade': '#,##0.000',
+    'Valor Unitário': '#,##0.00',
+    'Data da Venda': 'dd/mm/yyyy hh:mm:ss'
+}
+
+# Larguras das colunas da aba Índice (exportações divididas em várias abas/arquivos)
+INDEX_COLUMN_WIDTHS = {
+    'A': 22,  # Aba
+    'B': 30,  # Arquivo
+    'C': 18,  # Primeiro Recibo
+    'D': 18,  # Último Recibo
+    'E': 14,  # Nº Recibos
+    'F': 14   # Nº Linhas
+}
+
+# Larguras das colunas da aba de estatísticas
+STATS_COLUMN_WIDTHS = {
+    'A': 30,  # Vendedor
+    'B': 40,  # Produto
+    'C': 18,  # Quantidade Total
+    'D': 18,  # Valor Total
+    'E': 20,  # Preço Médio por MG
+    'F': 20,  # Preço Mínimo por MG
+    'G': 20   # Preço Máximo por MG
+}
+
+# Formatos numéricos da aba de estatísticas (preços por MG exibem frações de centavo)
+STATS_NUMBER_FORMATS = {
+    'Quantidade Total': '#,##0.000',
+    'Valor Total': '#,##0.00',
+    'Preço Médio por MG': '#,##0.00###',
+    'Preço Mínimo por MG': '#,##0.00###',
+    'Preço Máximo por MG': '#,##0.00###'
+}
+
+# Estilos (criados uma única vez e compartilhados por todas as células)
+HEADER_FONT = Font(bold=True, color="FFFFFF", size=11)
+HEADER_ALIGNMENT = Alignment(horizontal="center", vertical="center")
+RECEIPTS_HEADER_FILL = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+STATS_HEADER_FILL = PatternFill(start_color="70AD47", end_color="70AD47", fill_type="solid")
+ROW_WHITE = PatternFill(start_color="FFFFFF", end_color="FFFFFF", fill_type="solid")
+ROW_GRAY = PatternFill(start_color="F2F2F2", end_color="F2F2F2", fill_type="solid")
+BLOCK_FILL_LIGHT = PatternFill(start_color="E8F5E9", end_color="E8F5E9", fill_type="solid")
+BLOCK_FILL_DARK = PatternFill(start_color="C8E6C9", end_color="C8E6C9", fill_type="solid")
+DATA_FONT = Font(size=10, color="000000")
+VENDEDOR_FONT = Font(size=10, color="000000", bold=True)
+DATA_ALIGNMENT = Alignment(horizontal="left", vertical="center")
+BLOCK_BORDER = Border(top=Side(style='medium', color='808080'))
+
+
+def _cell_value(value):
+    """Converte um valor do DataFrame para o tipo gravado na célula (NaN/NaT -> vazio)."""
+    if value is None:
+        return None
+    if isinstance(value, pd.Timestamp):
+        return None if pd.isna(value) else value.to_pydatetime()
+    if isinstance(value, float) and value != value:
+        return None
+    if value is pd.NaT or value is pd.NA:
+        return None
+    return value
+
+
+def _number_format_for(value, number_format: Optional[str]) -> Optional[str]:
+    """Formato numérico a aplicar na célula: apenas para números e datas."""
+    if (number_format and isinstance(value, (numbers.Number, datetime))
+            and not isinstance(value, bool)):
+        return number_format
+    return None
+
+
+class _CellStyler:
+    """
+    Cria células write-only já estilizadas.
+    Cada combinação de estilos vira um estilo nomeado (NamedStyle), registrado no workbook
+    uma única vez e depois aplicado pelo nome, evitando recalcular o hash dos objetos
+    de estilo a cada célula.
+    """
+    
+    def __init__(self, ws):
+        self.ws = ws
+        self._styles = {}
+    
+    def cell(self, value, fill, font=DATA_FONT, alignment=DATA_ALIGNMENT,
+             number_format: Optional[str] = None, border=None):
+        """Cria uma célula com o valor e os estilos informados."""
+        cell = WriteOnlyCell(self.ws, value=value)
+        number_format = _number_format_for(value, number_format)
         
-        wb.save(file_path)
-    except Exception as e:
-        # Se houver erro na formatação, o arquivo ainda será salvo sem formatação
-        print(f"Aviso: Não foi possível formatar o Excel: {str(e)}")
-
-
-def _format_receipts_sheet(ws):
-    """Formata a aba de Recibos com estilo profissional."""
-    # Cores para formatação
-    header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-    row_white = PatternFill(start_color="FFFFFF", end_color="FFFFFF", fill_type="solid")
-    row_gray = PatternFill(start_color="F2F2F2", end_color="F2F2F2", fill_type="solid")
-    
-    # Formatar cabeçalho
-    header_font = Font(bold=True, color="FFFFFF", size=11)
-    header_alignment = Alignment(horizontal="center", vertical="center")
-    
-    for cell in ws[1]:
-        cell.fill = header_fill
-        cell.font = header_font
-        cell.alignment = header_alignment
-    
-    # Ajustar larguras das colunas
-    column_widths = {
-        'A': 15,  # Nº Recibo
-        'B': 30,  # Vendedor
-        'C': 35,  # Cliente
-        'D': 40,  # Descrição do Produto
-        'E': 12,  # Quantidade
-        'F': 15   # Valor Unitário
-    }
+        key = (id(fill), id(font), id(alignment), number_format, id(border))
+        name = self._styles.get(key)
+        if name is None:
+            wb = self.ws.parent
+            # Nome único no workbook (os estilos de todas as abas ficam na mesma lista)
+            name = f"Recibos {len(wb.named_styles)}"
+            wb.add_named_style(NamedStyle(name=name, font=font, fill=fill, alignment=alignment,
+                                          border=border if border is not None else Border(),
+                                          number_format=number_format or 'General'))
+            self._styles[key] = name
+        cell.style = name
+        return cell
+
+
+def _start_sheet(wb, title: str, columns, header_fill, column_widths: dict):
+    """
+    Cria uma aba write-only com larguras, painel congelado e cabeçalho estilizado.
     
+    Returns:
+        Tupla (aba, _CellStyler da aba)
+    """
+    ws = wb.create_sheet(title)
+    styler = _CellStyler(ws)
+    
+    # Larguras e painel congelado precisam ser definidos antes da primeira linha
     for col, width in column_widths.items():
         ws.column_dimensions[col].width = width
+    ws.freeze_panes = 'A2'
     
-    # Formatar células de dados com linhas intercaladas (zebrado)
-    data_alignment = Alignment(horizontal="left", vertical="center")
-    data_font = Font(size=10, color="000000")
+    ws.append([
+        styler.cell(str(name), header_fill, font=HEADER_FONT, alignment=HEADER_ALIGNMENT)
+        for name in columns
+    ])
+    return ws, styler
+
+
+def _write_table_sheet(wb, title: str, df: pd.DataFrame, header_fill=RECEIPTS_HEADER_FILL,
+                       column_widths: dict = RECEIPTS_COLUMN_WIDTHS,
+                       number_formats: dict = RECEIPTS_NUMBER_FORMATS,
+                       progress: Optional[_ExportProgress] = None):
+    """Grava uma aba linha a linha, com linhas intercaladas (zebrado)."""
+    columns = list(df.columns)
+    ws, styler = _start_sheet(wb, title, columns, header_fill, column_widths)
+    formats = [number_formats.get(col) for col in columns]
     
-    for row_idx, row in enumerate(ws.iter_rows(min_row=2, max_row=ws.max_row), start=2):
+    for row_idx, row in enumerate(df.itertuples(index=False, name=None), start=2):
         # Alternar cores: linhas pares = branco, linhas ímpares = cinza claro
-        fill_color = row_white if row_idx % 2 == 0 else row_gray
+        fill = ROW_WHITE if row_idx % 2 == 0 else ROW_GRAY
+        ws.append([
+            styler.cell(_cell_value(value), fill, number_format=fmt)
+            for value, fmt in zip(row, formats)
+        ])
+        if progress is not None:
+            progress.advance()
+
+
+def _write_stats_sheet(wb, df_stats_export: pd.DataFrame):
+    """Grava a aba de estatísticas linha a linha, com blocos separados por vendedor."""
+    columns = list(df_stats_export.columns)
+    ws, styler = _start_sheet(wb, STATS_SHEET, columns, STATS_HEADER_FILL, STATS_COLUMN_WIDTHS)
+    formats = [STATS_NUMBER_FORMATS.get(col) for col in columns]
+    
+    current_vendedor = None
+    block_counter = 0  # Para alternar cores entre blocos
+    
+    for row in df_stats_export.itertuples(index=False, name=None):
+        vendedor_value = row[0] if row[0] else ""  # Primeira coluna é o vendedor
         
-        for cell in row:
-            cell.alignment = data_alignment
-            cell.fill = fill_color
-            cell.font = data_font
+        # Borda superior na primeira linha de cada novo bloco (exceto o primeiro)
+        border = None
+        if vendedor_value != current_vendedor:
+            if current_vendedor is not None:
+                border = BLOCK_BORDER
+            current_vendedor = vendedor_value
+            block_counter += 1
+        
+        # Alternar cores entre blocos: blocos ímpares = claro, blocos pares = mais escuro
+        fill = BLOCK_FILL_LIGHT if block_counter % 2 == 1 else BLOCK_FILL_DARK
+        
+        ws.append([
+            styler.cell(_cell_value(value), fill,
+                        font=VENDEDOR_FONT if cell_idx == 0 else DATA_FONT,
+                        number_format=fmt, border=border)
+            for cell_idx, (value, fmt) in enumerate(zip(row, formats))
+        ])
+
+
+class _XlsxFormats:
+    """
+    Formatos do xlsxwriter equivalentes aos estilos do openpyxl usados nas abas.
+    Cada combinação é criada uma única vez no workbook.
+    """
     
-    # Formatar coluna de valores (F)
-    for cell in ws['F'][1:]:  # Pular cabeçalho
-        if cell.value and isinstance(cell.value, (int, float)):
-            cell.number_format = '#,##0.00'
+    def __init__(self, workbook):
+        self.workbook = workbook
+        self._formats = {}
     
-    # Formatar coluna de quantidade (E)
-    for cell in ws['E'][1:]:  # Pular cabeçalho
-        if cell.value and isinstance(cell.value, (int, float)):
-            cell.number_format = '0'
+    def get(self, fill, font=DATA_FONT, alignment=DATA_ALIGNMENT,
+            number_format: Optional[str] = None, border=None):
+        """Retorna o formato xlsxwriter para a combinação de estilos."""
+        key = (id(fill), id(font), id(alignment), number_format, id(border))
+        fmt = self._formats.get(key)
+        if fmt is None:
+            props = {
+                'pattern': 1,
+                'bg_color': '#' + fill.start_color.rgb[-6:],
+                'font_size': font.sz,
+                'font_color': '#' + font.color.rgb[-6:],
+                'bold': bool(font.b),
+                'align': alignment.horizontal,
+                'valign': 'vcenter',
+            }
+            if number_format:
+                props['num_format'] = number_format
+            if border is not None:
+                props['top'] = 2  # medium
+                props['top_color'] = '#' + border.top.color.rgb[-6:]
+            fmt = self.workbook.add_format(props)
+            self._formats[key] = fmt
+        return fmt
+
+
+class ExportBackend(ABC):
+    """
+    Backend de exportação. Recebe o DataFrame processado (centavos/milésimos)
+    e as estatísticas, e grava o arquivo no formato do backend.
+    """
+    name = ''
+    extension = ''
     
-    # Congelar primeira linha
-    ws.freeze_panes = 'A2'
+    @abstractmethod
+    def export(self, df: pd.DataFrame, output_path: Path, df_stats: Optional[pd.DataFrame] = None,
+               progress: Optional[_ExportProgress] = None) -> str:
+        """
+        Grava os dados.
+        
+        Args:
+            df: DataFrame processado
+            output_path: Caminho do arquivo
+            df_stats: Estatísticas por vendedor (opcional)
+            progress: Progresso/cancelamento da gravação (opcional)
+        
+        Returns:
+            Caminho do arquivo principal gerado
+        """
 
 
-def _format_stats_sheet(ws):
-    """Formata a aba de Estatísticas por Vendedor com blocos separados."""
-    # Cores para formatação
-    header_fill = PatternFill(start_color="70AD47", end_color="70AD47", fill_type="solid")
-    block_fill_light = PatternFill(start_color="E8F5E9", end_color="E8F5E9", fill_type="solid")
-    block_fill_dark = PatternFill(start_color="C8E6C9", end_color="C8E6C9", fill_type="solid")
-    separator_fill = PatternFill(start_color="FFFFFF", end_color="FFFFFF", fill_type="solid")
-    
-    # Formatar cabeçalho
-    header_font = Font(bold=True, color="FFFFFF", size=11)
-    header_alignment = Alignment(horizontal="center", vertical="center")
-    
-    for cell in ws[1]:
-        cell.fill = header_fill
-        cell.font = header_font
-        cell.alignment = header_alignment
-    
-    # Ajustar larguras das colunas
-    column_widths = {
-        'A': 30,  # Vendedor
-        'B': 40,  # Produto
-        'C': 18,  # Quantidade Total
-        'D': 18,  # Valor Total
-        'E': 20,  # Preço Médio por MG
-        'F': 20,  # Preço Mínimo por MG
-        'G': 20   # Preço Máximo por MG
-    }
+def shard_by_receipt(df: pd.DataFrame, max_rows: int) -> List[pd.DataFrame]:
+    """
+    Divide o DataFrame em partes de no máximo max_rows linhas, sem separar
+    as linhas de um mesmo recibo (as linhas de cada recibo são consecutivas).
+    Um recibo maior que max_rows sozinho é dividido no limite.
     
-    for col, width in column_widths.items():
-        ws.column_dimensions[col].width = width
+    Args:
+        df: DataFrame da aba Recibos
+        max_rows: Número máximo de linhas de dados por parte
     
-    # Identificar blocos por vendedor e formatar
-    data_alignment = Alignment(horizontal="left", vertical="center")
-    data_font = Font(size=10, color="000000")
-    vendedor_font = Font(size=10, color="000000", bold=True)
+    Returns:
+        Lista de DataFrames (um por parte)
+    """
+    total = len(df)
+    if total <= max_rows:
+        return [df]
     
-    # Borda para separação entre blocos
-    thick_border = Border(
-        top=Side(style='medium', color='808080'),
-        bottom=Side(style='thin', color='808080')
-    )
+    # Posições onde começa cada recibo
+    if 'Nº Recibo' in df.columns:
+        numeros = df['Nº Recibo'].astype(str).to_numpy()
+        starts = np.flatnonzero(np.r_[True, numeros[1:] != numeros[:-1]])
+    else:
+        starts = np.arange(total)
     
-    current_vendedor = None
-    block_counter = 0  # Para alternar cores entre blocos
-    previous_row_idx = None
+    shards = []
+    begin = 0
+    while begin < total:
+        limit = begin + max_rows
+        if limit >= total:
+            end = total
+        else:
+            # Último início de recibo que ainda cabe na parte
+            idx = np.searchsorted(starts, limit, side='right') - 1
+            end = starts[idx] if starts[idx] > begin else limit
+        shards.append(df.iloc[begin:end])
+        begin = end
+    return shards
+
+
+def _shard_index(shards: List[pd.DataFrame], sheet_names: List[str], file_names: List[str]) -> pd.DataFrame:
+    """Monta a aba Índice: quais recibos estão em cada aba/arquivo."""
+    rows = []
+    for shard, sheet_name, file_name in zip(shards, sheet_names, file_names):
+        numeros = shard['Nº Recibo'].astype(str) if 'Nº Recibo' in shard.columns else pd.Series(dtype=str)
+        rows.append({
+            'Aba': sheet_name,
+            'Arquivo': file_name,
+            'Primeiro Recibo': numeros.iloc[0] if len(numeros) else '',
+            'Último Recibo': numeros.iloc[-1] if len(numeros) else '',
+            'Nº Recibos': int(numeros.nunique()),
+            'Nº Linhas': len(shard),
+        })
+    return pd.DataFrame(rows, columns=['Aba', 'Arquivo', 'Primeiro Recibo', 'Último Recibo', 'Nº Recibos', 'Nº Linhas'])
+
+
+def _write_shard_workbook(backend_name: str, output_path: str, df_shard: pd.DataFrame):
+    """Grava uma parte em um arquivo próprio (executado em um processo separado)."""
+    backend = EXPORT_BACKENDS[backend_name]()
+    backend.write_workbook(Path(output_path), [(RECEIPTS_SHEET, df_shard)])
+
+
+class _XlsxBackend(ExportBackend):
+    """
+    Base dos backends xlsx (abas Recibos e Estatísticas por Vendedor).
+    Exportações acima do limite de linhas do Excel são divididas, sem separar
+    recibos, em abas Recibos_1..N (shard_mode='sheets') ou em arquivos
+    <nome>_1..N.xlsx gravados em paralelo (shard_mode='workbooks'); em ambos os
+    casos uma aba Índice informa onde está cada faixa de recibos.
+    """
+    extension = '.xlsx'
+    
+    def __init__(self, shard_mode: str = 'sheets', max_rows_per_sheet: int = EXCEL_MAX_ROWS - 1,
+                 max_workers: Optional[int] = None):
+        """
+        Args:
+            shard_mode: 'sheets' (várias abas no mesmo arquivo) ou 'workbooks' (vários arquivos)
+            max_rows_per_sheet: Linhas de dados por aba (padrão: limite do Excel)
+            max_workers: Processos para gravar os arquivos em paralelo (None = automático)
+        """
+        if shard_mode not in ('sheets', 'workbooks'):
+            raise ValueError(f"Modo de divisão desconhecido: {shard_mode}")
+        self.shard_mode = shard_mode
+        self.max_rows_per_sheet = max_rows_per_sheet
+        self.max_workers = max_workers
     
-    for row_idx, row in enumerate(ws.iter_rows(min_row=2, max_row=ws.max_row), start=2):
-        vendedor_cell = row[0]  # Primeira coluna é o vendedor
-        vendedor_value = vendedor_cell.value if vendedor_cell.value else ""
+    def export(self, df: pd.DataFrame, output_path: Path, df_stats: Optional[pd.DataFrame] = None,
+               progress: Optional[_ExportProgress] = None) -> str:
+        progress = progress or _ExportProgress(len(df))
         
-        # Verificar se mudou o vendedor
-        if vendedor_value != current_vendedor:
-            # Novo bloco de vendedor
-            if current_vendedor is not None and previous_row_idx is not None:
-                # Adicionar borda superior na primeira linha do novo bloco para separação visual
-                for cell in row:
-                    cell.border = Border(top=Side(style='medium', color='808080'))
+        # Converter centavos/milésimos para reais/unidades (valores numéricos)
+        df_export = _receipts_for_display(df)
+        
+        # Manter valores numéricos para formatação no Excel (não converter para string),
+        # apenas convertendo centavos/milésimos para reais/unidades
+        df_stats_export = _stats_for_display(df_stats) if (df_stats is not None and not df_stats.empty) else None
+        
+        shards = shard_by_receipt(df_export, self.max_rows_per_sheet)
+        if len(shards) == 1:
+            self.write_workbook(output_path, [(RECEIPTS_SHEET, df_export)], df_stats_export, progress=progress,
+                                df_aggregates=seller_aggregates(df))
+            return str(output_path)
+        
+        logger.info(f"Exportação dividida em {len(shards)} parte(s) ({self.shard_mode})")
+        sheet_names = [f"{RECEIPTS_SHEET}_{i}" for i in range(1, len(shards) + 1)]
+        
+        if self.shard_mode == 'sheets':
+            # Abas de um mesmo arquivo são gravadas em sequência (escrita em streaming)
+            file_names = [output_path.name] * len(shards)
+            df_index = _shard_index(shards, sheet_names, file_names)
+            self.write_workbook(output_path, list(zip(sheet_names, shards)), df_stats_export, df_index,
+                                progress=progress)
+            return str(output_path)
+        
+        # Um arquivo por parte, gravados em paralelo; o arquivo principal fica com Índice e estatísticas
+        shard_paths = [output_path.with_name(f"{output_path.stem}_{i}{output_path.suffix}")
+                       for i in range(1, len(shards) + 1)]
+        df_index = _shard_index(shards, [RECEIPTS_SHEET] * len(shards), [p.name for p in shard_paths])
+        
+        executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        futures = {}
+        try:
+            futures = {executor.submit(_write_shard_workbook, self.name, str(path), shard): len(shard)
+                       for path, shard in zip(shard_paths, shards)}
+            self.write_workbook(output_path, [], df_stats_export, df_index)
+            _wait_futures(futures, progress, "Gravando arquivos...")
+        except BaseException:
+            # Cancelamento ou falha: não esperar as partes em andamento e remover todos os arquivos;
+            # as partes que ainda estavam sendo gravadas são removidas quando terminarem
+            executor.shutdown(wait=False, cancel_futures=True)
+            _remove_files(shard_paths + [output_path])
+            threading.Thread(target=_remove_after_futures, args=(list(futures), shard_paths), daemon=True).start()
+            raise
+        executor.shutdown()
+        
+        return str(output_path)
+    
+    @abstractmethod
+    def write_workbook(self, output_path: Path, receipt_sheets: List[Tuple[str, pd.DataFrame]],
+                       df_stats_export: Optional[pd.DataFrame] = None,
+                       df_index: Optional[pd.DataFrame] = None,
+                       progress: Optional[_ExportProgress] = None,
+                       df_aggregates: Optional[pd.DataFrame] = None):
+        """
+        Grava um arquivo xlsx.
+        
+        Args:
+            output_path: Caminho do arquivo
+            receipt_sheets: Lista de (nome da aba, DataFrame) com as linhas de recibos
+            df_stats_export: Estatísticas por vendedor (opcional)
+            df_index: Aba Índice (opcional, apenas em exportações divididas)
+            progress: Progresso/cancelamento da gravação (opcional)
+            df_aggregates: Agregados por vendedor para a aba oculta (opcional, apenas em arquivo único)
+        """
+
+
+class OpenpyxlBackend(_XlsxBackend):
+    """
+    Grava o arquivo Excel em uma única passada (openpyxl em modo write-only).
+    Os estilos e formatos são aplicados no momento em que cada linha é gravada,
+    sem recarregar o arquivo depois, mantendo o uso de memória constante.
+    """
+    name = 'openpyxl'
+    
+    def write_workbook(self, output_path: Path, receipt_sheets: List[Tuple[str, pd.DataFrame]],
+                       df_stats_export: Optional[pd.DataFrame] = None,
+                       df_index: Optional[pd.DataFrame] = None,
+                       progress: Optional[_ExportProgress] = None,
+                       df_aggregates: Optional[pd.DataFrame] = None):
+        wb = Workbook(write_only=True)
+        try:
+            if df_index is not None:
+                _write_table_sheet(wb, INDEX_SHEET, df_index, column_widths=INDEX_COLUMN_WIDTHS, number_formats={})
             
-            current_vendedor = vendedor_value
-            block_counter += 1
+            for title, df_sheet in receipt_sheets:
+                _write_table_sheet(wb, title, df_sheet, progress=progress)
+            
+            if df_stats_export is not None and not df_stats_export.empty:
+                _write_stats_sheet(wb, df_stats_export)
+            
+            if df_aggregates is not None:
+                ws = wb.create_sheet(AGGREGATES_SHEET)
+                ws.sheet_state = 'hidden'
+                ws.append(list(df_aggregates.columns))
+                for row in df_aggregates.itertuples(index=False, name=None):
+                    ws.append([_cell_value(value) for value in row])
+        except BaseException:
+            # Cancelamento ou falha: encerrar as abas já iniciadas (o arquivo não é gravado)
+            for ws in wb.worksheets:
+                if not ws.closed:
+                    ws.close()
+            raise
         
-        # Alternar cores entre blocos: blocos ímpares = claro, blocos pares = mais escuro
-        block_fill = block_fill_light if block_counter % 2 == 1 else block_fill_dark
+        wb.save(str(output_path))
+
+
+class XlsxWriterBackend(_XlsxBackend):
+    """
+    Grava o arquivo Excel com xlsxwriter em modo constant_memory (cada linha é
+    descarregada no disco assim que a próxima começa). Mesmas abas e estilos do
+    backend openpyxl, com escrita várias vezes mais rápida.
+    """
+    name = 'xlsxwriter'
+    
+    def write_workbook(self, output_path: Path, receipt_sheets: List[Tuple[str, pd.DataFrame]],
+                       df_stats_export: Optional[pd.DataFrame] = None,
+                       df_index: Optional[pd.DataFrame] = None,
+                       progress: Optional[_ExportProgress] = None,
+                       df_aggregates: Optional[pd.DataFrame] = None):
+        if not XLSXWRITER_AVAILABLE:
+            raise ImportError(
+                "xlsxwriter não está instalado.\n"
+                "Instale com: pip install xlsxwriter"
+            )
         
-        for cell_idx, cell in enumerate(row):
-            cell.alignment = data_alignment
-            cell.fill = block_fill
+        workbook = xlsxwriter.Workbook(str(output_path), {'constant_memory': True})
+        formats = _XlsxFormats(workbook)
+        try:
+            if df_index is not None:
+                self._write_table_sheet(workbook, formats, INDEX_SHEET, df_index,
+                                        column_widths=INDEX_COLUMN_WIDTHS, number_formats={})
             
-            # Destacar coluna de vendedor com fonte bold
-            if cell_idx == 0:
-                cell.font = vendedor_font
-            else:
-                cell.font = data_font
-        
-        previous_row_idx = row_idx
-    
-    # Formatar coluna de Valor Total (D)
-    for cell in ws['D'][1:]:  # Pular cabeçalho
-        if cell.value and isinstance(cell.value, (int, float)):
-            cell.number_format = '#,##0.00'
-    
-    # Formatar coluna de Quantidade Total (C)
-    for cell in ws['C'][1:]:  # Pular cabeçalho
-        if cell.value and isinstance(cell.value, (int, float)):
-            cell.number_format = '#,##0.00'
-    
-    # Formatar coluna de Preço Médio por MG (E)
-    for cell in ws['E'][1:]:  # Pular cabeçalho
-        if cell.value and isinstance(cell.value, (int, float)):
-            cell.number_format = '#,##0.00'
-    
-    # Formatar coluna de Preço Mínimo por MG (F)
-    for cell in ws['F'][1:]:  # Pular cabeçalho
-        if cell.value and isinstance(cell.value, (int, float)):
-            cell.number_format = '#,##0.00'
-    
-    # Formatar coluna de Preço Máximo por MG (G)
-    for cell in ws['G'][1:]:  # Pular cabeçalho
-        if cell.value and isinstance(cell.value, (int, float)):
-            cell.number_format = '#,##0.00'
-    
-    # Congelar primeira linha
-    ws.freeze_panes = 'A2'
+            for title, df_sheet in receipt_sheets:
+                self._write_table_sheet(workbook, formats, title, df_sheet, progress=progress)
+            
+            # Aba de estatísticas, com blocos por vendedor
+            if df_stats_export is not None and not df_stats_export.empty:
+                columns = list(df_stats_export.columns)
+                ws = self._start_sheet(workbook, formats, STATS_SHEET, columns,
+                                       STATS_HEADER_FILL, STATS_COLUMN_WIDTHS)
+                number_formats = [STATS_NUMBER_FORMATS.get(col) for col in columns]
+                
+                current_vendedor = None
+                block_counter = 0
+                for row_idx, row in enumerate(df_stats_export.itertuples(index=False, name=None), start=1):
+                    vendedor_value = row[0] if row[0] else ""
+                    border = None
+                    if vendedor_value != current_vendedor:
+                        if current_vendedor is not None:
+                            border = BLOCK_BORDER
+                        current_vendedor = vendedor_value
+                        block_counter += 1
+                    fill = BLOCK_FILL_LIGHT if block_counter % 2 == 1 else BLOCK_FILL_DARK
+                    
+                    for col_idx, (value, number_format) in enumerate(zip(row, number_formats)):
+                        value = _cell_value(value)
+                        fmt = formats.get(fill, font=VENDEDOR_FONT if col_idx == 0 else DATA_FONT,
+                                          number_format=_number_format_for(value, number_format),
+                                          border=border)
+                        self._write_cell(ws, row_idx, col_idx, value, fmt)
+            
+            if df_aggregates is not None:
+                ws = workbook.add_worksheet(AGGREGATES_SHEET)
+                ws.hide()
+                ws.write_row(0, 0, list(df_aggregates.columns))
+                for row_idx, row in enumerate(df_aggregates.itertuples(index=False, name=None), start=1):
+                    for col_idx, value in enumerate(row):
+                        self._write_cell(ws, row_idx, col_idx, _cell_value(value), None)
+        finally:
+            workbook.close()
+    
+    def _write_table_sheet(self, workbook, formats: _XlsxFormats, title: str, df: pd.DataFrame,
+                           header_fill=RECEIPTS_HEADER_FILL, column_widths: dict = RECEIPTS_COLUMN_WIDTHS,
+                           number_formats: dict = RECEIPTS_NUMBER_FORMATS,
+                           progress: Optional[_ExportProgress] = None):
+        """Grava uma aba com linhas intercaladas (zebrado)."""
+        columns = list(df.columns)
+        ws = self._start_sheet(workbook, formats, title, columns, header_fill, column_widths)
+        column_formats = [number_formats.get(col) for col in columns]
+        
+        for row_idx, row in enumerate(df.itertuples(index=False, name=None), start=1):
+            # Linhas pares do Excel (índice 1, 3, ...) = branco, ímpares = cinza claro
+            fill = ROW_WHITE if row_idx % 2 == 1 else ROW_GRAY
+            for col_idx, (value, number_format) in enumerate(zip(row, column_formats)):
+                value = _cell_value(value)
+                fmt = formats.get(fill, number_format=_number_format_for(value, number_format))
+                self._write_cell(ws, row_idx, col_idx, value, fmt)
+            if progress is not None:
+                progress.advance()
+    
+    @staticmethod
+    def _start_sheet(workbook, formats: _XlsxFormats, title: str, columns, header_fill, column_widths: dict):
+        """Cria a aba com larguras, painel congelado e cabeçalho estilizado."""
+        ws = workbook.add_worksheet(title)
+        for col, width in column_widths.items():
+            ws.set_column(f"{col}:{col}", width)
+        ws.freeze_panes(1, 0)
+        
+        header_format = formats.get(header_fill, font=HEADER_FONT, alignment=HEADER_ALIGNMENT)
+        for col_idx, name in enumerate(columns):
+            ws.write_string(0, col_idx, str(name), header_format)
+        return ws
+    
+    @staticmethod
+    def _write_cell(ws, row_idx: int, col_idx: int, value, fmt):
+        """Grava uma célula escolhendo o método pelo tipo do valor."""
+        if value is None:
+            ws.write_blank(row_idx, col_idx, None, fmt)
+        elif isinstance(value, str):
+            ws.write_string(row_idx, col_idx, value, fmt)
+        elif isinstance(value, datetime):
+            ws.write_datetime(row_idx, col_idx, value, fmt)
+        elif isinstance(value, numbers.Number) and not isinstance(value, bool):
+            ws.write_number(row_idx, col_idx, float(value), fmt)
+        else:
+            ws.write(row_idx, col_idx, value, fmt)
+
+
+# Casas decimais fixas das colunas numéricas no CSV (as mesmas dos formatos do Excel)
+CSV_FLOAT_FORMATS = {
+    'Quantidade': '%.3f',
+    'Valor Unitário': '%.2f',
+    'Quantidade Total': '%.3f',
+    'Valor Total': '%.2f',
+    'Preço Médio por MG': '%.5f',
+    'Preço Mínimo por MG': '%.5f',
+    'Preço Máximo por MG': '%.5f',
+}
+
+
+def _fixed_decimals(df: pd.DataFrame, decimal: str = ',') -> pd.DataFrame:
+    """Converte as colunas de CSV_FLOAT_FORMATS em texto com casas decimais fixas."""
+    df = df.copy()
+    for col, float_format in CSV_FLOAT_FORMATS.items():
+        if col in df.columns:
+            values = pd.to_numeric(df[col]).to_numpy(dtype=float, na_value=np.nan)
+            text = np.char.replace(np.char.mod(float_format, values), '.', decimal)
+            df[col] = np.where(np.isnan(values), '', text)
+    return df
+
+
+class CsvBackend(ExportBackend):
+    """
+    Grava os recibos em CSV (padrão brasileiro: separador ';' e vírgula decimal),
+    em blocos de linhas. As estatísticas vão para "<nome>.estatisticas.csv".
+    Quantidades e valores são gravados com casas decimais fixas (CSV_FLOAT_FORMATS).
+    """
+    name = 'csv'
+    extension = '.csv'
+    chunksize = 50000
+    
+    def export(self, df: pd.DataFrame, output_path: Path, df_stats: Optional[pd.DataFrame] = None,
+               progress: Optional[_ExportProgress] = None) -> str:
+        progress = progress or _ExportProgress(len(df))
+        df_export = _receipts_for_display(df)
+        
+        csv_options = dict(index=False, sep=';', decimal=',', date_format='%d/%m/%Y %H:%M:%S')
+        with open(output_path, 'w', encoding='utf-8-sig', newline='') as f:
+            df_export.iloc[0:0].to_csv(f, **csv_options)
+            for start in range(0, len(df_export), self.chunksize):
+                chunk = _fixed_decimals(df_export.iloc[start:start + self.chunksize])
+                chunk.to_csv(f, header=False, **csv_options)
+                progress.advance(len(chunk))
+        
+        if df_stats is not None and not df_stats.empty:
+            stats_path = output_path.with_name(output_path.stem + STATS_SUFFIX + self.extension)
+            _fixed_decimals(_stats_for_display(df_stats)).to_csv(stats_path, encoding='utf-8-sig', **csv_options)
+        
+        return str(output_path)
+
+
+class ParquetBackend(ExportBackend):
+    """
+    Grava recibos e estatísticas em Parquet, mantendo os tipos originais
+    (centavos/milésimos em inteiros, data da venda em datetime).
+    Os recibos vão para o arquivo escolhido e as estatísticas para "<nome>.estatisticas.parquet".
+    """
+    name = 'parquet'
+    extension = '.parquet'
+    
+    def export(self, df: pd.DataFrame, output_path: Path, df_stats: Optional[pd.DataFrame] = None,
+               progress: Optional[_ExportProgress] = None) -> str:
+        if not PYARROW_AVAILABLE:
+            raise ImportError(
+                "pyarrow não está instalado.\n"
+                "Instale com: pip install pyarrow"
+            )
+        write_table(df, output_path, 'parquet')
+        if df_stats is not None and not df_stats.empty:
+            stats_path = output_path.with_name(output_path.stem + STATS_SUFFIX + self.extension)
+            write_table(df_stats, stats_path, 'parquet')
+        if progress is not None:
+            progress.advance(len(df))
+        return str(output_path)
+
+
+# Backends disponíveis, por nome
+EXPORT_BACKENDS = {
+    OpenpyxlBackend.name: OpenpyxlBackend,
+    XlsxWriterBackend.name: XlsxWriterBackend,
+    CsvBackend.name: CsvBackend,
+    ParquetBackend.name: ParquetBackend,
+}
+
+# A partir deste número de linhas, exportações xlsx usam o xlsxwriter (se instalado)
+FAST_XLSX_MIN_ROWS = 20000
+
+
+def select_backend(file_path, num_rows: int) -> ExportBackend:
+    """
+    Escolhe o backend de exportação pela extensão do arquivo e pelo número de linhas.
+    
+    Args:
+        file_path: Caminho do arquivo de saída (.xlsx, .csv ou .parquet)
+        num_rows: Número de linhas a exportar
+    
+    Returns:
+        Instância do backend
+    """
+    extension = Path(file_path).suffix.lower()
+    for backend_cls in (CsvBackend, ParquetBackend):
+        if extension == backend_cls.extension:
+            return backend_cls()
+    
+    if num_rows >= FAST_XLSX_MIN_ROWS and XLSXWRITER_AVAILABLE:
+        return XlsxWriterBackend()
+    return OpenpyxlBackend()
+
+
+def _resolve_backend(backend: Union[str, ExportBackend, None], file_path, num_rows: int) -> ExportBackend:
+    """Converte o parâmetro backend (nome, instância ou None = automático) em uma instância."""
+    if backend is None:
+        return select_backend(file_path, num_rows)
+    if isinstance(backend, ExportBackend):
+        return backend
+    if backend not in EXPORT_BACKENDS:
+        raise ValueError(f"Backend de exportação desconhecido: {backend}")
+    return EXPORT_BACKENDS[backend]()
 
 
 def export_to_excel(df: pd.DataFrame, output_dir: Optional[str] = None) -> str:
@@ -247,32 +892,17 @@ def export_to_excel(df: pd.DataFrame, output_dir: Optional[str] = None) -> str:
         else:
             output_path = Path(filename)
         
-        # Converter valores numéricos de volta para formato brasileiro antes de exportar
-        df_export = df.copy()
-        
-        if 'Valor Unitário' in df_export.columns:
-            # Formatar valores como string no formato brasileiro
-            def format_brazilian_currency(value):
-                if pd.isna(value) or value == 0:
-                    return ''
-                return f"{value:,.2f}".replace(',', 'X').replace('.', ',').replace('X', '.')
-            
-            df_export['Valor Unitário'] = df_export['Valor Unitário'].apply(format_brazilian_currency)
-        
-        # Exportar para Excel
-        with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
-            df_export.to_excel(writer, index=False, sheet_name='Recibos')
-        
-        # Formatar o arquivo
-        format_excel_file(str(output_path))
-        
-        return str(output_path)
+        # Exportar para Excel (formatado durante a gravação)
+        backend = select_backend(output_path, len(df))
+        return backend.export(df, output_path)
     
     except Exception as e:
         raise Exception(f"Erro ao exportar para Excel: {str(e)}")
 
 
-def export_to_excel_with_path(df: pd.DataFrame, file_path: str, df_stats: Optional[pd.DataFrame] = None) -> str:
+def export_to_excel_with_path(df: pd.DataFrame, file_path: str, df_stats: Optional[pd.DataFrame] = None,
+                              backend: Union[str, ExportBackend, None] = None,
+                              progress_callback=None, cancel_token=None) -> str:
     """
     Exporta DataFrame para um caminho específico de arquivo Excel.
     Pode incluir uma segunda aba com estatísticas por vendedor.
@@ -281,46 +911,141 @@ def export_to_excel_with_path(df: pd.DataFrame, file_path: str, df_stats: Option
         df: DataFrame pandas a ser exportado (aba Recibos)
         file_path: Caminho completo do arquivo Excel a ser criado
         df_stats: DataFrame opcional com estatísticas por vendedor (aba Estatísticas)
+        backend: 'openpyxl', 'xlsxwriter', 'csv', 'parquet' ou uma instância de ExportBackend.
+                 Se None, escolhe pela extensão do arquivo e pelo número de linhas
+        progress_callback: Função callback(current, total, message) com as linhas gravadas
+        cancel_token: CancellationToken opcional, verificado durante a gravação
         
     Returns:
-        Caminho do arquivo Excel criado
+        Caminho do arquivo criado
         
     Raises:
+        OperationCancelled: Se o cancelamento for solicitado (o arquivo parcial é removido)
         Exception: Se houver erro ao exportar
     """
+    # Garantir que o diretório existe
+    output_path = Path(file_path)
     try:
-        # Converter valores numéricos de volta para formato brasileiro antes de exportar
-        df_export = df.copy()
-        
-        if 'Valor Unitário' in df_export.columns:
-            # Formatar valores como string no formato brasileiro
-            def format_brazilian_currency(value):
-                if pd.isna(value) or value == 0:
-                    return ''
-                return f"{value:,.2f}".replace(',', 'X').replace('.', ',').replace('X', '.')
-            
-            df_export['Valor Unitário'] = df_export['Valor Unitário'].apply(format_brazilian_currency)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
         
-        # Preparar DataFrame de estatísticas se fornecido
-        # Manter valores numéricos para formatação no Excel (não converter para string)
-        df_stats_export = df_stats.copy() if (df_stats is not None and not df_stats.empty) else None
+        export_backend = _resolve_backend(backend, output_path, len(df))
+        logger.info(f"Exportando {len(df)} linha(s) com o backend '{export_backend.name}'")
         
-        # Garantir que o diretório existe
-        output_path = Path(file_path)
-        output_path.parent.mkdir(parents=True, exist_ok=True)
+        # Exportar (formatado durante a gravação)
+        progress = _ExportProgress(len(df), progress_callback, cancel_token)
+        return export_backend.export(df, output_path, df_stats, progress)
+    
+    except OperationCancelled:
+        logger.info(f"Exportação cancelada: {output_path}")
+        if output_path.exists():
+            try:
+                output_path.unlink()
+            except OSError:
+                pass
+        raise
+    except Exception as e:
+        raise Exception(f"Erro ao exportar para Excel: {str(e)}")
+
+
+def _seller_file_name(vendedor: str) -> str:
+    """Nome de arquivo seguro para um vendedor (remove caracteres inválidos no Windows)."""
+    name = re.sub(r'[<>:"/\\|?*\x00-\x1f]', '', str(vendedor or '')).strip().strip('.')
+    name = re.sub(r'\s+', '_', name)
+    return name or 'SEM_VENDEDOR'
+
+
+def _export_seller_workbook(df_seller: pd.DataFrame, file_path: str,
+                            df_stats_seller: Optional[pd.DataFrame],
+                            backend: Union[str, ExportBackend, None]) -> str:
+    """Exporta o arquivo de um vendedor (executado em um processo separado)."""
+    if df_stats_seller is None:
+        df_stats_seller = calculate_seller_statistics(df_seller)
+    return export_to_excel_with_path(df_seller, file_path, df_stats_seller, backend=backend)
+
+
+def export_per_seller(df: pd.DataFrame, output_dir: str, df_stats: Optional[pd.DataFrame] = None,
+                      backend: Union[str, ExportBackend, None] = None,
+                      max_workers: Optional[int] = None, prefix: str = 'recibos_',
+                      progress_callback=None, cancel_token=None) -> Dict[str, str]:
+    """
+    Exporta um arquivo por vendedor, apenas com os recibos e as estatísticas dele.
+    Os arquivos são gravados em paralelo por um pool de processos.
+    
+    Args:
+        df: DataFrame processado
+        output_dir: Pasta onde os arquivos serão criados
+        df_stats: Estatísticas por vendedor (se None, são calculadas por vendedor nos processos)
+        backend: Backend de exportação (ver export_to_excel_with_path)
+        max_workers: Número de processos (None = número de CPUs)
+        prefix: Prefixo do nome dos arquivos ("recibos_<VENDEDOR>.xlsx")
+        progress_callback: Função callback(current, total, message), chamada a cada arquivo concluído
+        cancel_token: CancellationToken opcional (arquivos ainda não iniciados são cancelados)
+    
+    Returns:
+        Dicionário vendedor -> caminho do arquivo criado
         
-        # Exportar para Excel
-        with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
-            df_export.to_excel(writer, index=False, sheet_name='Recibos')
+    Raises:
+        OperationCancelled: Se o cancelamento for solicitado
+        Exception: Se houver erro ao exportar
+    """
+    try:
+        output_path = Path(output_dir)
+        output_path.mkdir(parents=True, exist_ok=True)
+        
+        if df is None or df.empty or 'Vendedor' not in df.columns:
+            return {}
+        
+        stats_by_seller = {}
+        if df_stats is not None and not df_stats.empty:
+            stats_by_seller = {vendedor: grupo for vendedor, grupo in df_stats.groupby('Vendedor', sort=False)}
+        
+        # Particionar por vendedor e definir um nome de arquivo único para cada um
+        jobs = []
+        used_names = set()
+        for vendedor, df_seller in df.groupby('Vendedor', sort=True):
+            name = _seller_file_name(vendedor)
+            unique_name, counter = name, 2
+            while unique_name.lower() in used_names:
+                unique_name = f"{name}_{counter}"
+                counter += 1
+            used_names.add(unique_name.lower())
             
-            if df_stats_export is not None and not df_stats_export.empty:
-                df_stats_export.to_excel(writer, index=False, sheet_name='Estatísticas por Vendedor')
+            file_path = output_path / f"{prefix}{unique_name}.xlsx"
+            stats = None
+            if df_stats is not None:
+                stats = stats_by_seller.get(vendedor, df_stats.iloc[0:0])
+            jobs.append((vendedor, df_seller.reset_index(drop=True), str(file_path), stats))
         
-        # Formatar o arquivo
-        format_excel_file(str(output_path), has_stats=(df_stats_export is not None and not df_stats_export.empty))
+        logger.info(f"Exportando {len(jobs)} arquivo(s) por vendedor em {output_path}")
         
-        return str(output_path)
+        progress = _ExportProgress(len(df), progress_callback, cancel_token)
+        executor = ProcessPoolExecutor(max_workers=max_workers)
+        futures = {}
+        try:
+            futures = {
+                executor.submit(_export_seller_workbook, df_seller, file_path, stats, backend):
+                    (vendedor, len(df_seller), Path(file_path))
+                for vendedor, df_seller, file_path, stats in jobs
+            }
+            _wait_futures({future: rows for future, (_, rows, _) in futures.items()}, progress,
+                          "Gravando arquivos por vendedor...")
+        except BaseException:
+            # Cancelamento ou falha: não esperar os arquivos em andamento. Os arquivos já iniciados
+            # são removidos (os que ainda estavam sendo gravados, quando terminarem); os cancelados
+            # antes de começar não foram tocados
+            executor.shutdown(wait=False, cancel_futures=True)
+            started = [future for future in futures if not future.cancelled()]
+            started_paths = [futures[future][2] for future in started]
+            _remove_files(started_paths)
+            threading.Thread(target=_remove_after_futures, args=(started, started_paths), daemon=True).start()
+            raise
+        executor.shutdown()
+        
+        return {vendedor: future.result() for future, (vendedor, _, _) in futures.items()}
     
+    except OperationCancelled:
+        logger.info("Exportação por vendedor cancelada")
+        raise
     except Exception as e:
-        raise Exception(f"Erro ao exportar para Excel: {str(e)}")
+        raise Exception(f"Erro ao exportar arquivos por vendedor: {str(e)}")
 
@@ -0,0 +1,339 @@
+"""
+Leitura rápida de arquivos Excel exportados pelo sistema.
+A aba Recibos é lida em streaming, bloco a bloco, direto do XML do arquivo (sem
+carregar o workbook inteiro), e o DataFrame processado é reconstruído com os mesmos
+tipos do processamento: valores em centavos, quantidades em milésimos e datas.
+Arquivos antigos, com valores gravados como texto no padrão brasileiro, também são aceitos.
+"""
+import codecs
+import html
+import re
+import zipfile
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from data_processor import (CENTS_SCALE, QUANTITY_SCALE, calculate_seller_statistics,
+                            parse_brazilian_scaled, statistics_from_aggregates)
+from excel_exporter import AGGREGATES_SHEET, INDEX_SHEET, RECEIPTS_SHEET
+from xlsx_reader import SharedStrings, WorkbookParts, aggregates_from_rows, read_sheet_rows
+
+# Importar logger
+try:
+    from logger import get_logger
+    logger = get_logger()
+except ImportError:
+    # Se logger não estiver disponível, criar um logger silencioso
+    class DummyLogger:
+        def info(self, *args, **kwargs): pass
+        def debug(self, *args, **kwargs): pass
+        def warning(self, *args, **kwargs): pass
+        def error(self, *args, **kwargs): pass
+        def separador(self, *args, **kwargs): pass
+    logger = DummyLogger()
+
+
+# Tamanho dos blocos de XML lidos por vez
+READ_CHUNK_SIZE = 4 << 20
+
+# Colunas numéricas da aba Recibos e suas escalas
+SCALED_COLUMNS = {'Quantidade': QUANTITY_SCALE, 'Valor Unitário': CENTS_SCALE}
+DATE_COLUMN = 'Data da Venda'
+
+# Datas do Excel: dias desde 30/12/1899
+EXCEL_EPOCH = '1899-12-30'
+
+_RECEIPT_SHEET_RE = re.compile(rf'^{RECEIPTS_SHEET}(?:_\d+)?$')
+# Célula: coluna, linha, atributos e, no caso comum, o texto inline ou o valor <v>;
+# outras formas (texto com formatação etc.) ficam no último grupo
+_CELL_RE = re.compile(
+    r'<c r="([A-Z]+)(\d+)"([^>]*?)(?<!/)>'
+    r'(?:(?:<f[^>]*>[^<]*</f>|<f[^>]*/>)?(?:<is><t[^>]*>([^<]*)</t></is>|<v>([^<]*)</v>)|(.*?))</c>',
+    re.S)
+_TEXT_RE = re.compile(r'<t(?:\s[^>]*)?>([^<]*)</t>')
+_VALUE_RE = re.compile(r'<v>([^<]*)</v>')
+
+
+def _decode_cells(block: str, shared: SharedStrings) -> pd.DataFrame:
+    """
+    Extrai as células de um bloco de linhas completas.
+    
+    Returns:
+        DataFrame com as colunas row, col, text (textos) e number (números)
+    """
+    cells = pd.DataFrame(_CELL_RE.findall(block), columns=['col', 'row', 'attrs', 'inline', 'value', 'other'],
+                         dtype=object)
+    if cells.empty:
+        return pd.DataFrame(columns=['row', 'col', 'text', 'number'])
+    
+    # Formas pouco comuns: extrair texto e valor célula a célula
+    other = cells['other'] != ''
+    if other.any():
+        cells.loc[other, 'inline'] = cells.loc[other, 'other'].map(lambda inner: ''.join(_TEXT_RE.findall(inner)))
+        cells.loc[other, 'value'] = cells.loc[other, 'other'].map(
+            lambda inner: (_VALUE_RE.search(inner) or [None, ''])[1])
+    
+    # Poucos atributos distintos (estilo e tipo): classificar cada um uma única vez
+    codes, uniques = pd.factorize(cells['attrs'])
+    def kind(marker):
+        return pd.Series(np.array([marker in attr for attr in uniques], dtype=bool)[codes], index=cells.index)
+    inline = kind('t="inlineStr"')
+    shared_idx = kind('t="s"')
+    formula_text = kind('t="str"')
+    
+    text = pd.Series(np.nan, index=cells.index, dtype=object)
+    value = cells['value'].where(cells['value'] != '')
+    if inline.any():
+        text[inline] = cells.loc[inline, 'inline']
+    if formula_text.any():
+        text[formula_text] = value[formula_text]
+    escaped = text.notna() & text.astype(str).str.contains('&', regex=False)
+    if escaped.any():
+        text[escaped] = text[escaped].map(html.unescape)
+    if shared_idx.any():
+        text[shared_idx] = value[shared_idx].astype(int).map(shared.get)
+    text[text == ''] = np.nan
+    
+    is_number = ~(inline | shared_idx | formula_text)
+    number = pd.to_numeric(value.where(is_number), errors='coerce')
+    
+    return pd.DataFrame({
+        'row': cells['row'].astype('int64'),
+        'col': cells['col'],
+        'text': text,
+        'number': number,
+    })
+
+
+def _read_sheet_cells(zin: zipfile.ZipFile, part: str, shared: SharedStrings,
+                      progress=None) -> Tuple[List[str], pd.DataFrame, pd.DataFrame]:
+    """
+    Lê uma aba em streaming.
+    
+    Returns:
+        Tupla (cabeçalho, textos, números); textos e números são tabelas
+        linha x coluna (letra), indexadas pelo número da linha no Excel
+    """
+    texts, numbers_ = [], []
+    header: Optional[List[str]] = None
+    header_cols: List[str] = []
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    buffer = ''
+    
+    with zin.open(part) as src:
+        while True:
+            chunk = src.read(READ_CHUNK_SIZE)
+            buffer += decoder.decode(chunk, final=not chunk)
+            # Processar apenas linhas completas; o restante fica para o próximo bloco
+            cut = buffer.rfind('</row>')
+            if cut >= 0:
+                cut += len('</row>')
+                cells = _decode_cells(buffer[:cut], shared)
+                buffer = buffer[cut:]
+                if header is None and not cells.empty:
+                    first = cells[cells['row'] == 1]
+                    header = [(t if isinstance(t, str) else ('' if pd.isna(n) else _number_text(n)))
+                              for t, n in zip(first['text'], first['number'])]
+                    header_cols = list(first['col'])
+                    cells = cells[cells['row'] != 1]
+                if not cells.empty:
+                    texts.append(cells.pivot(index='row', columns='col', values='text'))
+                    numbers_.append(cells.pivot(index='row', columns='col', values='number'))
+            if progress is not None:
+                progress(src.tell())
+            if not chunk:
+                break
+    
+    if header is None:
+        return [], pd.DataFrame(), pd.DataFrame()
+    text = pd.concat(texts) if texts else pd.DataFrame(columns=header_cols)
+    number = pd.concat(numbers_) if numbers_ else pd.DataFrame(columns=header_cols)
+    text = text.reindex(columns=header_cols)
+    number = number.reindex(index=text.index, columns=header_cols)
+    return header, text, number
+
+
+def _scaled_column(text: pd.Series, number: pd.Series, scale: int) -> pd.Series:
+    """Valores em reais/unidades (números ou texto no padrão brasileiro) -> inteiros escalados."""
+    from_number = (number.fillna(0) * scale).round().astype('int64')
+    if text.notna().any():
+        from_text = parse_brazilian_scaled(text.fillna('').astype(str), scale)
+        return from_text.where(number.isna(), from_number)
+    return from_number
+
+
+def _date_column(text: pd.Series, number: pd.Series) -> pd.Series:
+    """Datas gravadas como número do Excel (ou como texto) -> datetime."""
+    seconds = (number * 86400).round()
+    dates = pd.to_datetime(seconds, unit='s', origin=EXCEL_EPOCH)
+    if text.notna().any():
+        from_text = pd.to_datetime(text, dayfirst=True, errors='coerce', format='mixed')
+        dates = dates.where(number.notna(), from_text)
+    return dates
+
+
+def _number_text(value: float) -> str:
+    """Número gravado em uma coluna de texto, sem notação científica (1234567.0 -> '1234567')."""
+    if float(value).is_integer():
+        return str(int(value))
+    return np.format_float_positional(value, trim='-')
+
+
+def _text_column(text: pd.Series, number: pd.Series) -> pd.Series:
+    """Colunas de texto (números eventualmente gravados como número viram texto; vazio -> NaN)."""
+    if number.notna().any():
+        text = text.where(number.isna(), number.map(_number_text, na_action='ignore'))
+    return text.where(text.notna() & (text != ''), np.nan).astype(object)
+
+
+def _rebuild_receipts(header: List[str], text: pd.DataFrame, number: pd.DataFrame) -> pd.DataFrame:
+    """Reconstrói o DataFrame processado a partir das células da aba Recibos."""
+    data = {}
+    for letter, name in zip(text.columns, header):
+        col_text = text[letter].reset_index(drop=True)
+        col_number = number[letter].reset_index(drop=True).astype(float)
+        if name in SCALED_COLUMNS:
+            data[name] = _scaled_column(col_text, col_number, SCALED_COLUMNS[name])
+        elif name == DATE_COLUMN:
+            data[name] = _date_column(col_text, col_number)
+        else:
+            data[name] = _text_column(col_text, col_number)
+    df = pd.DataFrame(data, columns=header)
+    if 'Nº Recibo' in df.columns:
+        df = df[df['Nº Recibo'].notna()].reset_index(drop=True)
+    return df
+
+
+def _receipt_parts(path: Path, zin: zipfile.ZipFile, parts: WorkbookParts,
+                   shared: SharedStrings) -> List[Tuple[Path, Optional[str]]]:
+    """
+    Abas/arquivos com linhas de recibos de uma exportação, na ordem.
+    Exportações divididas em arquivos (aba Índice) incluem os arquivos de cada parte.
+    
+    Returns:
+        Lista de (arquivo, parte XML da aba); parte None = aba Recibos de outro arquivo
+    """
+    sources = [(path, part) for name, part in parts.sheets.items() if _RECEIPT_SHEET_RE.match(name)]
+    
+    if INDEX_SHEET in parts.sheets:
+        rows = read_sheet_rows(zin.read(parts.sheets[INDEX_SHEET]), shared)
+        if rows and 'Arquivo' in rows[0]:
+            col = rows[0].index('Arquivo')
+            others = []
+            for row in rows[1:]:
+                name = row[col] if col < len(row) else None
+                if name and name != path.name and name not in others:
+                    others.append(name)
+            sources.extend((path.with_name(name), None) for name in others)
+    return sources
+
+
+def read_exported_receipts(file_path, progress_callback=None, cancel_token=None) -> pd.DataFrame:
+    """
+    Lê as linhas de recibos de um arquivo exportado (inclusive exportações divididas).
+    
+    Args:
+        file_path: Caminho do arquivo .xlsx
+        progress_callback: Função callback(current, total, message) com os bytes lidos de cada aba
+        cancel_token: CancellationToken opcional
+        
+    Returns:
+        DataFrame processado (Quantidade em milésimos, Valor Unitário em centavos)
+    """
+    path = Path(file_path)
+    with zipfile.ZipFile(path) as zin:
+        parts = WorkbookParts(zin)
+        sources = _receipt_parts(path, zin, parts, SharedStrings(zin, parts.shared_strings))
+    if not sources:
+        raise ValueError(f"O arquivo não tem a aba {RECEIPTS_SHEET}")
+    
+    frames = []
+    for source, part in sources:
+        with zipfile.ZipFile(source) as zin:
+            parts = WorkbookParts(zin)
+            shared = SharedStrings(zin, parts.shared_strings)
+            if part is None:
+                part_list = [p for name, p in parts.sheets.items() if _RECEIPT_SHEET_RE.match(name)]
+            else:
+                part_list = [part]
+            
+            for sheet_part in part_list:
+                total = zin.getinfo(sheet_part).file_size
+                
+                def report(done, total=total, name=source.name):
+                    if cancel_token is not None:
+                        cancel_token.raise_if_cancelled()
+                    if progress_callback:
+                        progress_callback(min(done, total), total, f"Lendo {name}...")
+                
+                header, text, number = _read_sheet_cells(zin, sheet_part, shared, report)
+                if header:
+                    frames.append(_rebuild_receipts(header, text, number))
+    
+    if not frames:
+        return pd.DataFrame()
+    df = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+    logger.info(f"Excel lido: {path} ({len(df)} linha(s))")
+    return df
+
+
+def load_export(file_path, progress_callback=None, cancel_token=None) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Recarrega um arquivo Excel exportado.
+    As estatísticas vêm da aba de agregados, quando existir, ou são recalculadas.
+    
+    Args:
+        file_path: Caminho do arquivo .xlsx
+        progress_callback: Função callback(current, total, message)
+        cancel_token: CancellationToken opcional
+    
+    Returns:
+        Tupla (DataFrame processado, estatísticas por vendedor)
+    """
+    df = read_exported_receipts(file_path, progress_callback, cancel_token)
+    with zipfile.ZipFile(file_path) as zin:
+        parts = WorkbookParts(zin)
+        if AGGREGATES_SHEET in parts.sheets:
+            shared = SharedStrings(zin, parts.shared_strings)
+            rows = read_sheet_rows(zin.read(parts.sheets[AGGREGATES_SHEET]), shared)
+            return df, statistics_from_aggregates(aggregates_from_rows(rows))
+    return df, calculate_seller_statistics(df)
+
+
+def merge_exports(paths: List, progress_callback=None, cancel_token=None) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Combina vários arquivos Excel exportados e recalcula as estatísticas.
+    Os arquivos são lidos um por vez; recibos presentes em mais de um arquivo
+    são mantidos apenas na primeira ocorrência.
+    
+    Args:
+        paths: Lista de caminhos .xlsx
+        progress_callback: Função callback(current, total, message) com os arquivos lidos
+        cancel_token: CancellationToken opcional
+    
+    Returns:
+        Tupla (DataFrame combinado, estatísticas por vendedor)
+    """
+    frames = []
+    seen = set()
+    
+    for i, path in enumerate(paths):
+        if progress_callback:
+            progress_callback(i, len(paths), f"Lendo {Path(path).name}...")
+        df = read_exported_receipts(path, cancel_token=cancel_token)
+        if 'Nº Recibo' in df.columns:
+            numeros = df['Nº Recibo'].astype(str)
+            df = df[~numeros.isin(seen)]
+            seen.update(numeros.unique())
+        frames.append(df)
+    
+    if progress_callback:
+        progress_callback(len(paths), len(paths), "Calculando estatísticas...")
+    if not frames:
+        return pd.DataFrame(), pd.DataFrame()
+    
+    merged = pd.concat(frames, ignore_index=True)
+    logger.info(f"{len(frames)} arquivo(s) Excel combinados: {len(merged)} linha(s)")
+    return merged, calculate_seller_statistics(merged)
@@ -7,6 +7,9 @@ Verifica dependências antes de iniciar o programa.
 
 import sys
 import os
+import json
+import importlib.metadata
+import importlib.util
 
 # CORREÇÃO CRÍTICA: Configurar paths ANTES de qualquer importação quando for executável
 # Quando não usa --onefile, o PyInstaller coloca dependências em _internal
@@ -29,6 +32,33 @@ if getattr(sys, 'frozen', False):
         if os.path.exists(subfolder_path) and subfolder_path not in sys.path:
             sys.path.insert(0, subfolder_path)
 
+# Dependências obrigatórias (nome do módulo = nome do pacote no pip)
+DEPENDENCIAS_OBRIGATORIAS = ['pdfplumber', 'pandas', 'openpyxl']
+
+# Arquivos do programa que precisam estar na pasta
+ARQUIVOS_NECESSARIOS = [
+    'main.py',
+    'pdf_extractor.py',
+    'data_processor.py',
+    'excel_exporter.py',
+    'receipt_store.py',
+    'columnar_store.py',
+    'date_partitions.py',
+    'cancellation.py',
+    'job_queue.py',
+    'lazy_modules.py',
+    'preview_index.py',
+    'event_loop_monitor.py',
+    'excel_appender.py',
+    'xlsx_reader.py',
+    'excel_loader.py',
+    'progress_state.py',
+    'logger.py'
+]
+
+# Impressão digital do último ambiente verificado com sucesso
+ARQUIVO_VERIFICACAO = 'ambiente_verificado.json'
+
 def verificar_python():
     """Verifica se a versão do Python é compatível."""
     versao = sys.version_info
@@ -62,16 +92,24 @@ def instalar_dependencia(modulo):
         print(f"[ERRO] Erro ao instalar {modulo}: {e}")
         return False
 
+def modulo_disponivel(modulo):
+    """
+    Verifica se um módulo pode ser importado, sem importá-lo.
+    (Importar pandas/pdfplumber só para testar atrasava a abertura da janela;
+    o programa os carrega em segundo plano depois que a janela abre.)
+    """
+    try:
+        return importlib.util.find_spec(modulo) is not None
+    except (ImportError, ValueError):
+        return False
+
 def verificar_e_instalar_dependencias():
     """Verifica e instala dependências automaticamente se necessário."""
-    dependencias_obrigatorias = ['pdfplumber', 'pandas', 'openpyxl']
     dependencias_faltando = []
     
     # Verificar quais dependências faltam
-    for modulo in dependencias_obrigatorias:
-        try:
-            __import__(modulo)
-        except ImportError:
+    for modulo in DEPENDENCIAS_OBRIGATORIAS:
+        if not modulo_disponivel(modulo):
             dependencias_faltando.append(modulo)
     
     # Se todas estão instaladas, retornar True
@@ -93,10 +131,9 @@ def verificar_e_instalar_dependencias():
     
     if todas_instaladas:
         # Verificar novamente se foram instaladas corretamente
+        importlib.invalidate_caches()
         for modulo in dependencias_faltando:
-            try:
-                __import__(modulo)
-            except ImportError:
+            if not modulo_disponivel(modulo):
                 todas_instaladas = False
                 break
         
@@ -124,16 +161,8 @@ def verificar_e_instalar_dependencias():
 
 def verificar_arquivos():
     """Verifica se todos os arquivos necessários estão presentes."""
-    arquivos_necessarios = [
-        'main.py',
-        'pdf_extractor.py',
-        'data_processor.py',
-        'excel_exporter.py',
-        'logger.py'
-    ]
-    
     arquivos_faltando = []
-    for arquivo in arquivos_necessarios:
+    for arquivo in ARQUIVOS_NECESSARIOS:
         if not os.path.exists(arquivo):
             arquivos_faltando.append(arquivo)
     
@@ -147,6 +176,50 @@ def verificar_arquivos():
     
     return True
 
+def impressao_digital_ambiente():
+    """
+    Descreve o ambiente verificado: interpretador, versões dos pacotes obrigatórios
+    e data de modificação dos arquivos do programa.
+    Qualquer alteração (outro Python, pacote atualizado ou removido, arquivo
+    atualizado ou faltando) muda a impressão digital.
+    """
+    pacotes = {}
+    for pacote in DEPENDENCIAS_OBRIGATORIAS:
+        try:
+            pacotes[pacote] = importlib.metadata.version(pacote)
+        except importlib.metadata.PackageNotFoundError:
+            pacotes[pacote] = None
+    
+    arquivos = {}
+    for arquivo in ARQUIVOS_NECESSARIOS + ['requirements.txt']:
+        try:
+            arquivos[arquivo] = os.path.getmtime(arquivo)
+        except OSError:
+            arquivos[arquivo] = None
+    
+    return {
+        'python': sys.executable,
+        'versao_python': sys.version,
+        'pacotes': pacotes,
+        'arquivos': arquivos
+    }
+
+def ambiente_ja_verificado(impressao_digital):
+    """Verifica se o ambiente atual é igual ao último verificado com sucesso."""
+    try:
+        with open(ARQUIVO_VERIFICACAO, 'r', encoding='utf-8') as f:
+            return json.load(f) == impressao_digital
+    except (OSError, ValueError):
+        return False
+
+def salvar_verificacao(impressao_digital):
+    """Grava a impressão digital do ambiente verificado (falhas são ignoradas)."""
+    try:
+        with open(ARQUIVO_VERIFICACAO, 'w', encoding='utf-8') as f:
+            json.dump(impressao_digital, f, ensure_ascii=False, indent=2)
+    except OSError:
+        pass
+
 def main():
     """Função principal de inicialização."""
     # Mudar para o diretório do script
@@ -186,73 +259,34 @@ def main():
         if not verificar_python():
             sys.exit(1)
         
-        # Verificar arquivos apenas se não for standalone
-        if not verificar_arquivos():
-            sys.exit(1)
-        
-        # Verificar e instalar dependências automaticamente apenas se não for standalone
-        if not verificar_e_instalar_dependencias():
-            sys.exit(1)
+        # Ambiente igual ao da última verificação: pular as verificações de arquivos e dependências
+        if ambiente_ja_verificado(impressao_digital_ambiente()):
+            print("Ambiente sem alteracoes desde a ultima verificacao.")
+        else:
+            # Verificar arquivos apenas se não for standalone
+            if not verificar_arquivos():
+                sys.exit(1)
+            
+            # Verificar e instalar dependências automaticamente apenas se não for standalone
+            if not verificar_e_instalar_dependencias():
+                sys.exit(1)
+            
+            # Recalcular depois de uma eventual instalação
+            salvar_verificacao(impressao_digital_ambiente())
         
         print("Tudo OK! Iniciando o sistema...")
         print()
     
     # Importar e executar o programa principal
     try:
-        # Testar importações críticas primeiro
+        # Verificar se as dependências críticas estão no executável (sem importá-las)
         if is_standalone:
-            # Debug: mostrar sys.path para diagnóstico
-            print("sys.path configurado:")
-            for i, path in enumerate(sys.path[:5]):
-                print(f"  [{i}] {path}")
-            if len(sys.path) > 5:
-                print(f"  ... e mais {len(sys.path) - 5} caminhos")
-            print()
-            
-            # Verificar se pdfplumber está acessível
-            import importlib.util
-            pdfplumber_found = False
-            for path in sys.path:
-                pdfplumber_path = os.path.join(path, 'pdfplumber')
-                if os.path.exists(pdfplumber_path) or os.path.exists(pdfplumber_path + '.py'):
-                    print(f"pdfplumber encontrado em: {path}")
-                    pdfplumber_found = True
-                    break
-            if not pdfplumber_found:
-                print("AVISO: pdfplumber nao encontrado em nenhum caminho do sys.path")
-            print()
-            print("Testando importações críticas...")
-            try:
-                import numpy
-                print("  [OK] numpy")
-            except ImportError as e:
-                print(f"  [ERRO] numpy: {e}")
-                import tkinter.messagebox as msgbox
-                msgbox.showerror("Erro de Dependência", 
-                    f"Erro ao carregar numpy:\n\n{str(e)}\n\n"
-                    "O executável pode estar corrompido ou incompleto.\n"
-                    "Por favor, gere um novo executável usando instaler.bat")
-                sys.exit(1)
-            
-            try:
-                import pandas as pd
-                print("  [OK] pandas")
-                # Testar funcionalidade básica do pandas
-                df = pd.DataFrame({'test': [1, 2, 3]})
-                print("  [OK] pandas funcional")
-            except ImportError as e:
-                print(f"  [ERRO] pandas: {e}")
-                import tkinter.messagebox as msgbox
-                msgbox.showerror("Erro de Dependência", 
-                    f"Erro ao carregar pandas:\n\n{str(e)}\n\n"
-                    "O executável pode estar corrompido ou incompleto.\n"
-                    "Por favor, gere um novo executável usando instaler.bat")
-                sys.exit(1)
-            except Exception as e:
-                print(f"  [ERRO] pandas funcionalidade: {e}")
+            faltando = [modulo for modulo in ('numpy', 'pandas', 'pdfplumber') if not modulo_disponivel(modulo)]
+            if faltando:
+                print(f"  [ERRO] Dependencias nao encontradas: {', '.join(faltando)}")
                 import tkinter.messagebox as msgbox
                 msgbox.showerror("Erro de Dependência", 
-                    f"Erro ao usar pandas:\n\n{str(e)}\n\n"
+                    f"Dependências não encontradas no executável:\n\n{', '.join(faltando)}\n\n"
                     "O executável pode estar corrompido ou incompleto.\n"
                     "Por favor, gere um novo executável usando instaler.bat")
                 sys.exit(1)
@@ -306,5 +340,8 @@ def main():
         sys.exit(1)
 
 if __name__ == "__main__":
+    # Necessário para os pools de processos (exportação em paralelo) no executável do Windows
+    import multiprocessing
+    multiprocessing.freeze_support()
     main()
 
@@ -0,0 +1,500 @@
+"""
+Fila de processamento de vários PDFs.
+Cada PDF é um job (extração + processamento) executado em um pool limitado de
+processos de trabalho (WorkerPool, mantido aquecido durante a sessão), com progresso
+e estado por arquivo. Os recibos são processados à medida que são extraídos e enviados
+em lotes (resultados parciais), para a interface exibi-los antes do fim do arquivo.
+Os resultados são combinados em um único DataFrame, mantendo cada recibo apenas na
+primeira ocorrência.
+"""
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from cancellation import OperationCancelled
+from data_processor import post_validate_and_clean, process_receipt_data, summarize_rows
+from pdf_extractor import extract_from_pdf
+
+# Importar logger
+try:
+    from logger import get_logger, inicializar_log
+    logger = get_logger()
+except ImportError:
+    # Se logger não estiver disponível, criar um logger silencioso
+    class DummyLogger:
+        def info(self, *args, **kwargs): pass
+        def debug(self, *args, **kwargs): pass
+        def warning(self, *args, **kwargs): pass
+        def error(self, *args, **kwargs): pass
+        def separador(self, *args, **kwargs): pass
+    logger = DummyLogger()
+    inicializar_log = None
+
+
+# Número máximo de processos de trabalho (um núcleo fica livre para a interface)
+MAX_WORKERS = max(1, min(4, (os.cpu_count() or 2) - 1))
+
+# Estados de um job
+JOB_PENDING = 'Aguardando'
+JOB_RUNNING = 'Processando'
+JOB_DONE = 'Concluído'
+JOB_FAILED = 'Erro'
+JOB_CANCELLED = 'Cancelado'
+
+# PDFs processados por um processo de trabalho antes de ser substituído
+# (o pdfminer não devolve toda a memória usada em PDFs grandes)
+MAX_TASKS_PER_CHILD = 20
+
+# Intervalo (segundos) de espera por eventos de progresso dos processos de trabalho
+_QUEUE_POLL_INTERVAL = 0.1
+
+# Resultados parciais: um lote é enviado a cada PARTIAL_BATCH_SIZE recibos ou
+# PARTIAL_INTERVAL segundos (o que ocorrer primeiro)
+PARTIAL_BATCH_SIZE = 50
+PARTIAL_INTERVAL = 0.5
+
+# Tipos de evento enviados pelos processos de trabalho: (run_id, job_id, tipo, dados)
+EVENT_PROGRESS = 'progresso'  # dados = (current, total, mensagem)
+EVENT_PARTIAL = 'parcial'     # dados = DataFrame do lote
+
+# Estado de cada processo de trabalho (definido por _init_worker)
+_progress_queue = None
+_dedup_index = None
+_dedup_key = None
+
+
+def _init_worker(log_file: Optional[str], progress_queue):
+    """
+    Inicializa um processo de trabalho. Os módulos pesados (pdfplumber/pdfminer, pandas)
+    já foram importados junto com este módulo, então o processo fica pronto para extrair.
+    
+    Args:
+        log_file: Arquivo de log da sessão (os processos gravam no mesmo log)
+        progress_queue: Fila para os eventos (run_id, job_id, tipo, dados)
+    """
+    global _progress_queue
+    if log_file and inicializar_log is not None:
+        inicializar_log(log_file)
+    _progress_queue = progress_queue
+
+
+def _worker_dedup_index(dedup_db_path: Optional[str], dedup_version: int):
+    """
+    Índice de deduplicação do processo de trabalho.
+    É recarregado do banco apenas quando a versão informada muda (recibos registrados
+    depois da última carga), já que o processo é reutilizado entre execuções.
+    O banco é aberto somente para leitura: as tabelas e o modo WAL são configurados
+    pelo processo da interface, que também registra os recibos.
+    """
+    global _dedup_index, _dedup_key
+    if not dedup_db_path:
+        return None
+    key = (dedup_db_path, dedup_version)
+    if key != _dedup_key:
+        from receipt_store import ReceiptDedupIndex
+        _dedup_index = ReceiptDedupIndex(dedup_db_path, read_only=True)
+        _dedup_key = key
+    return _dedup_index
+
+
+class _PartialBatches:
+    """
+    Processa cada recibo assim que é extraído e envia as linhas em lotes
+    (EVENT_PARTIAL) para a interface. As linhas de todos os lotes formam o resultado
+    final do job, sem processar os recibos uma segunda vez.
+    """
+    
+    def __init__(self, run_id: int, job_id: int):
+        self.run_id = run_id
+        self.job_id = job_id
+        self.frames = []    # Lotes já enviados
+        self._pending = []  # DataFrames dos recibos ainda não enviados
+        self._pending_receipts = 0
+        self._last_flush = time.perf_counter()
+        self._receipts = []  # Recibos recebidos, na ordem dos lotes
+    
+    def add(self, receipt_data: Dict):
+        """Processa um recibo (receipt_callback de extract_from_pdf)."""
+        self._receipts.append(receipt_data)
+        df = process_receipt_data(receipt_data)
+        if not df.empty:
+            self._pending.append(df)
+        self._pending_receipts += 1
+        if (self._pending_receipts >= PARTIAL_BATCH_SIZE
+                or time.perf_counter() - self._last_flush >= PARTIAL_INTERVAL):
+            self.flush()
+    
+    def flush(self):
+        """Envia as linhas pendentes como um lote."""
+        self._last_flush = time.perf_counter()
+        self._pending_receipts = 0
+        if not self._pending:
+            return
+        batch = pd.concat(self._pending, ignore_index=True)
+        self._pending = []
+        self.frames.append(batch)
+        _progress_queue.put((self.run_id, self.job_id, EVENT_PARTIAL, batch))
+    
+    def result(self, receipts_data: List[Dict]) -> pd.DataFrame:
+        """
+        Envia o último lote e retorna todas as linhas (como process_multiple_receipts).
+        
+        Args:
+            receipts_data: Recibos retornados por extract_from_pdf. Se não forem exatamente os
+                recibos enviados nos lotes (a pré-visualização pode ter lido um recibo que a
+                extração completa dividiu de outra forma), as linhas são refeitas a partir deles
+        """
+        self.flush()
+        frames = self.frames
+        if len(receipts_data) != len(self._receipts) or any(
+                a is not b for a, b in zip(receipts_data, self._receipts)):
+            logger.warning("Recibos da pré-visualização diferentes da extração completa - reprocessando")
+            frames = [df for df in map(process_receipt_data, receipts_data) if not df.empty]
+        if not frames:
+            return pd.DataFrame()
+        return post_validate_and_clean(pd.concat(frames, ignore_index=True))
+
+
+def _run_job(run_id: int, job_id: int, pdf_path: str, dedup_db_path: Optional[str], dedup_version: int,
+             preview_pages: Optional[int] = None, pages=None) -> Dict:
+    """
+    Processa um PDF em um processo de trabalho.
+    Com preview_pages, os recibos das primeiras páginas são enviados à interface
+    assim que lidos (pré-visualização rápida), antes do resto do arquivo.
+    
+    Returns:
+        Dicionário com 'df', 'num_recibos', 'num_ignorados' e 'recibos'
+        (número e impressão digital de cada recibo, para o índice de deduplicação)
+    """
+    def progress_callback(current, total, message=""):
+        _progress_queue.put((run_id, job_id, EVENT_PROGRESS, (current, total, message)))
+    
+    progress_callback(0, 0, "Iniciando...")
+    logger.info(f"Job {job_id + 1}: processando {pdf_path}")
+    dedup_index = _worker_dedup_index(dedup_db_path, dedup_version)
+    skipped_before = dedup_index.skipped_count if dedup_index is not None else 0
+    batches = _PartialBatches(run_id, job_id)
+    
+    def preview_callback(preview_receipts):
+        batches.flush()
+        progress_callback(0, 0, f"Pré-visualização: {len(preview_receipts)} recibo(s) - continuando...")
+    
+    receipts_data = extract_from_pdf(pdf_path, progress_callback, dedup_index=dedup_index,
+                                     receipt_callback=batches.add, preview_pages=preview_pages,
+                                     preview_callback=preview_callback, pages=pages)
+    num_ignorados = (dedup_index.skipped_count - skipped_before) if dedup_index is not None else 0
+    
+    df = batches.result(receipts_data)
+    return {
+        'df': df,
+        'num_recibos': len(receipts_data),
+        'num_ignorados': num_ignorados,
+        'recibos': [{'numero': receipt.get('numero'), 'fingerprint': receipt.get('fingerprint')}
+                    for receipt in receipts_data],
+    }
+
+
+class WorkerPool:
+    """
+    Pool de processos de trabalho mantido durante toda a sessão.
+    Os processos são criados uma vez (start) e reutilizados entre execuções, então um
+    novo PDF começa a ser extraído sem esperar a criação dos processos nem a importação
+    de pdfplumber/pdfminer e pandas. Cada processo é substituído depois de
+    max_tasks_per_child PDFs, limitando o crescimento de memória do pdfminer.
+    O cancelamento encerra os processos imediatamente; o pool é recriado em seguida.
+    """
+    
+    def __init__(self, max_workers: Optional[int] = None, log_file: Optional[str] = None,
+                 max_tasks_per_child: int = MAX_TASKS_PER_CHILD):
+        """
+        Args:
+            max_workers: Número de processos (None = MAX_WORKERS)
+            log_file: Arquivo de log compartilhado com os processos de trabalho
+            max_tasks_per_child: PDFs processados por processo antes de ser substituído
+        """
+        self.max_workers = max_workers or MAX_WORKERS
+        self.log_file = log_file
+        self.max_tasks_per_child = max_tasks_per_child
+        self._lock = threading.Lock()
+        self._pool = None
+        self._progress_queue = None
+        self._run_id = 0
+    
+    @property
+    def started(self) -> bool:
+        """True se os processos de trabalho estão criados."""
+        return self._pool is not None
+    
+    def start(self):
+        """Cria os processos de trabalho (se ainda não existirem)."""
+        with self._lock:
+            if self._pool is not None:
+                return
+            # Uma fila nova por pool: processos encerrados no meio de um envio podem deixar a anterior inutilizável
+            self._progress_queue = multiprocessing.Queue()
+            self._pool = multiprocessing.Pool(self.max_workers, initializer=_init_worker,
+                                              initargs=(self.log_file, self._progress_queue),
+                                              maxtasksperchild=self.max_tasks_per_child)
+        logger.info(f"Pool de processos iniciado: {self.max_workers} processo(s), "
+                    f"substituídos a cada {self.max_tasks_per_child} PDF(s)")
+    
+    def terminate(self, pool=None):
+        """
+        Encerra os processos imediatamente (o próximo start cria um pool novo).
+        
+        Args:
+            pool: Encerrar apenas se este ainda for o pool atual (None = o pool atual)
+        """
+        with self._lock:
+            if pool is None:
+                pool = self._pool
+            if pool is None or pool is not self._pool:
+                return
+            self._pool = None
+        pool.terminate()
+        pool.join()
+    
+    def shutdown(self):
+        """Encerra o pool ao fechar o programa."""
+        self.terminate()
+    
+    def run(self, pdf_paths: List[str], progress_callback=None, status_callback=None,
+            dedup_db_path: Optional[str] = None, dedup_version: int = 0,
+            cancel_token=None, partial_callback=None, preview_pages: Optional[int] = None,
+            pages=None) -> List[Dict]:
+        """
+        Processa vários PDFs em paralelo nos processos do pool.
+        
+        Args:
+            pdf_paths: Caminhos dos PDFs (o job_id é a posição na lista)
+            progress_callback: Função callback(job_id, current, total, mensagem) com o progresso de cada arquivo
+            status_callback: Função callback(job_id, estado, mensagem) chamada quando um job muda de estado
+            dedup_db_path: Banco SQLite do índice de deduplicação (None = não ignorar recibos já importados)
+            dedup_version: Versão do índice (ReceiptDedupIndex.version); os processos recarregam o
+                índice quando ela muda
+            cancel_token: CancellationToken opcional; o cancelamento encerra os processos imediatamente
+            partial_callback: Função callback(job_id, df_lote) chamada com cada lote de
+                linhas processadas, antes do fim do arquivo (resultados parciais)
+            preview_pages: Pré-visualização rápida: número de páginas de cada arquivo lidas e
+                enviadas a partial_callback antes do resto (None = desativada)
+            pages: Seleção de páginas de cada arquivo (ver pdf_extractor.parse_page_ranges);
+                None = todas
+        
+        Returns:
+            Lista (na ordem de pdf_paths) de dicionários com 'path', 'status', 'error', 'df',
+            'num_recibos', 'num_ignorados' e 'recibos'
+        
+        Raises:
+            OperationCancelled: Se o cancelamento for solicitado
+        """
+        results = [{'path': str(path), 'status': JOB_PENDING, 'error': None, 'df': None,
+                    'num_recibos': 0, 'num_ignorados': 0, 'recibos': []} for path in pdf_paths]
+        if not results:
+            return results
+        
+        def set_status(job_id, status, message=""):
+            results[job_id]['status'] = status
+            if status_callback:
+                status_callback(job_id, status, message)
+        
+        self.start()
+        pool, progress_queue = self._pool, self._progress_queue
+        self._run_id += 1
+        run_id = self._run_id
+        logger.info(f"Fila de PDFs: {len(results)} arquivo(s) em {self.max_workers} processo(s)")
+        
+        # O cancelamento encerra os processos sem esperar a página atual terminar
+        # (em outra thread, para não bloquear quem cancelou)
+        def terminate_pool():
+            threading.Thread(target=self.terminate, args=(pool,), daemon=True).start()
+        
+        def drain_progress(timeout):
+            try:
+                while True:
+                    event_run_id, job_id, kind, data = progress_queue.get(timeout=timeout)
+                    timeout = 0
+                    if event_run_id != run_id:
+                        continue  # Evento atrasado de uma execução anterior
+                    if results[job_id]['status'] == JOB_PENDING:
+                        set_status(job_id, JOB_RUNNING)
+                    if kind == EVENT_PARTIAL:
+                        if partial_callback:
+                            partial_callback(job_id, data)
+                    elif progress_callback:
+                        progress_callback(job_id, *data)
+            except queue.Empty:
+                pass
+        
+        dedup_db_path = str(dedup_db_path) if dedup_db_path else None
+        submitted = False
+        try:
+            # Token já cancelado (ex.: durante a espera pelos serviços): nada é enviado ao pool
+            if cancel_token is not None:
+                cancel_token.raise_if_cancelled()
+                cancel_token.add_callback(terminate_pool)
+            submitted = True
+            try:
+                pending = {pool.apply_async(_run_job, (run_id, job_id, result['path'], dedup_db_path, dedup_version,
+                                                       preview_pages, pages)): job_id
+                           for job_id, result in enumerate(results)}
+            except ValueError:
+                # Pool encerrado por um cancelamento durante o envio ("Pool not running")
+                if cancel_token is not None:
+                    cancel_token.raise_if_cancelled()
+                raise
+            while pending:
+                drain_progress(_QUEUE_POLL_INTERVAL)
+                if cancel_token is not None:
+                    cancel_token.raise_if_cancelled()
+                
+                for async_result in [r for r in pending if r.ready()]:
+                    job_id = pending.pop(async_result)
+                    name = Path(results[job_id]['path']).name
+                    try:
+                        results[job_id].update(async_result.get())
+                    except Exception as e:
+                        logger.error(f"Erro ao processar {name}: {str(e)}")
+                        results[job_id]['error'] = str(e)
+                        set_status(job_id, JOB_FAILED, str(e))
+                        continue
+                    drain_progress(0)
+                    logger.info(f"{name}: {results[job_id]['num_recibos']} recibo(s) e "
+                                f"{len(results[job_id]['df'])} linha(s)")
+                    set_status(job_id, JOB_DONE)
+            return results
+        except OperationCancelled:
+            logger.info("Fila de PDFs cancelada")
+            for job_id, result in enumerate(results):
+                if result['status'] in (JOB_PENDING, JOB_RUNNING):
+                    set_status(job_id, JOB_CANCELLED)
+            # Recriar os processos para a próxima execução
+            if submitted:
+                self.terminate(pool)
+            self.start()
+            raise
+        finally:
+            if cancel_token is not None:
+                cancel_token.remove_callback(terminate_pool)
+
+
+def process_pdf_files(pdf_paths: List[str], progress_callback=None, status_callback=None,
+                      dedup_db_path: Optional[str] = None, log_file: Optional[str] = None,
+                      cancel_token=None, max_workers: Optional[int] = None,
+                      partial_callback=None, preview_pages: Optional[int] = None,
+                      pages=None) -> List[Dict]:
+    """
+    Processa vários PDFs em um pool de processos criado só para esta chamada
+    (ver WorkerPool.run para os argumentos e o retorno).
+    
+    Args:
+        max_workers: Número de processos (None = MAX_WORKERS, limitado ao número de arquivos)
+    """
+    workers = max(1, min(max_workers or MAX_WORKERS, len(pdf_paths)))
+    pool = WorkerPool(workers, log_file=log_file)
+    try:
+        return pool.run(pdf_paths, progress_callback, status_callback, dedup_db_path=dedup_db_path,
+                        cancel_token=cancel_token, partial_callback=partial_callback,
+                        preview_pages=preview_pages, pages=pages)
+    finally:
+        pool.shutdown()
+
+
+class PartialResults:
+    """
+    Resultados parciais de uma execução da fila, compartilhados entre a thread que
+    acompanha o pool e a interface. add() apenas guarda cada lote recebido; o DataFrame
+    combinado e o resumo são calculados em snapshot(), só quando chegaram lotes novos.
+    Como em merge_job_results, um recibo enviado por mais de um arquivo é mantido apenas
+    no primeiro que o enviou.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._frames = []
+        self._owners = {}  # Nº do recibo -> job_id que o enviou primeiro
+        self._df = None
+        self._summary = None
+        self._version = 0
+        self._built_version = 0
+        self._finished = False
+    
+    def add(self, job_id: int, batch: pd.DataFrame):
+        """Acrescenta um lote (partial_callback de WorkerPool.run)."""
+        with self._lock:
+            if 'Nº Recibo' in batch.columns:
+                numeros = batch['Nº Recibo'].astype(str)
+                for numero in numeros.unique():
+                    self._owners.setdefault(numero, job_id)
+                owners = numeros.map(self._owners)
+                if (owners != job_id).any():
+                    batch = batch[(owners == job_id).to_numpy()]
+            self._frames.append(batch)
+            self._version += 1
+    
+    @property
+    def version(self) -> int:
+        """Número de lotes recebidos (muda a cada add)."""
+        return self._version
+    
+    def snapshot(self):
+        """Retorna (versão, DataFrame parcial, resumo) mais recentes."""
+        with self._lock:
+            version, frames = self._version, list(self._frames)
+            if version == self._built_version:
+                return version, self._df, self._summary
+        
+        df = pd.concat(frames, ignore_index=True) if frames else None
+        summary = summarize_rows(df)
+        with self._lock:
+            if version > self._built_version:
+                self._df, self._summary, self._built_version = df, summary, version
+            return self._built_version, self._df, self._summary
+    
+    @property
+    def finished(self) -> bool:
+        """True depois de finish()."""
+        return self._finished
+    
+    def finish(self):
+        """Marca a execução como encerrada (a interface para de ler os resultados parciais)."""
+        self._finished = True
+
+
+def merge_job_results(results: List[Dict]) -> pd.DataFrame:
+    """
+    Combina os DataFrames dos jobs concluídos (na ordem dos arquivos).
+    Recibos presentes em mais de um arquivo são mantidos apenas na primeira ocorrência;
+    o 'df' de cada resultado passa a conter apenas as linhas mantidas.
+    
+    Args:
+        results: Resultados de process_pdf_files
+    
+    Returns:
+        DataFrame combinado
+    """
+    frames = []
+    seen = set()
+    
+    for result in results:
+        df = result.get('df')
+        if df is None or df.empty:
+            continue
+        if 'Nº Recibo' in df.columns:
+            numeros = df['Nº Recibo'].astype(str)
+            df = df[~numeros.isin(seen)].reset_index(drop=True)
+            seen.update(numeros.unique())
+        result['df'] = df
+        frames.append(df)
+    
+    if not frames:
+        return pd.DataFrame()
+    
+    merged = pd.concat(frames, ignore_index=True)
+    logger.info(f"{len(frames)} arquivo(s) combinados: {len(merged)} linha(s)")
+    return merged
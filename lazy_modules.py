@@ -0,0 +1,134 @@
+"""
+Importação preguiçosa dos módulos pesados (pandas, pdfplumber/pdfminer, openpyxl...).
+A janela abre sem esperar essas importações: cada módulo é importado no primeiro
+acesso a um atributo ou aquecido em segundo plano logo após a janela abrir (warm_up).
+O tempo de cada importação fica registrado para o relatório de inicialização,
+usado para acompanhar regressões no tempo de abertura.
+"""
+import importlib
+import sys
+import threading
+import time
+from typing import Callable, Iterable, List, Optional, Tuple
+
+# Referência de tempo da inicialização (importado logo no início do main.py)
+STARTUP_TIME = time.perf_counter()
+
+_lock = threading.Lock()
+_import_times = []  # (módulo, segundos, thread)
+_milestones = []    # (marco, segundos desde STARTUP_TIME)
+
+
+class LazyModule:
+    """
+    Substituto de um módulo que só o importa no primeiro acesso a um atributo.
+    Uso: pd = LazyModule('pandas'); pd.DataFrame(...) importa pandas neste momento.
+    """
+    
+    def __init__(self, name: str):
+        """
+        Args:
+            name: Nome do módulo (ex: 'pandas', 'pdf_extractor')
+        """
+        self.__dict__['_name'] = name
+        self.__dict__['_module'] = None
+    
+    def _load(self):
+        """Importa o módulo (uma única vez) e o retorna."""
+        module = self.__dict__['_module']
+        if module is None:
+            module = import_timed(self.__dict__['_name'])
+            self.__dict__['_module'] = module
+        return module
+    
+    @property
+    def loaded(self) -> bool:
+        """True se o módulo já foi importado."""
+        return self.__dict__['_module'] is not None
+    
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+    
+    def __repr__(self):
+        estado = "importado" if self.loaded else "não importado"
+        return f"<LazyModule {self.__dict__['_name']} ({estado})>"
+
+
+def import_timed(name: str):
+    """
+    Importa um módulo registrando o tempo gasto.
+    Módulos já importados retornam imediatamente e não são registrados; assim o tempo
+    de cada módulo exclui as dependências já carregadas por importações anteriores.
+    
+    Args:
+        name: Nome do módulo
+    
+    Returns:
+        Módulo importado
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    start = time.perf_counter()
+    module = importlib.import_module(name)
+    elapsed = time.perf_counter() - start
+    with _lock:
+        _import_times.append((name, elapsed, threading.current_thread().name))
+    return module
+
+
+def warm_up(names: Iterable[str], on_done: Optional[Callable] = None) -> threading.Thread:
+    """
+    Importa os módulos em uma thread de fundo, na ordem dada.
+    Erros de importação não interrompem o aquecimento: ficam registrados no relatório
+    e o erro aparece novamente no primeiro uso do módulo.
+    
+    Args:
+        names: Nomes dos módulos (dos mais básicos para os que dependem deles)
+        on_done: Função chamada na thread de fundo ao terminar (opcional)
+    
+    Returns:
+        Thread iniciada
+    """
+    names = list(names)
+    
+    def run():
+        for name in names:
+            try:
+                import_timed(name)
+            except Exception as e:
+                mark(f"Falha ao importar {name} ({type(e).__name__}: {e})")
+        mark("Módulos aquecidos")
+        if on_done:
+            on_done()
+    
+    thread = threading.Thread(target=run, name="aquecimento", daemon=True)
+    thread.start()
+    return thread
+
+
+def mark(milestone: str):
+    """Registra um marco da inicialização (segundos desde STARTUP_TIME)."""
+    with _lock:
+        _milestones.append((milestone, time.perf_counter() - STARTUP_TIME))
+
+
+def import_report() -> Tuple[List[Tuple[str, float]], List[Tuple[str, float, str]]]:
+    """
+    Retorna (marcos, importações): marcos como (nome, segundos desde a inicialização)
+    e importações como (módulo, segundos, thread), na ordem em que ocorreram.
+    """
+    with _lock:
+        return list(_milestones), list(_import_times)
+
+
+def format_import_report() -> str:
+    """Relatório de inicialização em texto (uma linha por marco e por importação)."""
+    milestones, imports = import_report()
+    lines = ["Relatório de inicialização:"]
+    for milestone, seconds in milestones:
+        lines.append(f"  {milestone}: {seconds:.2f}s")
+    for name, seconds, thread_name in imports:
+        lines.append(f"  import {name}: {seconds:.2f}s ({thread_name})")
+    total = sum(seconds for _, seconds, _ in imports)
+    lines.append(f"  Total em importações: {total:.2f}s")
+    return "\n".join(lines)
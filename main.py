@@ -2,12 +2,15 @@
 Sistema de Extração de Dados de Recibos PDF
 Interface principal com tkinter.
 """
+from lazy_modules import LazyModule, format_import_report, mark, warm_up
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
-import pandas as pd
 from pathlib import Path
 import sys
+import argparse
 import threading
+import multiprocessing
+from datetime import datetime
 
 # Tentar importar tkinterdnd2 (opcional para drag and drop)
 try:
@@ -17,11 +20,417 @@ except ImportError:
     DND_AVAILABLE = False
     TkinterDnD = None
 
-from pdf_extractor import extract_from_pdf
-from data_processor import process_receipt_data, process_multiple_receipts, validate_data, calculate_seller_statistics
-from excel_exporter import export_to_excel
+from cancellation import CancellationToken, OperationCancelled
+from progress_state import POLL_INTERVAL_MS, ProgressState
+from event_loop_monitor import EventLoopMonitor
 from logger import inicializar_log, get_logger
 
+# Módulos pesados (pandas, pdfplumber/pdfminer, openpyxl, pyarrow): importados no primeiro
+# uso ou aquecidos em segundo plano depois que a janela abre (ver WARM_UP_MODULES)
+np = LazyModule('numpy')
+pd = LazyModule('pandas')
+pdf_extractor = LazyModule('pdf_extractor')
+data_processor = LazyModule('data_processor')
+excel_exporter = LazyModule('excel_exporter')
+excel_appender = LazyModule('excel_appender')
+excel_loader = LazyModule('excel_loader')
+receipt_store = LazyModule('receipt_store')
+columnar_store = LazyModule('columnar_store')
+date_partitions = LazyModule('date_partitions')
+job_queue = LazyModule('job_queue')
+preview_index = LazyModule('preview_index')
+
+# Ordem do aquecimento: bibliotecas primeiro, para o relatório separar o custo de cada uma
+WARM_UP_MODULES = (
+    'numpy', 'pandas', 'pdfplumber', 'openpyxl', 'data_processor', 'pdf_extractor',
+    'receipt_store', 'columnar_store', 'date_partitions', 'job_queue',
+    'excel_exporter', 'excel_appender', 'excel_loader', 'preview_index',
+)
+
+
+class ProgressDialog:
+    """
+    Janela de progresso usada pelo processamento e pela exportação.
+    Modal (bloqueia a janela principal) ou não modal (a interface continua utilizável).
+    """
+    
+    WIDTH = 400
+    HEIGHT = 150
+    
+    def __init__(self, parent, colors: dict, title: str, modal: bool = True,
+                 on_cancel=None, unit: str = "páginas", message: str = "Iniciando..."):
+        """
+        Args:
+            parent: Janela principal
+            colors: Cores do tema
+            title: Título da janela
+            modal: Se True, bloqueia a janela principal (grab_set)
+            on_cancel: Função chamada pelo botão Cancelar (None = botão desabilitado)
+            unit: Unidade exibida no contador ("X de Y <unit>")
+            message: Mensagem inicial
+        """
+        self.unit = unit
+        self.on_cancel = on_cancel
+        
+        self.window = tk.Toplevel(parent)
+        self.window.title(title)
+        self.window.geometry(f"{self.WIDTH}x{self.HEIGHT}")
+        self.window.resizable(False, False)
+        self.window.transient(parent)
+        if modal:
+            self.window.grab_set()
+        
+        # Aplicar tema dark na janela de progresso
+        self.window.configure(bg=colors['bg_main'])
+        
+        # Centralizar janela (tamanho fixo: não é preciso processar a geometria antes)
+        x = (self.window.winfo_screenwidth() // 2) - (self.WIDTH // 2)
+        y = (self.window.winfo_screenheight() // 2) - (self.HEIGHT // 2)
+        self.window.geometry(f"{self.WIDTH}x{self.HEIGHT}+{x}+{y}")
+        
+        # Frame principal
+        frame = ttk.Frame(self.window, padding="20")
+        frame.pack(fill=tk.BOTH, expand=True)
+        
+        # Label de status
+        self.label = ttk.Label(
+            frame, 
+            text=message, 
+            font=("Arial", 10),
+            foreground=colors['text_primary']
+        )
+        self.label.pack(pady=(0, 10))
+        
+        # Barra de progresso
+        self.bar = ttk.Progressbar(frame, mode='determinate', length=350)
+        self.bar.pack(pady=(0, 10))
+        
+        # Label de contador
+        self.counter = ttk.Label(
+            frame, 
+            text="", 
+            font=("Arial", 9),
+            foreground=colors['text_secondary']
+        )
+        self.counter.pack()
+        
+        # Botão cancelar
+        self.cancel_btn = ttk.Button(
+            frame, 
+            text="Cancelar", 
+            command=self.cancel, 
+            state=tk.NORMAL if on_cancel else tk.DISABLED
+        )
+        self.cancel_btn.pack(pady=(10, 0))
+        
+        if on_cancel:
+            self.window.protocol("WM_DELETE_WINDOW", self.cancel)
+    
+    def update(self, current, total, message=""):
+        """Atualiza barra, contador e mensagem."""
+        try:
+            if total > 0:
+                if str(self.bar['mode']) != 'determinate':
+                    self.bar.stop()
+                    self.bar['mode'] = 'determinate'
+                self.bar['value'] = (current / total) * 100
+                self.counter.config(text=f"{current} de {total} {self.unit}")
+            else:
+                self.bar['mode'] = 'indeterminate'
+                self.bar.start()
+            
+            if message:
+                self.label.config(text=message)
+        except tk.TclError:
+            pass
+    
+    def cancel(self):
+        """Solicita o cancelamento (o fechamento fica a cargo de quem abriu a janela)."""
+        if self.on_cancel:
+            self.cancel_btn.config(state=tk.DISABLED)
+            self.label.config(text="Cancelando...")
+            self.on_cancel()
+    
+    def close(self):
+        """Fecha a janela."""
+        try:
+            self.bar.stop()
+            self.window.destroy()
+        except tk.TclError:
+            pass
+
+
+# Colunas da fila de PDFs
+JOB_COLUMNS = ('Arquivo', 'Status', 'Progresso')
+
+# Colunas exibidas no preview
+PREVIEW_COLUMNS = ('Nº Recibo', 'Vendedor', 'Cliente', 'Descrição do Produto', 'Quantidade', 'Valor Unitário', 'Data da Venda')
+
+# Espera após a última tecla antes de aplicar a busca do preview
+SEARCH_DEBOUNCE_MS = 150
+
+
+def _format_distinct(values: 'pd.Series', format_values) -> 'np.ndarray':
+    """
+    Formata apenas os valores distintos de uma coluna (data, vendedor e valores se
+    repetem em cada recibo) e distribui o texto pelas linhas.
+    
+    Args:
+        values: Coluna a formatar
+        format_values: Função format_values(Series de valores distintos) -> lista de strings
+        
+    Returns:
+        Array de strings (object) com uma posição por linha; valores vazios viram ''
+    """
+    codes, uniques = pd.factorize(values)
+    formatted = np.empty(len(uniques) + 1, dtype=object)
+    formatted[:-1] = format_values(pd.Series(uniques))
+    formatted[-1] = ''  # código -1 (valor vazio)
+    return formatted[codes]
+
+
+def format_preview_columns(df: 'pd.DataFrame') -> list:
+    """
+    Converte o DataFrame processado nas strings exibidas no preview
+    (centavos/milésimos no formato brasileiro, datas em dd/mm/aaaa hh:mm:ss).
+    
+    Args:
+        df: DataFrame (ou trecho dele)
+        
+    Returns:
+        Lista com um array de strings por coluna, na ordem de PREVIEW_COLUMNS
+    """
+    columns = []
+    for col in PREVIEW_COLUMNS:
+        if col not in df.columns:
+            columns.append(np.full(len(df), '', dtype=object))
+        elif col == 'Quantidade':
+            columns.append(_format_distinct(df[col], lambda values: data_processor.format_brazilian_scaled(
+                values, data_processor.QUANTITY_SCALE).tolist()))
+        elif col == 'Valor Unitário':
+            columns.append(_format_distinct(df[col], lambda values: data_processor.format_brazilian_scaled(
+                values, data_processor.CENTS_SCALE).tolist()))
+        elif col == 'Data da Venda':
+            datas = pd.to_datetime(df[col], errors='coerce')
+            columns.append(_format_distinct(datas, lambda values: values.dt.strftime('%d/%m/%Y %H:%M:%S').fillna('').tolist()))
+        else:
+            columns.append(_format_distinct(df[col], lambda values: values.astype(str).tolist()))
+    return columns
+
+
+def format_preview_rows(df: 'pd.DataFrame') -> list:
+    """
+    Converte um trecho do DataFrame processado nas linhas exibidas no preview.
+    
+    Args:
+        df: Trecho do DataFrame (apenas as linhas visíveis)
+        
+    Returns:
+        Lista de tuplas de strings, na ordem de PREVIEW_COLUMNS
+    """
+    return list(zip(*format_preview_columns(df)))
+
+
+class VirtualTreeview:
+    """
+    Preview virtualizado sobre um ttk.Treeview.
+    O Treeview tem apenas as linhas que cabem na tela; ao rolar, os valores dessas
+    linhas são trocados pelos da nova janela do DataFrame. O tempo para exibir ou
+    rolar não depende do número de linhas dos dados.
+    Busca e ordenação apenas trocam o vetor de posições exibidas (rows), sem copiar
+    o DataFrame nem recriar itens do Treeview.
+    Os textos de todas as linhas podem ser calculados em segundo plano (set_display);
+    até lá, apenas as linhas visíveis são formatadas ao rolar.
+    """
+    
+    def __init__(self, tree: ttk.Treeview, scrollbar: ttk.Scrollbar, format_rows=format_preview_rows):
+        """
+        Args:
+            tree: Treeview com as colunas já configuradas
+            scrollbar: Barra de rolagem vertical (controlada por esta classe)
+            format_rows: Função format_rows(df_trecho) -> lista de tuplas de strings
+        """
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.format_rows = format_rows
+        self.df = None
+        self.rows = None  # Posições exibidas, na ordem da tela (None = todas, na ordem original)
+        self._display = None  # Textos pré-calculados de self.df (um array por coluna)
+        self.offset = 0
+        self.visible_rows = int(str(tree.cget('height')))
+        self._selected = set()  # Posições (no DataFrame) das linhas selecionadas
+        
+        scrollbar.configure(command=self._on_scrollbar)
+        tree.bind('<Configure>', lambda event: self._fit_rows(event.height))
+        tree.bind('<MouseWheel>', self._on_mousewheel)
+        tree.bind('<Button-4>', lambda event: self.scroll_by(-3))
+        tree.bind('<Button-5>', lambda event: self.scroll_by(3))
+        tree.bind('<Prior>', lambda event: self.scroll_by(-self.visible_rows))
+        tree.bind('<Next>', lambda event: self.scroll_by(self.visible_rows))
+        tree.bind('<Control-Home>', lambda event: self.scroll_to(0))
+        tree.bind('<Control-End>', lambda event: self.scroll_to(self.total))
+        tree.bind('<Up>', lambda event: self._on_arrow(-1))
+        tree.bind('<Down>', lambda event: self._on_arrow(1))
+        tree.bind('<<TreeviewSelect>>', self._on_select)
+    
+    @property
+    def total(self) -> int:
+        """Número de linhas exibidas (após a busca)."""
+        if self.df is None:
+            return 0
+        return len(self.df) if self.rows is None else len(self.rows)
+    
+    def set_data(self, df, rows=None, keep_position: bool = False):
+        """
+        Exibe um novo DataFrame.
+        
+        Args:
+            df: DataFrame (None = nenhum dado)
+            rows: Posições exibidas, na ordem da tela (None = todas)
+            keep_position: Mantém a rolagem e a seleção (resultados parciais que crescem
+                durante o processamento); False = volta ao início
+        """
+        if df is not self.df:
+            self._display = None
+        self.df = df
+        self.rows = rows
+        if keep_position:
+            self.offset = max(0, min(self.offset, self.total - self.visible_rows))
+        else:
+            self.offset = 0
+            self._selected = set()
+        self.refresh()
+        # Ajustar o número de linhas ao tamanho atual do Treeview
+        self.tree.after_idle(lambda: self._fit_rows(self.tree.winfo_height()))
+    
+    def set_rows(self, rows):
+        """
+        Troca as linhas exibidas (resultado de busca/ordenação), voltando ao início.
+        A seleção é mantida para as linhas que continuam visíveis nos dados.
+        
+        Args:
+            rows: Vetor de posições no DataFrame, na ordem de exibição (None = todas)
+        """
+        self.rows = rows
+        self.offset = 0
+        self.refresh()
+    
+    def clear(self):
+        """Remove os dados do preview."""
+        self.set_data(None)
+    
+    def set_display(self, df, columns):
+        """
+        Usa os textos pré-calculados das linhas (format_preview_columns) ao rolar.
+        Ignorado se o preview já exibe outro DataFrame.
+        """
+        if df is self.df:
+            self._display = columns
+    
+    def _position(self, view_index: int) -> int:
+        """Posição no DataFrame da linha view_index da visão atual."""
+        return view_index if self.rows is None else int(self.rows[view_index])
+    
+    def scroll_to(self, offset: int):
+        """Rola até a linha indicada (primeira linha visível)."""
+        offset = max(0, min(int(offset), self.total - self.visible_rows))
+        if offset != self.offset:
+            self.offset = offset
+            self.refresh()
+        return "break"
+    
+    def scroll_by(self, delta: int):
+        """Rola delta linhas (negativo = para cima)."""
+        return self.scroll_to(self.offset + delta)
+    
+    def refresh(self):
+        """Preenche as linhas visíveis com o trecho atual do DataFrame."""
+        rows = []
+        if self.total:
+            window = slice(self.offset, self.offset + self.visible_rows)
+            positions = window if self.rows is None else self.rows[window]
+            if self._display is not None:
+                rows = list(zip(*(column[positions] for column in self._display)))
+            else:
+                rows = self.format_rows(self.df.iloc[positions])
+        
+        # Manter no Treeview apenas os itens necessários para a janela
+        items = list(self.tree.get_children())
+        if len(items) > len(rows):
+            self.tree.delete(*items[len(rows):])
+            items = items[:len(rows)]
+        for i in range(len(items), len(rows)):
+            items.append(self.tree.insert('', tk.END, iid=f"linha{i}"))
+        for item, values in zip(items, rows):
+            self.tree.item(item, values=values)
+        
+        # A seleção acompanha os dados, não a posição na tela
+        selected = [item for i, item in enumerate(items) if self._position(self.offset + i) in self._selected]
+        self.tree.selection_set(selected)
+        
+        if self.total:
+            self.scrollbar.set(self.offset / self.total,
+                               min(1.0, (self.offset + self.visible_rows) / self.total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+    
+    def _fit_rows(self, height: int):
+        """Recalcula quantas linhas cabem no Treeview (chamado ao redimensionar)."""
+        items = self.tree.get_children()
+        bbox = self.tree.bbox(items[0]) if items else ''
+        if not bbox:
+            return
+        header_height, row_height = bbox[1], bbox[3]
+        rows = max(1, (height - header_height) // max(1, row_height))
+        if rows != self.visible_rows:
+            self.visible_rows = rows
+            self.offset = max(0, min(self.offset, self.total - rows))
+            self.refresh()
+    
+    def _on_scrollbar(self, *args):
+        """Comandos da barra de rolagem ('moveto' fração ou 'scroll' n unidades/páginas)."""
+        if args[0] == 'moveto':
+            self.scroll_to(round(float(args[1]) * self.total))
+        elif args[0] == 'scroll':
+            amount = int(args[1])
+            if args[2] == 'pages':
+                amount *= self.visible_rows
+            self.scroll_by(amount)
+    
+    def _on_mousewheel(self, event):
+        """Roda do mouse (Windows/macOS)."""
+        steps = -int(event.delta / 120) if abs(event.delta) >= 120 else (-1 if event.delta > 0 else 1)
+        return self.scroll_by(steps * 3)
+    
+    def _on_arrow(self, delta: int):
+        """Setas: ao passar da primeira/última linha visível, rola os dados."""
+        items = self.tree.get_children()
+        if not items:
+            return None
+        focus = self.tree.focus()
+        index = items.index(focus) if focus in items else 0
+        if 0 <= index + delta < len(items):
+            return None  # Movimento normal dentro da janela
+        before = self.offset
+        self.scroll_by(delta)
+        if self.offset != before:
+            self._selected = {self._position(self.offset + index)}
+            self.tree.focus(items[index])
+            self.tree.selection_set(items[index])
+        return "break"
+    
+    def _on_select(self, event=None):
+        """Guarda as posições selecionadas (as de fora da janela são mantidas)."""
+        items = self.tree.get_children()
+        window = {self._position(self.offset + i) for i in range(len(items))}
+        self._selected = {pos for pos in self._selected if pos not in window}
+        self._selected.update(self._position(self.offset + items.index(item))
+                              for item in self.tree.selection() if item in items)
+    
+    def selected_positions(self) -> list:
+        """Posições (no DataFrame) das linhas selecionadas, em ordem."""
+        return sorted(self._selected)
+
 
 class ReceiptExtractorApp:
     def __init__(self, root):
@@ -31,18 +440,81 @@ class ReceiptExtractorApp:
         self.root.resizable(True, True)
         
         self.current_pdf_path = None
+        self.selected_pdfs = []  # Fila de PDFs selecionados (o primeiro é current_pdf_path)
         self.current_dataframe = None
         self.progress_window = None
         self.is_processing = False
+        self.processing_token = None
+        self.partial_results = None  # Resultados parciais do processamento em andamento
+        self.export_dialog = None
+        self.is_exporting = False
+        
+        # Busca e ordenação do preview (índices calculados para cada DataFrame exibido)
+        self.preview_index = None
+        self.sort_column = None
+        self.sort_ascending = True
+        self._search_after_id = None
+        self._view_generation = 0  # Só o cálculo de visão mais recente é aplicado
         
         # Inicializar sistema de log
         self.logger = inicializar_log()
         self.logger.info("Interface gráfica inicializada")
         
+        # Armazém local, índice de deduplicação e índice por data: criados em segundo plano
+        # junto com o aquecimento dos módulos (ver _warm_up_thread)
+        self.receipt_store = None
+        self.dedup_index = None
+        self.date_partitions = None
+        self.worker_pool = None
+        self.services_ready = threading.Event()
+        
         # Configurar tema dark
         self.setup_dark_theme()
         
         self.setup_ui()
+        mark("Interface montada")
+        
+        # A janela fica interativa imediatamente; os módulos pesados carregam em segundo plano
+        self.root.after_idle(self._start_warm_up)
+    
+    def _start_warm_up(self):
+        """Inicia o aquecimento dos módulos pesados (chamado quando a janela já está aberta)."""
+        mark("Janela interativa")
+        warm_up(WARM_UP_MODULES, on_done=self._init_services)
+    
+    def _init_services(self):
+        """
+        Cria o armazém SQLite, o índice de deduplicação, o índice por data e o pool de
+        processos (thread de aquecimento) e registra o relatório de inicialização no log.
+        """
+        # Armazém local de recibos (histórico consultável sem reprocessar PDFs)
+        try:
+            self.receipt_store = receipt_store.ReceiptStore()
+            self.dedup_index = receipt_store.ReceiptDedupIndex(self.receipt_store.db_path)
+        except Exception as e:
+            self.receipt_store = None
+            self.dedup_index = None
+            self.logger.warning(f"Armazém SQLite indisponível: {str(e)}")
+        
+        # Resultados acumulados particionados por dia/mês da venda
+        try:
+            self.date_partitions = date_partitions.DatePartitionedIndex() if columnar_store.PYARROW_AVAILABLE else None
+        except Exception as e:
+            self.date_partitions = None
+            self.logger.warning(f"Índice por data indisponível: {str(e)}")
+        
+        # Pool de processos aquecido, reutilizado por todos os processamentos da sessão
+        self.worker_pool = job_queue.WorkerPool(log_file=self.logger.get_log_file())
+        try:
+            self.worker_pool.start()
+        except Exception as e:
+            # Nova tentativa no primeiro processamento (o erro aparece para o usuário)
+            self.logger.warning(f"Pool de processos indisponível: {str(e)}")
+        
+        mark("Serviços prontos")
+        self.services_ready.set()
+        for line in format_import_report().splitlines():
+            self.logger.info(line)
     
     def setup_dark_theme(self):
         """Configura o tema dark mode moderno."""
@@ -208,7 +680,7 @@ class ReceiptExtractorApp:
         self.drop_area.config(state=tk.DISABLED)
         self.drop_area.grid(row=0, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=(0, 10))
         
-        # Botão selecionar PDF
+        # Botão selecionar PDF(s)
         select_btn = ttk.Button(
             upload_frame,
             text="Selecionar PDF",
@@ -225,15 +697,106 @@ class ReceiptExtractorApp:
         )
         self.process_btn.grid(row=1, column=1)
         
+        # Opção de ignorar recibos já importados (deduplicação entre arquivos); desligada por padrão,
+        # para que reprocessar um PDF de uma sessão anterior mostre os dados novamente
+        self.skip_known_var = tk.BooleanVar(value=False)
+        skip_known_check = tk.Checkbutton(
+            upload_frame,
+            text="Ignorar recibos já importados",
+            variable=self.skip_known_var,
+            bg=self.colors['bg_main'],
+            fg=self.colors['text_primary'],
+            selectcolor=self.colors['bg_tertiary'],
+            activebackground=self.colors['bg_main'],
+            activeforeground=self.colors['text_primary'],
+            font=("Arial", 9)
+        )
+        skip_known_check.grid(row=2, column=0, columnspan=2, sticky=tk.W, pady=(5, 0))
+        
+        # Pré-visualização rápida: recibos das primeiras páginas exibidos antes do resto do arquivo
+        self.quick_preview_var = tk.BooleanVar(value=True)
+        quick_preview_check = tk.Checkbutton(
+            upload_frame,
+            text="Pré-visualização rápida (primeiras páginas)",
+            variable=self.quick_preview_var,
+            bg=self.colors['bg_main'],
+            fg=self.colors['text_primary'],
+            selectcolor=self.colors['bg_tertiary'],
+            activebackground=self.colors['bg_main'],
+            activeforeground=self.colors['text_primary'],
+            font=("Arial", 9)
+        )
+        quick_preview_check.grid(row=3, column=0, columnspan=2, sticky=tk.W)
+        
+        # Seleção de páginas de cada PDF (vazio = todas)
+        pages_frame = ttk.Frame(upload_frame)
+        pages_frame.grid(row=4, column=0, columnspan=2, sticky=tk.W, pady=(5, 0))
+        ttk.Label(pages_frame, text="Páginas:").grid(row=0, column=0, sticky=tk.W, padx=(0, 5))
+        self.pages_var = tk.StringVar()
+        pages_entry = tk.Entry(
+            pages_frame,
+            textvariable=self.pages_var,
+            width=24,
+            relief=tk.FLAT,
+            bg=self.colors['bg_tertiary'],
+            fg=self.colors['text_primary'],
+            insertbackground=self.colors['text_primary'],
+            selectbackground=self.colors['accent'],
+            selectforeground=self.colors['text_primary'],
+            font=("Arial", 10),
+            highlightthickness=1,
+            highlightbackground=self.colors['border'],
+            highlightcolor=self.colors['border_focus']
+        )
+        pages_entry.grid(row=0, column=1, sticky=tk.W)
+        ttk.Label(
+            pages_frame,
+            text="ex.: 1-10, 15, 20- ou últimas 5 (vazio = todas)",
+            foreground=self.colors['text_secondary']
+        ).grid(row=0, column=2, sticky=tk.W, padx=(10, 0))
+        
+        # Fila de PDFs: uma linha de estado e progresso por arquivo (exibida com 2 ou mais PDFs)
+        self.jobs_tree = ttk.Treeview(upload_frame, columns=JOB_COLUMNS, show='headings', height=4)
+        for col, width in zip(JOB_COLUMNS, (300, 100, 300)):
+            self.jobs_tree.heading(col, text=col)
+            self.jobs_tree.column(col, width=width)
+        self.jobs_tree.grid(row=5, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=(5, 0))
+        self.jobs_tree.grid_remove()
+        
         # Frame de preview
         preview_frame = ttk.LabelFrame(main_frame, text="Preview dos Dados", padding="10")
         preview_frame.grid(row=2, column=0, sticky=(tk.W, tk.E, tk.N, tk.S), pady=(0, 10))
         preview_frame.columnconfigure(0, weight=1)
-        preview_frame.rowconfigure(0, weight=1)
+        preview_frame.rowconfigure(1, weight=1)
+        
+        # Barra de busca (número do recibo, cliente, vendedor ou produto)
+        search_frame = ttk.Frame(preview_frame)
+        search_frame.grid(row=0, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=(0, 5))
+        search_frame.columnconfigure(1, weight=1)
+        ttk.Label(search_frame, text="Buscar:").grid(row=0, column=0, sticky=tk.W, padx=(0, 5))
+        self.search_var = tk.StringVar()
+        self.search_var.trace_add('write', lambda *args: self._schedule_search())
+        search_entry = tk.Entry(
+            search_frame,
+            textvariable=self.search_var,
+            relief=tk.FLAT,
+            bg=self.colors['bg_tertiary'],
+            fg=self.colors['text_primary'],
+            insertbackground=self.colors['text_primary'],
+            selectbackground=self.colors['accent'],
+            selectforeground=self.colors['text_primary'],
+            font=("Arial", 10),
+            highlightthickness=1,
+            highlightbackground=self.colors['border'],
+            highlightcolor=self.colors['border_focus']
+        )
+        search_entry.grid(row=0, column=1, sticky=(tk.W, tk.E))
+        search_entry.bind('<Escape>', lambda event: self.search_var.set(''))
+        self.search_count_label = ttk.Label(search_frame, text="", foreground=self.colors['text_secondary'])
+        self.search_count_label.grid(row=0, column=2, sticky=tk.E, padx=(10, 0))
         
         # Treeview para preview
-        columns = ('Nº Recibo', 'Vendedor', 'Cliente', 'Descrição do Produto', 'Quantidade', 'Valor Unitário')
-        self.tree = ttk.Treeview(preview_frame, columns=columns, show='headings', height=15)
+        self.tree = ttk.Treeview(preview_frame, columns=PREVIEW_COLUMNS, show='headings', height=15)
         
         # Configurar colunas
         self.tree.heading('Nº Recibo', text='Nº Recibo')
@@ -242,6 +805,7 @@ class ReceiptExtractorApp:
         self.tree.heading('Descrição do Produto', text='Descrição do Produto')
         self.tree.heading('Quantidade', text='Quantidade')
         self.tree.heading('Valor Unitário', text='Valor Unitário')
+        self.tree.heading('Data da Venda', text='Data da Venda')
         
         # Larguras das colunas
         self.tree.column('Nº Recibo', width=100)
@@ -250,15 +814,28 @@ class ReceiptExtractorApp:
         self.tree.column('Descrição do Produto', width=250)
         self.tree.column('Quantidade', width=80)
         self.tree.column('Valor Unitário', width=120)
+        self.tree.column('Data da Venda', width=130)
         
-        # Scrollbar
-        scrollbar_y = ttk.Scrollbar(preview_frame, orient=tk.VERTICAL, command=self.tree.yview)
+        # Clique no cabeçalho ordena pela coluna (novo clique inverte o sentido)
+        for col in PREVIEW_COLUMNS:
+            self.tree.heading(col, command=lambda c=col: self.sort_preview(c))
+        
+        # Scrollbar (a vertical é controlada pelo preview virtualizado)
+        scrollbar_y = ttk.Scrollbar(preview_frame, orient=tk.VERTICAL)
         scrollbar_x = ttk.Scrollbar(preview_frame, orient=tk.HORIZONTAL, command=self.tree.xview)
-        self.tree.configure(yscrollcommand=scrollbar_y.set, xscrollcommand=scrollbar_x.set)
+        self.tree.configure(xscrollcommand=scrollbar_x.set)
+        
+        # Apenas as linhas visíveis são criadas no Treeview
+        self.preview = VirtualTreeview(self.tree, scrollbar_y)
+        
+        self.tree.grid(row=1, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        scrollbar_y.grid(row=1, column=1, sticky=(tk.N, tk.S))
+        scrollbar_x.grid(row=2, column=0, sticky=(tk.W, tk.E))
         
-        self.tree.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
-        scrollbar_y.grid(row=0, column=1, sticky=(tk.N, tk.S))
-        scrollbar_x.grid(row=1, column=0, sticky=(tk.W, tk.E))
+        # Painel de estatísticas (atualizado durante o processamento com os resultados parciais)
+        self.stats_label = ttk.Label(preview_frame, text="", font=("Arial", 9),
+                                     foreground=self.colors['text_secondary'])
+        self.stats_label.grid(row=3, column=0, columnspan=2, sticky=tk.W, pady=(5, 0))
         
         # Frame de ações
         action_frame = ttk.Frame(main_frame)
@@ -273,6 +850,15 @@ class ReceiptExtractorApp:
         )
         self.status_label.grid(row=0, column=0, sticky=tk.W)
         
+        # Botão carregar sessão (resultados gravados em formato colunar)
+        self.load_btn = ttk.Button(
+            action_frame,
+            text="Carregar Sessão",
+            command=self.load_session,
+            state=tk.NORMAL
+        )
+        self.load_btn.grid(row=0, column=1, sticky=tk.E, padx=(10, 5))
+        
         # Botão limpar dados
         self.clear_btn = ttk.Button(
             action_frame,
@@ -280,7 +866,7 @@ class ReceiptExtractorApp:
             command=self.clear_data,
             state=tk.NORMAL
         )
-        self.clear_btn.grid(row=0, column=1, sticky=tk.E, padx=(10, 5))
+        self.clear_btn.grid(row=0, column=2, sticky=tk.E, padx=(0, 5))
         
         # Botão exportar
         self.export_btn = ttk.Button(
@@ -289,7 +875,25 @@ class ReceiptExtractorApp:
             command=self.export_to_excel,
             state=tk.DISABLED
         )
-        self.export_btn.grid(row=0, column=2, sticky=tk.E, padx=(0, 0))
+        self.export_btn.grid(row=0, column=3, sticky=tk.E, padx=(0, 5))
+        
+        # Botão exportar um arquivo por vendedor
+        self.export_seller_btn = ttk.Button(
+            action_frame,
+            text="Exportar por Vendedor",
+            command=self.export_per_seller,
+            state=tk.DISABLED
+        )
+        self.export_seller_btn.grid(row=0, column=4, sticky=tk.E, padx=(0, 5))
+        
+        # Botão anexar os recibos a um Excel já exportado
+        self.append_btn = ttk.Button(
+            action_frame,
+            text="Anexar ao Excel",
+            command=self.append_to_excel,
+            state=tk.DISABLED
+        )
+        self.append_btn.grid(row=0, column=5, sticky=tk.E, padx=(0, 0))
         
         action_frame.columnconfigure(0, weight=1)
         
@@ -314,127 +918,149 @@ class ReceiptExtractorApp:
         try:
             files = self.root.tk.splitlist(event.data)
             if files:
-                file_path = files[0]
-                if file_path.lower().endswith('.pdf'):
-                    self.current_pdf_path = file_path
-                    self.drop_area.config(state=tk.NORMAL, fg=self.colors['text_primary'])
-                    self.drop_area.delete("1.0", tk.END)
-                    self.drop_area.insert("1.0", f"Arquivo selecionado: {Path(file_path).name}")
-                    self.drop_area.config(state=tk.DISABLED)
-                    self.process_btn.config(state=tk.NORMAL)
-                    self.status_label.config(text="Arquivo carregado. Clique em 'Processar PDF'", foreground=self.colors['text_primary'])
+                pdf_files = [file_path for file_path in files if file_path.lower().endswith('.pdf')]
+                if pdf_files:
+                    self._set_selected_pdfs(pdf_files)
                 else:
                     messagebox.showerror("Erro", "Por favor, selecione um arquivo PDF.")
         except Exception:
             pass
     
     def select_pdf(self):
-        """Abre diálogo para selecionar arquivo PDF."""
-        file_path = filedialog.askopenfilename(
+        """Abre diálogo para selecionar um ou vários arquivos PDF."""
+        file_paths = filedialog.askopenfilenames(
             title="Selecionar PDF",
             filetypes=[("Arquivos PDF", "*.pdf"), ("Todos os arquivos", "*.*")]
         )
         
-        if file_path:
-            self.current_pdf_path = file_path
-            self.drop_area.config(state=tk.NORMAL, fg=self.colors['text_primary'])
-            self.drop_area.delete("1.0", tk.END)
-            self.drop_area.insert("1.0", f"Arquivo selecionado: {Path(file_path).name}")
-            self.drop_area.config(state=tk.DISABLED)
-            self.process_btn.config(state=tk.NORMAL)
-            self.status_label.config(text="Arquivo carregado. Clique em 'Processar PDF'", foreground=self.colors['text_primary'])
+        if file_paths:
+            self._set_selected_pdfs(list(file_paths))
     
-    def create_progress_window(self):
-        """Cria janela de progresso."""
-        if self.progress_window:
+    def open_command_line_pdfs(self, file_paths, pages=None):
+        """
+        Seleciona os PDFs passados na linha de comando ("Abrir com" ou arrastados sobre o
+        executável). Caminhos inexistentes ou que não são PDF são ignorados com um aviso.
+        A seleção espera os serviços: com vários arquivos, a fila usa job_queue, e importá-lo
+        antes da janela aparecer desfaria o carregamento em segundo plano.
+        
+        Args:
+            file_paths: Caminhos informados
+            pages: Seleção de páginas (--paginas) para preencher o campo Páginas (opcional)
+        """
+        pdf_files = [path for path in file_paths if path.lower().endswith('.pdf') and Path(path).is_file()]
+        invalid = [path for path in file_paths if path not in pdf_files]
+        if invalid:
+            self.logger.warning(f"Arquivos da linha de comando ignorados: {', '.join(invalid)}")
+            messagebox.showwarning("Aviso", "Arquivos ignorados (não encontrados ou não são PDF):\n\n"
+                                   + "\n".join(invalid))
+        if pdf_files:
+            self._select_when_ready(pdf_files, pages)
+    
+    def _select_when_ready(self, file_paths, pages=None):
+        """Seleciona os PDFs assim que os serviços estiverem prontos (ver open_command_line_pdfs)."""
+        if not self.services_ready.is_set():
+            self.root.after(POLL_INTERVAL_MS, self._select_when_ready, file_paths, pages)
+            return
+        self._set_selected_pdfs(file_paths)
+        if pages:
+            self.pages_var.set(pages)
+    
+    def _set_selected_pdfs(self, file_paths):
+        """
+        Define os PDFs a processar. Com vários arquivos, a fila de jobs é exibida
+        com uma linha por arquivo.
+        """
+        if self.is_processing:
+            messagebox.showwarning("Aviso", "Já existe um processamento em andamento.")
             return
         
-        self.progress_window = tk.Toplevel(self.root)
-        self.progress_window.title("Processando PDF")
-        self.progress_window.geometry("400x150")
-        self.progress_window.resizable(False, False)
-        self.progress_window.transient(self.root)
-        self.progress_window.grab_set()
-        
-        # Aplicar tema dark na janela de progresso
-        self.progress_window.configure(bg=self.colors['bg_main'])
-        
-        # Centralizar janela
-        self.progress_window.update_idletasks()
-        x = (self.progress_window.winfo_screenwidth() // 2) - (400 // 2)
-        y = (self.progress_window.winfo_screenheight() // 2) - (150 // 2)
-        self.progress_window.geometry(f"400x150+{x}+{y}")
-        
-        # Frame principal
-        frame = ttk.Frame(self.progress_window, padding="20")
-        frame.pack(fill=tk.BOTH, expand=True)
+        self.selected_pdfs = list(dict.fromkeys(file_paths))
+        self.current_pdf_path = self.selected_pdfs[0]
         
-        # Label de status
-        self.progress_label = ttk.Label(
-            frame, 
-            text="Iniciando processamento...", 
-            font=("Arial", 10),
-            foreground=self.colors['text_primary']
-        )
-        self.progress_label.pack(pady=(0, 10))
+        self.drop_area.config(state=tk.NORMAL, fg=self.colors['text_primary'])
+        self.drop_area.delete("1.0", tk.END)
+        if len(self.selected_pdfs) == 1:
+            self.drop_area.insert("1.0", f"Arquivo selecionado: {Path(self.current_pdf_path).name}")
+        else:
+            self.drop_area.insert("1.0", f"{len(self.selected_pdfs)} arquivos selecionados: "
+                                         + ", ".join(Path(path).name for path in self.selected_pdfs))
+        self.drop_area.config(state=tk.DISABLED)
         
-        # Barra de progresso
-        self.progress_bar = ttk.Progressbar(frame, mode='determinate', length=350)
-        self.progress_bar.pack(pady=(0, 10))
+        self.jobs_tree.delete(*self.jobs_tree.get_children())
+        if len(self.selected_pdfs) > 1:
+            for job_id, path in enumerate(self.selected_pdfs):
+                self.jobs_tree.insert('', tk.END, iid=f"job{job_id}", values=(Path(path).name, job_queue.JOB_PENDING, ""))
+            self.jobs_tree.grid()
+        else:
+            self.jobs_tree.grid_remove()
         
-        # Label de contador
-        self.progress_counter = ttk.Label(
-            frame, 
-            text="", 
-            font=("Arial", 9),
-            foreground=self.colors['text_secondary']
-        )
-        self.progress_counter.pack()
+        self.process_btn.config(state=tk.NORMAL)
+        if len(self.selected_pdfs) == 1:
+            self.status_label.config(text="Arquivo carregado. Clique em 'Processar PDF'", foreground=self.colors['text_primary'])
+        else:
+            self.status_label.config(text=f"{len(self.selected_pdfs)} arquivos carregados. Clique em 'Processar PDF'",
+                                     foreground=self.colors['text_primary'])
+    
+    def create_progress_window(self):
+        """Cria janela de progresso."""
+        if self.progress_window:
+            return
         
-        # Botão cancelar (desabilitado por enquanto)
-        self.cancel_btn = ttk.Button(
-            frame, 
-            text="Cancelar", 
-            command=self.cancel_processing, 
-            state=tk.DISABLED
-        )
-        self.cancel_btn.pack(pady=(10, 0))
+        # Não modal: os recibos aparecem no preview enquanto o processamento continua
+        self.progress_window = ProgressDialog(self.root, self.colors, "Processando PDF", modal=False,
+                                              on_cancel=self.cancel_processing,
+                                              message="Iniciando processamento...")
     
     def update_progress(self, current, total, message=""):
         """Atualiza a janela de progresso."""
         if not self.progress_window:
             return
         
-        try:
-            if total > 0:
-                percentage = (current / total) * 100
-                self.progress_bar['value'] = percentage
-                self.progress_counter.config(text=f"{current} de {total} páginas")
-            else:
-                self.progress_bar['mode'] = 'indeterminate'
-                self.progress_bar.start()
-            
-            if message:
-                self.progress_label.config(text=message)
-            
-            self.progress_window.update()
-        except:
-            pass
+        self.progress_window.update(current, total, message)
+    
+    def _watch_progress(self, state: ProgressState, render, last_version: int = -1):
+        """
+        Lê o estado de progresso a cada POLL_INTERVAL_MS e renderiza apenas o mais recente,
+        até a operação terminar.
+        
+        Args:
+            state: Estado atualizado pela thread de trabalho
+            render: Função render(current, total, message) executada na thread principal
+            last_version: Versão já renderizada
+        """
+        version, current, total, message = state.snapshot()
+        if version != last_version:
+            render(current, total, message)
+        if not state.finished:
+            self.root.after(POLL_INTERVAL_MS, self._watch_progress, state, render, version)
     
     def close_progress_window(self):
         """Fecha a janela de progresso."""
         if self.progress_window:
-            try:
-                self.progress_bar.stop()
-                self.progress_window.destroy()
-                self.progress_window = None
-            except:
-                pass
+            self.progress_window.close()
+            self.progress_window = None
     
     def cancel_processing(self):
-        """Cancela o processamento."""
+        """
+        Cancela o processamento.
+        O token interrompe a extração na próxima página ou recibo (e encerra os
+        recursos registrados nele), então a thread de trabalho termina logo em seguida.
+        O botão de processar só volta a ser habilitado quando a thread termina
+        (_processing_cancelled), para que um novo processamento não concorra com ela.
+        """
+        if self.processing_token is not None:
+            self.processing_token.cancel()
+        self.partial_results = None
+        self.close_progress_window()
+        self.process_btn.config(state=tk.DISABLED)
+        self.status_label.config(text="Cancelando processamento...", foreground=self.colors['warning'])
+    
+    def _processing_cancelled(self):
+        """Libera a interface depois que a thread de um processamento cancelado terminou."""
         self.is_processing = False
+        self.partial_results = None
         self.close_progress_window()
+        self.process_btn.config(state=tk.NORMAL if self.current_pdf_path else tk.DISABLED)
         self.status_label.config(text="Processamento cancelado", foreground=self.colors['warning'])
     
     def process_pdf(self):
@@ -447,165 +1073,277 @@ class ReceiptExtractorApp:
             messagebox.showwarning("Aviso", "Já existe um processamento em andamento.")
             return
         
+        pages = self.pages_var.get().strip() or None
+        try:
+            pdf_extractor.parse_page_ranges(pages)
+        except ValueError as e:
+            messagebox.showerror("Páginas inválidas", str(e))
+            return
+        
         # Registrar início do processamento
         self.logger.separador("INÍCIO DO PROCESSAMENTO")
-        self.logger.info(f"Iniciando processamento do arquivo: {self.current_pdf_path}")
-        self.logger.detalhes_arquivo(self.current_pdf_path)
-        
-        # Desabilitar botão de processar
+        self.logger.info(f"Iniciando processamento de {len(self.selected_pdfs)} arquivo(s)")
+        if pages:
+            self.logger.info(f"Páginas selecionadas: {pages}")
+        for pdf_path in self.selected_pdfs:
+            self.logger.detalhes_arquivo(pdf_path)
+        
+        # As opções são lidas aqui, na thread principal (variáveis Tk não são lidas pela thread de trabalho)
+        preview_pages = pdf_extractor.QUICK_PREVIEW_PAGES if self.quick_preview_var.get() else None
+        self._process_queue(pages, skip_known=self.skip_known_var.get(), preview_pages=preview_pages)
+    
+    def _process_queue(self, pages=None, skip_known: bool = False, preview_pages=None):
+        """
+        Processa todos os PDFs selecionados no pool de processos aquecido,
+        com estado e progresso por arquivo; os resultados são combinados em um único DataFrame.
+        
+        Args:
+            pages: Seleção de páginas de cada PDF (ver pdf_extractor.parse_page_ranges); None = todas
+            skip_known: Ignorar recibos já importados (índice de deduplicação)
+            preview_pages: Páginas da pré-visualização rápida de cada PDF (None = desativada)
+        """
         self.process_btn.config(state=tk.DISABLED)
         self.is_processing = True
+        self.processing_token = CancellationToken()
+        paths = list(self.selected_pdfs)
         
-        # Criar janela de progresso
-        self.create_progress_window()
+        # O preview passa a mostrar os resultados parciais deste processamento
+        self.current_dataframe = None
+        self._update_export_buttons()
+        self.update_preview(None)
+        self.stats_label.config(text="")
         
-        # Processar em thread separada
-        thread = threading.Thread(target=self._process_pdf_thread, daemon=True)
+        self.create_progress_window()
+        overall_state = ProgressState("Fila de PDFs", unit="arquivos", logger=self.logger)
+        overall_state.update(0, len(paths), f"Processando {len(paths)} arquivo(s)...")
+        
+        # Um estado de progresso por arquivo, cada um renderizado na sua linha da fila
+        job_states = []
+        for job_id, path in enumerate(paths):
+            state = ProgressState(Path(path).name, unit="páginas", logger=self.logger if len(paths) == 1 else None)
+            if self.jobs_tree.exists(f"job{job_id}"):
+                self.jobs_tree.item(f"job{job_id}", values=(Path(path).name, job_queue.JOB_PENDING, ""))
+                self._watch_progress(state, lambda current, total, message, job_id=job_id:
+                                     self._update_job_progress(job_id, current, total, message))
+            job_states.append(state)
+        
+        # Com um único PDF, a janela de progresso mostra as páginas/recibos do arquivo
+        self._watch_progress(job_states[0] if len(paths) == 1 else overall_state, self.update_progress)
+        
+        thread = threading.Thread(target=self._process_queue_thread,
+                                  args=(paths, overall_state, job_states, self.processing_token, pages,
+                                        skip_known, preview_pages), daemon=True)
         thread.start()
     
-    def _process_pdf_thread(self):
-        """Processa o PDF em thread separada."""
+    def _process_queue_thread(self, paths, overall_state: ProgressState, job_states, cancel_token: CancellationToken,
+                              pages=None, skip_known: bool = False, preview_pages=None):
+        """
+        Executa a fila de PDFs em thread separada (os PDFs são processados nos processos de trabalho).
+        Os lotes de recibos enviados pelos processos são combinados aqui (PartialResults) e
+        exibidos pela interface durante o processamento.
+        """
+        finished_jobs = []
+        partial = None
+        
+        def status_callback(job_id, status, message=""):
+            if status in (job_queue.JOB_DONE, job_queue.JOB_FAILED):
+                finished_jobs.append(job_id)
+                overall_state.update(len(finished_jobs), len(paths),
+                                     f"{len(finished_jobs)} de {len(paths)} arquivos concluídos...")
+                job_states[job_id].finish()
+            self.root.after(0, self._set_job_status, job_id, status, message)
+        
         try:
-            # Callback de progresso
-            def progress_callback(current, total, message=""):
-                if not self.is_processing:
-                    return
-                if message:
-                    self.logger.info(f"Progresso: {message}")
-                self.root.after(0, self.update_progress, current, total, message)
-            
-            # Extrair dados do PDF (pode retornar múltiplos recibos)
-            self.logger.info("Iniciando extração de dados do PDF...")
-            receipts_data = extract_from_pdf(self.current_pdf_path, progress_callback)
+            # Aguardar os módulos, o armazém e o pool (se o processamento começar durante o aquecimento)
+            self.services_ready.wait()
+            partial = job_queue.PartialResults()
+            self.partial_results = partial
+            self.root.after(0, self._watch_partial_results, partial)
             
-            if not self.is_processing:
-                return
-            
-            # Log de recibos encontrados
-            if isinstance(receipts_data, list):
-                self.logger.detalhes_recibos(len(receipts_data))
-                for idx, receipt in enumerate(receipts_data, 1):
-                    recibo_num = receipt.get('numero', 'N/A')
-                    num_produtos = len(receipt.get('produtos', []))
-                    self.logger.info(f"Recibo {idx}: Nº {recibo_num} - {num_produtos} produtos")
-            else:
-                self.logger.detalhes_recibos(1)
+            dedup_db_path, dedup_version = None, 0
+            if skip_known and self.dedup_index is not None:
+                dedup_db_path, dedup_version = self.dedup_index.store.db_path, self.dedup_index.version
+            results = self.worker_pool.run(
+                paths,
+                progress_callback=lambda job_id, current, total, message: job_states[job_id].update(current, total, message),
+                status_callback=status_callback,
+                dedup_db_path=dedup_db_path,
+                dedup_version=dedup_version,
+                cancel_token=cancel_token,
+                partial_callback=partial.add,
+                preview_pages=preview_pages,
+                pages=pages
+            )
             
-            # Processar dados (suporta múltiplos recibos)
-            self.root.after(0, self.update_progress, 0, 0, "Processando dados extraídos...")
-            self.logger.info("Processando dados extraídos...")
+            overall_state.update(len(paths), len(paths), "Combinando resultados...")
+            cancel_token.raise_if_cancelled()
+            df = job_queue.merge_job_results(results)
+            cancel_token.raise_if_cancelled()
             
-            # Log detalhado dos dados BRUTOS extraídos (antes do processamento)
-            self.logger.separador("DADOS BRUTOS EXTRAÍDOS (ANTES DO PROCESSAMENTO)")
-            if isinstance(receipts_data, list):
-                self.logger.info(f"Total de recibos brutos: {len(receipts_data)}")
-                for idx, receipt in enumerate(receipts_data, 1):
-                    recibo_num = receipt.get('numero', 'N/A')
-                    produtos_brutos = receipt.get('produtos', [])
-                    self.logger.info(f"Recibo {idx} (Nº {recibo_num}) - Produtos brutos: {len(produtos_brutos)}")
-                    for pidx, produto in enumerate(produtos_brutos, 1):
-                        self.logger.info(f"  Produto bruto {pidx}:")
-                        self.logger.info(f"    Descrição: '{produto.get('descricao', '')}'")
-                        self.logger.info(f"    Quantidade: '{produto.get('quantidade', '')}'")
-                        self.logger.info(f"    Valor Unitário: '{produto.get('valor_unitario', '')}'")
-                num_recibos = len(receipts_data)
-                self.current_dataframe = process_multiple_receipts(receipts_data)
-            else:
-                # Compatibilidade com formato antigo (único recibo)
-                self.logger.info(f"Recibo único - Produtos brutos: {len(receipts_data.get('produtos', []))}")
-                for pidx, produto in enumerate(receipts_data.get('produtos', []), 1):
-                    self.logger.info(f"  Produto bruto {pidx}:")
-                    self.logger.info(f"    Descrição: '{produto.get('descricao', '')}'")
-                    self.logger.info(f"    Quantidade: '{produto.get('quantidade', '')}'")
-                    self.logger.info(f"    Valor Unitário: '{produto.get('valor_unitario', '')}'")
-                num_recibos = 1
-                self.current_dataframe = process_receipt_data(receipts_data)
+            # Gravar cada arquivo no armazém local (apenas as linhas mantidas na combinação)
+            if self.receipt_store is not None:
+                for result in results:
+                    if result['df'] is None or result['df'].empty:
+                        continue
+                    try:
+                        self.receipt_store.save_dataframe(result['df'], result['path'])
+                        if self.dedup_index is not None:
+                            # Apenas os recibos cujas linhas foram mantidas na combinação e gravadas
+                            numeros = set(result['df']['Nº Recibo'].astype(str))
+                            self.dedup_index.register([recibo for recibo in result['recibos']
+                                                       if str(recibo.get('numero')) in numeros], result['path'])
+                    except Exception as e:
+                        self.logger.error(f"Erro ao gravar recibos no armazém SQLite: {str(e)}", exc_info=True)
             
-            if not self.is_processing:
-                return
+            if self.date_partitions is not None and not df.empty:
+                try:
+                    self.date_partitions.add(df)
+                except Exception as e:
+                    self.logger.error(f"Erro ao gravar recibos no índice por data: {str(e)}", exc_info=True)
             
-            # Log detalhado dos dados APÓS PROCESSAMENTO (o que será exibido na interface)
-            self.logger.separador("DADOS APÓS PROCESSAMENTO (O QUE SERÁ EXIBIDO NA INTERFACE)")
-            self.logger.info(f"Total de linhas no DataFrame final: {len(self.current_dataframe)}")
-            if not self.current_dataframe.empty:
-                self.logger.info("Dados que serão exibidos na interface:")
-                for idx, row in self.current_dataframe.iterrows():
-                    self.logger.info(f"  Linha {idx + 1}:")
-                    self.logger.info(f"    Nº Recibo: '{row.get('Nº Recibo', '')}'")
-                    self.logger.info(f"    Vendedor: '{row.get('Vendedor', '')}'")
-                    self.logger.info(f"    Cliente: '{row.get('Cliente', '')}'")
-                    self.logger.info(f"    Descrição: '{row.get('Descrição do Produto', '')}'")
-                    self.logger.info(f"    Quantidade: '{row.get('Quantidade', '')}'")
-                    self.logger.info(f"    Valor Unitário: '{row.get('Valor Unitário', '')}'")
+            num_recibos = sum(result['num_recibos'] for result in results)
+            num_ignorados = sum(result['num_ignorados'] for result in results)
+            if df.empty and num_ignorados:
+                # Sem linhas porque todos os recibos já eram conhecidos: explicar em vez de "Nenhum dado"
+                is_valid, errors = False, [f"Os {num_ignorados} recibo(s) encontrados já haviam sido importados "
+                                           "e foram ignorados. Desmarque 'Ignorar recibos já importados' "
+                                           "para processá-los novamente."]
             else:
-                self.logger.warning("ATENÇÃO: DataFrame vazio! Nenhum dado será exibido na interface!")
-            
-            # Validar dados
-            self.logger.info("Validando dados extraídos...")
-            is_valid, errors = validate_data(self.current_dataframe)
-            
-            if errors:
-                self.logger.warning(f"Erros encontrados na validação: {len(errors)}")
-                for error in errors:
-                    self.logger.warning(f"  - {error}")
+                is_valid, errors = data_processor.validate_data(df)
+            failed = [result for result in results if result['status'] == job_queue.JOB_FAILED]
+            if failed:
+                is_valid = False
+                errors = errors + [f"{Path(result['path']).name}: {result['error']}" for result in failed]
+            summary = data_processor.summarize_rows(df)
             
-            # Atualizar interface na thread principal
-            self.root.after(0, self._finish_processing, is_valid, errors, num_recibos)
+            # Encerrar os resultados parciais antes de exibir o resultado final
+            partial.finish()
+            self.root.after(0, self._finish_processing, cancel_token, df, is_valid, errors, num_recibos,
+                            num_ignorados, summary)
             
-        except FileNotFoundError as e:
-            self.logger.error(f"Arquivo não encontrado: {str(e)}", exc_info=True)
-            self.root.after(0, self._handle_error, f"Arquivo não encontrado:\n{str(e)}")
+            # Detalhamento das linhas no log (nesta thread, depois de liberar a interface)
+            self._log_final_rows(df, num_recibos)
+        
+        except OperationCancelled:
+            self.logger.info("Fila de PDFs cancelada pelo usuário")
+            self.root.after(0, self._processing_cancelled)
         except Exception as e:
-            self.logger.error(f"Erro ao processar PDF: {str(e)}", exc_info=True)
-            self.root.after(0, self._handle_error, f"Erro ao processar PDF:\n{str(e)}")
+            self.logger.error(f"Erro ao processar a fila de PDFs: {str(e)}", exc_info=True)
+            self.root.after(0, self._handle_error, f"Erro ao processar PDFs:\n{str(e)}")
+        finally:
+            if partial is not None:
+                partial.finish()
+            overall_state.finish()
+            for state in job_states:
+                state.finish()
     
-    def _finish_processing(self, is_valid, errors, num_recibos):
-        """Finaliza o processamento na thread principal."""
-        self.is_processing = False
-        self.close_progress_window()
-        
-        num_linhas = len(self.current_dataframe)
-        
-        # Log detalhado FINAL dos dados que serão realmente exibidos na interface
+    def _watch_partial_results(self, partial, last_version: int = -1):
+        """
+        Exibe os resultados parciais mais recentes a cada POLL_INTERVAL_MS, até o
+        processamento terminar (o resultado final é exibido por _finish_processing).
+        
+        Args:
+            partial: job_queue.PartialResults do processamento em andamento
+            last_version: Versão já exibida
+        """
+        if partial.finished or partial is not self.partial_results:
+            return
+        if partial.version == last_version:
+            self.root.after(POLL_INTERVAL_MS, self._watch_partial_results, partial, last_version)
+            return
+        # Combinar os lotes (proporcional ao número de linhas) fora da thread da interface
+        threading.Thread(target=self._snapshot_partial_results, args=(partial,), daemon=True).start()
+    
+    def _snapshot_partial_results(self, partial):
+        """Combina os resultados parciais (em thread separada) e agenda a exibição."""
+        self.root.after(0, self._show_partial_results, partial, *partial.snapshot())
+    
+    def _show_partial_results(self, partial, version: int, df, summary):
+        """Exibe um snapshot dos resultados parciais e volta a acompanhar o processamento."""
+        if partial.finished or partial is not self.partial_results:
+            return
+        if df is not None:
+            self.preview_index = preview_index.PreviewIndex(df)
+            self._refresh_view(keep_position=True)
+            self.stats_label.config(text=f"{data_processor.format_summary(summary)}  (parcial)")
+        self.root.after(POLL_INTERVAL_MS, self._watch_partial_results, partial, version)
+    
+    def _update_job_progress(self, job_id, current, total, message=""):
+        """Atualiza a coluna de progresso da linha de um arquivo na fila."""
+        item = f"job{job_id}"
+        if not self.jobs_tree.exists(item) or self.jobs_tree.set(item, 'Status') in (job_queue.JOB_DONE, job_queue.JOB_FAILED, job_queue.JOB_CANCELLED):
+            return
+        progress = f"{current * 100 // total}% - {message}" if total > 0 else message
+        self.jobs_tree.set(item, 'Progresso', progress)
+    
+    def _set_job_status(self, job_id, status, message=""):
+        """Atualiza o estado da linha de um arquivo na fila."""
+        item = f"job{job_id}"
+        if not self.jobs_tree.exists(item):
+            return
+        self.jobs_tree.set(item, 'Status', status)
+        if status == job_queue.JOB_DONE:
+            self.jobs_tree.set(item, 'Progresso', "100%")
+        elif message or status == job_queue.JOB_CANCELLED:
+            self.jobs_tree.set(item, 'Progresso', message)
+    
+    def _log_final_rows(self, df: 'pd.DataFrame', num_recibos: int):
+        """
+        Log detalhado dos dados exibidos na interface (chamado na thread de processamento:
+        o custo é proporcional ao número de linhas e não pode segurar a interface).
+        """
         self.logger.separador("RESUMO FINAL - DADOS QUE SERÃO EXIBIDOS NA INTERFACE")
-        self.logger.info(f"Total de linhas no DataFrame final: {num_linhas}")
+        self.logger.info(f"Total de linhas no DataFrame final: {len(df)}")
         self.logger.info(f"Total de recibos processados: {num_recibos}")
         
-        if not self.current_dataframe.empty:
-            self.logger.info("=== DETALHAMENTO COMPLETO DE CADA LINHA QUE SERÁ EXIBIDA ===")
-            for idx, row in self.current_dataframe.iterrows():
-                self.logger.info(f"\n--- LINHA {idx + 1} NA INTERFACE ---")
-                self.logger.info(f"Nº Recibo: '{str(row.get('Nº Recibo', 'N/A'))}'")
-                self.logger.info(f"Vendedor: '{str(row.get('Vendedor', 'N/A'))}'")
-                self.logger.info(f"Cliente: '{str(row.get('Cliente', 'N/A'))}'")
-                self.logger.info(f"Descrição do Produto: '{str(row.get('Descrição do Produto', 'N/A'))}'")
-                self.logger.info(f"Quantidade: '{str(row.get('Quantidade', 'N/A'))}' (tipo: {type(row.get('Quantidade', '')).__name__})")
-                valor_unit = row.get('Valor Unitário', 'N/A')
-                self.logger.info(f"Valor Unitário: '{str(valor_unit)}' (tipo: {type(valor_unit).__name__})")
-                # Se for numérico, mostrar também o valor formatado
-                if isinstance(valor_unit, (int, float)):
-                    self.logger.info(f"Valor Unitário (numérico): {valor_unit}")
+        if not df.empty:
+            # Uma única entrada com a tabela inteira (tipos no cabeçalho) em vez de várias por linha
+            colunas = ", ".join(f"{col} ({dtype})" for col, dtype in df.dtypes.items())
+            self.logger.debug(f"=== DETALHAMENTO COMPLETO DE CADA LINHA QUE SERÁ EXIBIDA ===\n"
+                              f"Colunas: {colunas}\n{df.to_string()}")
         else:
             self.logger.error("ERRO CRÍTICO: DataFrame vazio! Nenhum dado será exibido na interface!")
         
         self.logger.separador("FIM DO PROCESSAMENTO")
-        self.logger.info(f"Processamento concluído: {num_recibos} recibo(s) e {num_linhas} linha(s)")
+        self.logger.info(f"Processamento concluído: {num_recibos} recibo(s) e {len(df)} linha(s)")
         self.logger.info(f"Arquivo de log: {self.logger.get_log_file()}")
         self.logger.separador()
+    
+    def _finish_processing(self, cancel_token: CancellationToken, df: 'pd.DataFrame', is_valid, errors,
+                           num_recibos, num_ignorados=0, summary=None):
+        """
+        Finaliza o processamento na thread principal.
+        O resultado é descartado se o processamento foi cancelado depois da última
+        verificação do token na thread de trabalho.
+        """
+        if cancel_token.cancelled:
+            self._processing_cancelled()
+            return
         
-        if not is_valid:
-            error_msg = "\n".join(errors)
-            messagebox.showwarning("Aviso", f"Alguns problemas foram encontrados:\n\n{error_msg}")
+        self.is_processing = False
+        self.partial_results = None
+        self.close_progress_window()
+        
+        self.current_dataframe = df
+        num_linhas = len(self.current_dataframe)
         
-        # Atualizar preview
+        # Atualizar preview e o painel de estatísticas (resultado final)
         self.update_preview(self.current_dataframe)
+        if summary is not None:
+            self.stats_label.config(text=data_processor.format_summary(summary))
         
-        # Habilitar botão de exportar
-        self.export_btn.config(state=tk.NORMAL)
+        # Habilitar botões de exportar
+        self._update_export_buttons()
         self.process_btn.config(state=tk.NORMAL)
         
         status_msg = f"Dados processados com sucesso! {num_recibos} recibo(s) e {num_linhas} linha(s) encontrada(s)."
+        if num_ignorados:
+            status_msg += f" {num_ignorados} recibo(s) já importado(s) ignorado(s)."
         self.status_label.config(text=status_msg, foreground=self.colors['success'])
+        
+        if not is_valid:
+            error_msg = "\n".join(errors)
+            messagebox.showwarning("Aviso", f"Alguns problemas foram encontrados:\n\n{error_msg}")
     
     def _handle_error(self, error_msg):
         """Trata erros na thread principal."""
@@ -615,23 +1353,103 @@ class ReceiptExtractorApp:
         self.status_label.config(text="Erro ao processar PDF", foreground=self.colors['error'])
         self.process_btn.config(state=tk.NORMAL)
     
-    def update_preview(self, df: pd.DataFrame):
-        """Atualiza o preview com os dados do DataFrame."""
-        # Limpar treeview
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        
-        # Adicionar dados
-        for _, row in df.iterrows():
-            values = (
-                str(row.get('Nº Recibo', '')),
-                str(row.get('Vendedor', '')),
-                str(row.get('Cliente', '')),
-                str(row.get('Descrição do Produto', '')),
-                str(row.get('Quantidade', '')),
-                str(row.get('Valor Unitário', ''))
-            )
-            self.tree.insert('', tk.END, values=values)
+    def update_preview(self, df: 'pd.DataFrame'):
+        """
+        Atualiza o preview com os dados do DataFrame.
+        Apenas as linhas visíveis são formatadas e inseridas no Treeview (ver VirtualTreeview).
+        A busca e a ordenação atuais são reaplicadas; os textos de todas as linhas e os
+        índices completos são calculados em segundo plano, para que rolar, buscar e
+        ordenar não formatem nem percorram as linhas na thread principal.
+        """
+        self.preview_index = None if df is None else preview_index.PreviewIndex(df)
+        self._refresh_view()
+        
+        if self.preview_index is not None:
+            threading.Thread(target=self._prepare_preview, args=(self.preview_index,),
+                             name="indice-preview", daemon=True).start()
+    
+    def _prepare_preview(self, index):
+        """Calcula os textos exibidos e os índices de busca/ordenação (thread de fundo)."""
+        display = format_preview_columns(index.df)
+        self.root.after(0, self.preview.set_display, index.df, display)
+        index.build(PREVIEW_COLUMNS)
+    
+    def _refresh_view(self, keep_position: bool = False):
+        """
+        Exibe self.preview_index.df com a busca e a ordenação atuais.
+        Sem busca nem ordenação, os dados são exibidos imediatamente; caso contrário as
+        posições são calculadas em uma thread de fundo e aplicadas ao terminar (apenas o
+        cálculo mais recente é aplicado).
+        
+        Args:
+            keep_position: Mantém a rolagem e a seleção (resultados parciais)
+        """
+        self._view_generation += 1
+        index = self.preview_index
+        query = self.search_var.get()
+        if index is None or (not query.strip() and self.sort_column is None):
+            self._apply_view(self._view_generation, index, None, keep_position)
+            return
+        
+        generation, column, ascending = self._view_generation, self.sort_column, self.sort_ascending
+        
+        def run():
+            rows = index.view(query, column, ascending)
+            self.root.after(0, self._apply_view, generation, index, rows, keep_position)
+        
+        threading.Thread(target=run, name="busca-preview", daemon=True).start()
+    
+    def _apply_view(self, generation: int, index, rows, keep_position: bool):
+        """Aplica ao preview as posições calculadas por _refresh_view (thread principal)."""
+        if generation != self._view_generation or index is not self.preview_index:
+            return  # Já existe um cálculo mais recente
+        df = None if index is None else index.df
+        if df is not None and df is self.preview.df and not keep_position:
+            self.preview.set_rows(rows)
+        else:
+            self.preview.set_data(df, rows, keep_position=keep_position)
+        self._update_search_count()
+    
+    def _schedule_search(self):
+        """Aplica a busca quando o usuário para de digitar (SEARCH_DEBOUNCE_MS)."""
+        if self._search_after_id is not None:
+            self.root.after_cancel(self._search_after_id)
+        self._search_after_id = self.root.after(SEARCH_DEBOUNCE_MS, self.apply_search)
+    
+    def apply_search(self):
+        """Filtra o preview pelo texto da barra de busca."""
+        self._search_after_id = None
+        if self.preview_index is None:
+            return
+        self._refresh_view()
+    
+    def sort_preview(self, column: str):
+        """Ordena o preview pela coluna (clique no cabeçalho; novo clique inverte o sentido)."""
+        if column == self.sort_column:
+            self.sort_ascending = not self.sort_ascending
+        else:
+            self.sort_column = column
+            self.sort_ascending = True
+        
+        for col in PREVIEW_COLUMNS:
+            arrow = ''
+            if col == self.sort_column:
+                arrow = ' ▲' if self.sort_ascending else ' ▼'
+            self.tree.heading(col, text=col + arrow)
+        
+        if self.preview_index is not None:
+            self._refresh_view()
+    
+    def _update_search_count(self):
+        """Atualiza o contador de linhas exibidas ao lado da barra de busca."""
+        df = self.preview.df
+        if df is None:
+            text = ""
+        elif self.preview.rows is None or len(self.preview.rows) == len(df):
+            text = f"{len(df)} linha(s)"
+        else:
+            text = f"{len(self.preview.rows)} de {len(df)} linha(s)"
+        self.search_count_label.config(text=text)
     
     def clear_data(self):
         """Limpa os dados processados e permite importar novos dados."""
@@ -647,18 +1465,21 @@ class ReceiptExtractorApp:
         
         # Cancelar qualquer processamento em andamento
         if self.is_processing:
-            self.is_processing = False
-            self.close_progress_window()
+            self.cancel_processing()
         
         # Limpar DataFrame
         self.current_dataframe = None
         
-        # Limpar caminho do PDF
+        # Limpar caminho do PDF e a fila de arquivos
         self.current_pdf_path = None
+        self.selected_pdfs = []
+        self.jobs_tree.delete(*self.jobs_tree.get_children())
+        self.jobs_tree.grid_remove()
         
-        # Limpar preview (treeview)
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+        # Limpar preview (treeview) e a busca
+        self.search_var.set('')
+        self.update_preview(None)
+        self.stats_label.config(text="")
         
         # Resetar área de drop
         self.drop_area.config(state=tk.NORMAL, fg=self.colors['text_secondary'])
@@ -666,8 +1487,8 @@ class ReceiptExtractorApp:
         self.drop_area.insert("1.0", "Arraste o arquivo PDF aqui ou clique em 'Selecionar PDF'")
         self.drop_area.config(state=tk.DISABLED)
         
-        # Desabilitar botão de exportar
-        self.export_btn.config(state=tk.DISABLED)
+        # Desabilitar botões de exportar (sem dados)
+        self._update_export_buttons()
         
         # Desabilitar botão de processar (sem PDF selecionado)
         self.process_btn.config(state=tk.DISABLED)
@@ -677,41 +1498,340 @@ class ReceiptExtractorApp:
         
         messagebox.showinfo("Sucesso", "Dados limpos com sucesso!\n\nVocê pode agora selecionar e processar um novo PDF.")
     
+    def load_session(self):
+        """
+        Recarrega resultados gravados (formato colunar ou arquivos Excel exportados),
+        de um ou vários arquivos combinados.
+        """
+        if self.is_processing:
+            messagebox.showwarning("Aviso", "Já existe um processamento em andamento.")
+            return
+        
+        file_paths = filedialog.askopenfilenames(
+            title="Carregar Sessão",
+            filetypes=[("Resultados salvos", "*.feather *.parquet *.xlsx"), ("Arquivos Excel", "*.xlsx"),
+                       ("Todos os arquivos", "*.*")]
+        )
+        if not file_paths:
+            return
+        
+        excel_paths = [path for path in file_paths if path.lower().endswith('.xlsx')]
+        if excel_paths and len(excel_paths) != len(file_paths):
+            messagebox.showerror("Erro", "Selecione apenas arquivos Excel ou apenas resultados em formato colunar.")
+            return
+        if not excel_paths and not columnar_store.PYARROW_AVAILABLE:
+            messagebox.showerror("Erro", "pyarrow não está instalado.\nInstale com: pip install pyarrow")
+            return
+        
+        # A leitura dos arquivos acontece em segundo plano (a interface continua respondendo)
+        self.load_btn.config(state=tk.DISABLED)
+        self.status_label.config(text="Carregando sessão...", foreground=self.colors['text_secondary'])
+        threading.Thread(target=self._load_session_thread, args=(list(file_paths), excel_paths),
+                         name="carregar-sessao", daemon=True).start()
+    
+    def _load_session_thread(self, file_paths, excel_paths):
+        """Lê os arquivos da sessão (thread de fundo) e exibe o resultado na thread principal."""
+        try:
+            if excel_paths:
+                # Leitura em streaming das abas Recibos (exportações antigas incluídas)
+                if len(excel_paths) == 1:
+                    df, _ = excel_loader.load_export(excel_paths[0])
+                else:
+                    df, _ = excel_loader.merge_exports(excel_paths)
+            elif len(file_paths) == 1:
+                df, _ = columnar_store.load_results(file_paths[0])
+            else:
+                df, _ = columnar_store.merge_results(file_paths)
+            summary = data_processor.summarize_rows(df)
+        except Exception as e:
+            self.logger.error(f"Erro ao carregar sessão: {str(e)}", exc_info=True)
+            self.root.after(0, self._load_session_failed, str(e))
+            return
+        self.root.after(0, self._finish_load_session, df, summary, len(file_paths))
+    
+    def _finish_load_session(self, df: 'pd.DataFrame', summary, num_files: int):
+        """Exibe a sessão carregada (thread principal)."""
+        self.load_btn.config(state=tk.NORMAL)
+        if self.is_processing:
+            return  # Um processamento começou durante a leitura: os resultados dele prevalecem
+        self.current_dataframe = df
+        self.update_preview(df)
+        self.stats_label.config(text=data_processor.format_summary(summary))
+        self._update_export_buttons()
+        self.status_label.config(
+            text=f"Sessão carregada: {num_files} arquivo(s) e {len(df)} linha(s).",
+            foreground=self.colors['success']
+        )
+    
+    def _load_session_failed(self, error_msg):
+        """Trata erros da leitura da sessão (thread principal)."""
+        self.load_btn.config(state=tk.NORMAL)
+        self.status_label.config(text="Erro ao carregar sessão", foreground=self.colors['error'])
+        messagebox.showerror("Erro", f"Erro ao carregar sessão:\n{error_msg}")
+    
+    def _update_export_buttons(self):
+        """Habilita os botões de exportação quando há dados e nenhuma exportação em andamento."""
+        has_data = self.current_dataframe is not None and not self.current_dataframe.empty
+        state = tk.NORMAL if has_data and not self.is_exporting else tk.DISABLED
+        self.export_btn.config(state=state)
+        self.export_seller_btn.config(state=state)
+        self.append_btn.config(state=state)
+    
+    def _start_export(self, title, job):
+        """
+        Executa uma exportação em segundo plano, com janela de progresso não modal.
+        A interface continua respondendo (inclusive para processar outros PDFs).
+        
+        Args:
+            title: Título da janela de progresso
+            job: Função job(progress_callback, cancel_token) executada na thread de trabalho;
+                 retorna a mensagem de sucesso
+        """
+        token = CancellationToken()
+        self.is_exporting = True
+        self._update_export_buttons()
+        self.export_dialog = ProgressDialog(self.root, self.colors, title, modal=False,
+                                            on_cancel=token.cancel, unit="linhas",
+                                            message="Calculando estatísticas...")
+        
+        progress_state = ProgressState(title, unit="linhas", logger=self.logger)
+        self._watch_progress(progress_state, self._update_export_progress)
+        
+        def run():
+            try:
+                message = job(progress_state.update, token)
+                self.root.after(0, self._finish_export, message)
+            except OperationCancelled:
+                self.root.after(0, self._export_cancelled)
+            except Exception as e:
+                self.logger.error(f"Erro ao exportar: {str(e)}", exc_info=True)
+                self.root.after(0, self._export_failed, str(e))
+            finally:
+                progress_state.finish()
+        
+        thread = threading.Thread(target=run, daemon=True)
+        thread.start()
+    
+    def _update_export_progress(self, current, total, message=""):
+        """Atualiza a janela de progresso da exportação."""
+        if self.export_dialog:
+            self.export_dialog.update(current, total, message)
+    
+    def _close_export(self):
+        """Fecha a janela de progresso da exportação e libera os botões."""
+        self.is_exporting = False
+        if self.export_dialog:
+            self.export_dialog.close()
+            self.export_dialog = None
+        self._update_export_buttons()
+    
+    def _finish_export(self, message):
+        """Finaliza a exportação na thread principal."""
+        self._close_export()
+        messagebox.showinfo("Sucesso", message)
+        self.status_label.config(text="Exportação concluída com sucesso!", foreground=self.colors['success'])
+    
+    def _export_cancelled(self):
+        """Exportação cancelada pelo usuário."""
+        self._close_export()
+        self.status_label.config(text="Exportação cancelada", foreground=self.colors['warning'])
+    
+    def _export_failed(self, error_msg):
+        """Trata erros de exportação na thread principal."""
+        self._close_export()
+        messagebox.showerror("Erro", f"Erro ao exportar:\n{error_msg}")
+        self.status_label.config(text="Erro ao exportar", foreground=self.colors['error'])
+    
     def export_to_excel(self):
-        """Exporta os dados processados para Excel."""
+        """Exporta os dados processados para Excel (em segundo plano)."""
         if self.current_dataframe is None or self.current_dataframe.empty:
             messagebox.showerror("Erro", "Nenhum dado para exportar.")
             return
         
-        try:
-            # Perguntar onde salvar
-            file_path = filedialog.asksaveasfilename(
-                title="Salvar como Excel",
-                defaultextension=".xlsx",
-                filetypes=[("Arquivos Excel", "*.xlsx"), ("Todos os arquivos", "*.*")]
-            )
+        if self.is_exporting:
+            messagebox.showwarning("Aviso", "Já existe uma exportação em andamento.")
+            return
+        
+        # Perguntar onde salvar
+        file_path = filedialog.asksaveasfilename(
+            title="Salvar como Excel",
+            defaultextension=".xlsx",
+            filetypes=[("Arquivos Excel", "*.xlsx"), ("CSV (separado por ;)", "*.csv"),
+                       ("Parquet", "*.parquet"), ("Todos os arquivos", "*.*")]
+        )
+        if not file_path:
+            return
+        
+        # A exportação usa os dados atuais mesmo que um novo PDF seja processado enquanto isso
+        df = self.current_dataframe
+        
+        def job(progress_callback, cancel_token):
+            # Calcular estatísticas por vendedor
+            df_stats = data_processor.calculate_seller_statistics(df)
+            cancel_token.raise_if_cancelled()
             
-            if file_path:
-                self.status_label.config(text="Calculando estatísticas e exportando para Excel...")
-                self.root.update()
-                
-                # Calcular estatísticas por vendedor
-                df_stats = calculate_seller_statistics(self.current_dataframe)
-                
-                # Exportar
-                from excel_exporter import export_to_excel_with_path
-                export_to_excel_with_path(self.current_dataframe, file_path, df_stats)
-                
-                messagebox.showinfo("Sucesso", f"Arquivo Excel salvo com sucesso!\n\nAba 'Recibos': Dados detalhados\nAba 'Estatísticas por Vendedor': Estatísticas agrupadas\n\n{file_path}")
-                self.status_label.config(text="Exportação concluída com sucesso!", foreground=self.colors['success'])
+            # O backend (xlsx, CSV ou Parquet) é escolhido pela extensão e pelo número de linhas
+            path = excel_exporter.export_to_excel_with_path(df, file_path, df_stats,
+                                             progress_callback=progress_callback, cancel_token=cancel_token)
+            
+            # Gravar também em formato colunar (recarregável pelo botão "Carregar Sessão")
+            if columnar_store.PYARROW_AVAILABLE and path.lower().endswith('.xlsx'):
+                try:
+                    columnar_store.save_results(df, df_stats, path)
+                except Exception as e:
+                    self.logger.warning(f"Não foi possível gravar os resultados em formato colunar: {str(e)}")
+            
+            if path.lower().endswith('.xlsx'):
+                return f"Arquivo Excel salvo com sucesso!\n\nAba 'Recibos': Dados detalhados\nAba 'Estatísticas por Vendedor': Estatísticas agrupadas\n\n{path}"
+            return f"Arquivo salvo com sucesso!\n\nRecibos e estatísticas por vendedor gravados em:\n{path}"
         
-        except Exception as e:
-            messagebox.showerror("Erro", f"Erro ao exportar para Excel:\n{str(e)}")
-            self.status_label.config(text="Erro ao exportar", foreground=self.colors['error'])
+        self.status_label.config(text="Exportando em segundo plano...", foreground=self.colors['text_secondary'])
+        self._start_export("Exportando", job)
+    
+    def export_per_seller(self):
+        """Exporta um arquivo Excel por vendedor (gerados em paralelo, em segundo plano)."""
+        if self.current_dataframe is None or self.current_dataframe.empty:
+            messagebox.showerror("Erro", "Nenhum dado para exportar.")
+            return
+        
+        if self.is_exporting:
+            messagebox.showwarning("Aviso", "Já existe uma exportação em andamento.")
+            return
+        
+        output_dir = filedialog.askdirectory(title="Pasta para os arquivos por vendedor")
+        if not output_dir:
+            return
+        
+        df = self.current_dataframe
+        
+        def job(progress_callback, cancel_token):
+            df_stats = data_processor.calculate_seller_statistics(df)
+            cancel_token.raise_if_cancelled()
+            arquivos = excel_exporter.export_per_seller(df, output_dir, df_stats,
+                                         progress_callback=progress_callback, cancel_token=cancel_token)
+            return f"{len(arquivos)} arquivo(s) por vendedor salvo(s) em:\n\n{output_dir}"
+        
+        self.status_label.config(text="Exportando arquivos por vendedor em segundo plano...",
+                                 foreground=self.colors['text_secondary'])
+        self._start_export("Exportando por Vendedor", job)
+    
+    def append_to_excel(self):
+        """Anexa os recibos processados a um arquivo Excel já exportado (em segundo plano)."""
+        if self.current_dataframe is None or self.current_dataframe.empty:
+            messagebox.showerror("Erro", "Nenhum dado para anexar.")
+            return
+        
+        if self.is_exporting:
+            messagebox.showwarning("Aviso", "Já existe uma exportação em andamento.")
+            return
+        
+        file_path = filedialog.askopenfilename(
+            title="Anexar ao arquivo Excel",
+            filetypes=[("Arquivos Excel", "*.xlsx"), ("Todos os arquivos", "*.*")]
+        )
+        if not file_path:
+            return
+        
+        df = self.current_dataframe
+        
+        def job(progress_callback, cancel_token):
+            # Apenas os recibos novos são gravados; as estatísticas vêm dos agregados do arquivo
+            path, df_added = excel_appender.append_to_workbook(file_path, df, progress_callback=progress_callback,
+                                                cancel_token=cancel_token)
+            if df_added.empty:
+                return f"Todos os recibos já estavam no arquivo. Nada foi anexado.\n\n{path}"
+            
+            # Manter a cópia em formato colunar (se existir) igual ao Excel
+            if columnar_store.PYARROW_AVAILABLE and columnar_store.results_paths(path)[0].exists():
+                try:
+                    df_old, _ = columnar_store.load_results(path)
+                    df_all = pd.concat([df_old, df_added], ignore_index=True)
+                    columnar_store.save_results(df_all, data_processor.calculate_seller_statistics(df_all), path)
+                except Exception as e:
+                    self.logger.warning(f"Não foi possível atualizar os resultados em formato colunar: {str(e)}")
+            
+            return (f"{len(df_added)} linha(s) de {df_added['Nº Recibo'].nunique()} recibo(s) novo(s) "
+                    f"anexada(s) com sucesso!\n\n{path}")
+        
+        self.status_label.config(text="Anexando ao Excel em segundo plano...",
+                                 foreground=self.colors['text_secondary'])
+        self._start_export("Anexando ao Excel", job)
+
+
+def run_headless(pdf_paths, pages=None, output_path=None) -> int:
+    """
+    Processa PDFs sem interface (linha de comando) e exporta o resultado.
+    
+    Args:
+        pdf_paths: PDFs a processar
+        pages: Seleção de páginas de cada PDF (ver pdf_extractor.parse_page_ranges); None = todas
+        output_path: Arquivo de saída (.xlsx, .csv ou .parquet); None = recibos_extraidos_<data>.xlsx
+    
+    Returns:
+        Código de saída: 0 = sucesso, 1 = algum arquivo falhou ou nada foi extraído, 2 = argumentos inválidos
+    """
+    logger = inicializar_log()
+    
+    def report(message, error=False):
+        # No executável sem console (Windows) sys.stdout/sys.stderr são None: a mensagem vai só para o log
+        stream = sys.stderr if error else sys.stdout
+        if stream is not None:
+            print(message, file=stream)
+        elif error:
+            logger.error(message)
+        else:
+            logger.info(message)
+    
+    try:
+        pdf_extractor.parse_page_ranges(pages)
+    except ValueError as e:
+        report(f"Erro: {e}", error=True)
+        return 2
+    
+    def status_callback(job_id, status, message=""):
+        if status in (job_queue.JOB_DONE, job_queue.JOB_FAILED):
+            report(f"{Path(pdf_paths[job_id]).name}: {status}{' - ' + message if message else ''}")
+    
+    logger.info(f"Processamento sem interface: {len(pdf_paths)} arquivo(s), páginas: {pages or 'todas'}")
+    results = job_queue.process_pdf_files(pdf_paths, status_callback=status_callback,
+                                          log_file=logger.get_log_file(), pages=pages)
+    df = job_queue.merge_job_results(results)
+    if df.empty:
+        report("Nenhum recibo extraído.", error=True)
+        return 1
+    
+    if not output_path:
+        output_path = f"recibos_extraidos_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
+    df_stats = data_processor.calculate_seller_statistics(df)
+    path = excel_exporter.export_to_excel_with_path(df, output_path, df_stats)
+    report(data_processor.format_summary(data_processor.summarize_rows(df)))
+    report(f"Arquivo gerado: {path}")
+    return 0 if all(result['status'] == job_queue.JOB_DONE for result in results) else 1
 
 
 def main():
-    """Função principal."""
+    """
+    Função principal (sem --sem-interface abre a interface, com os PDFs informados já
+    selecionados; ver --help para o modo sem interface).
+    """
+    parser = argparse.ArgumentParser(description="Extrator de recibos de venda em PDF.")
+    parser.add_argument('pdfs', nargs='*',
+                        help="PDFs a processar (sem --sem-interface, são abertos já selecionados na janela)")
+    parser.add_argument('--sem-interface', action='store_true',
+                        help="Processa os PDFs e exporta o resultado sem abrir a janela")
+    parser.add_argument('-p', '--paginas',
+                        help='Páginas de cada PDF, ex.: "1-10, 15, 20-" ou "últimas 5" (padrão: todas)')
+    parser.add_argument('-o', '--saida',
+                        help="Arquivo de saída .xlsx, .csv ou .parquet (padrão: recibos_extraidos_<data>.xlsx)")
+    args = parser.parse_args()
+    
+    if args.sem_interface:
+        if not args.pdfs:
+            parser.error("informe ao menos um PDF")
+        sys.exit(run_headless(args.pdfs, args.paginas, args.saida))
+    if args.saida:
+        parser.error("--saida só pode ser usado com --sem-interface")
+    
     if DND_AVAILABLE and TkinterDnD:
         try:
             root = TkinterDnD.Tk()
@@ -721,9 +1841,22 @@ def main():
         root = tk.Tk()
     
     app = ReceiptExtractorApp(root)
+    if args.pdfs:
+        # PDFs passados na linha de comando (ex.: "Abrir com" ou arrastados sobre o executável)
+        root.after_idle(app.open_command_line_pdfs, args.pdfs, args.paginas)
+    
+    # Travamentos da interface (com a pilha da thread principal) vão para o log
+    monitor = EventLoopMonitor(root, app.logger)
+    monitor.start()
     root.mainloop()
+    monitor.stop()
+    
+    if app.worker_pool is not None:
+        app.worker_pool.shutdown()
 
 
 if __name__ == "__main__":
+    # Necessário para os pools de processos no executável do Windows
+    multiprocessing.freeze_support()
     main()
 
@@ -25,9 +25,13 @@ except ImportError as e:
     else:
         raise
 
+import hashlib
 import re
+from datetime import datetime
 from typing import Dict, List, Optional
 
+from cancellation import OperationCancelled
+
 # Importar logger
 try:
     from logger import get_logger
@@ -177,13 +181,150 @@ def _clean_product_description(descricao: str) -> str:
     return descricao
 
 
-def extract_text_from_pdf(pdf_path: str, progress_callback=None) -> str:
+def receipt_fingerprint(receipt_text: str) -> str:
+    """
+    Calcula a impressão digital do conteúdo de um recibo.
+    O texto é normalizado (espaços e numeração de páginas removidos) para que o mesmo
+    recibo exportado em relatórios diferentes (diário e mensal) gere a mesma impressão.
+    
+    Args:
+        receipt_text: Texto isolado do recibo
+    
+    Returns:
+        Hash SHA-1 em hexadecimal
+    """
+    normalized = re.sub(r'P[áa]gina\s+\d+\s+de\s+\d+', '', receipt_text, flags=re.IGNORECASE)
+    normalized = re.sub(r'\s+', ' ', normalized).strip().upper()
+    return hashlib.sha1(normalized.encode('utf-8')).hexdigest()
+
+
+# Cabeçalho de cada recibo: "RECIBO DE VENDA DD/MM/YYYY HH:MM:SS"
+RECIBO_HEADER_PATTERN = r'RECIBO\s+DE\s+VENDA\s+(\d{2})/(\d{2})/(\d{4})\s+(\d{2}):(\d{2}):(\d{2})'
+
+
+def parse_sale_timestamp(text: str) -> Optional[str]:
+    """
+    Extrai a data/hora da venda do cabeçalho "RECIBO DE VENDA DD/MM/YYYY HH:MM:SS".
+    
+    Args:
+        text: Texto do recibo
+        
+    Returns:
+        Data/hora no formato ISO "AAAA-MM-DD HH:MM:SS", ou None se não encontrada/inválida
+    """
+    match = re.search(RECIBO_HEADER_PATTERN, text, re.IGNORECASE)
+    if not match:
+        return None
+    
+    dia, mes, ano, hora, minuto, segundo = (int(g) for g in match.groups())
+    try:
+        return datetime(ano, mes, dia, hora, minuto, segundo).isoformat(sep=' ')
+    except ValueError:
+        logger.warning(f"Data de venda inválida no cabeçalho: {match.group(0)}")
+        return None
+
+
+# Seleção de páginas: "1-10, 15, 20-" (contadas a partir de 1) ou "últimas N"
+_PAGE_RANGE_PATTERN = re.compile(r'^(\d+)?\s*-\s*(\d+)?$')
+_LAST_PAGES_PATTERN = re.compile(r'^(?:[uú]ltimas|last)\s+(\d+)$', re.IGNORECASE)
+
+
+def parse_page_ranges(pages) -> Optional[List[tuple]]:
+    """
+    Interpreta uma seleção de páginas.
+    
+    Args:
+        pages: None ou "" (todas as páginas), número de uma página, texto como
+            "1-10, 15, 20-" ou "últimas 5" (também "last 5"), ou lista de números e trechos
+    
+    Returns:
+        Lista de intervalos (início, fim), inclusivos e contados a partir de 1. Valores
+        negativos contam a partir do fim (-1 = última página); fim None = até a última.
+        None se todas as páginas estiverem selecionadas
+    
+    Raises:
+        ValueError: Se a seleção for inválida
+    """
+    if pages is None:
+        return None
+    if isinstance(pages, int):
+        items = [pages]
+    elif isinstance(pages, str):
+        items = [item.strip() for item in re.split(r'[,;]', pages) if item.strip()]
+    else:
+        items = list(pages)
+    
+    ranges = []
+    for item in items:
+        text = str(item).strip()
+        if text.isdigit():
+            start = stop = int(text)
+        else:
+            last_match = _LAST_PAGES_PATTERN.match(text)
+            range_match = _PAGE_RANGE_PATTERN.match(text)
+            if last_match:
+                start, stop = -int(last_match.group(1)), -1
+            elif range_match and (range_match.group(1) or range_match.group(2)):
+                start = int(range_match.group(1)) if range_match.group(1) else 1
+                stop = int(range_match.group(2)) if range_match.group(2) else None
+            else:
+                raise ValueError(f"Seleção de páginas inválida: '{text}' "
+                                 f"(exemplos: 1-10, 15, 20- ou últimas 5)")
+        if start == 0 or stop == 0:
+            raise ValueError(f"Página inválida: '{text}' (as páginas começam em 1)")
+        if stop is not None and start > 0 and stop < start:
+            raise ValueError(f"Intervalo de páginas invertido: '{text}'")
+        ranges.append((start, stop))
+    return ranges or None
+
+
+def select_pages(pages, total_pages: int) -> List[int]:
+    """
+    Índices (a partir de 0, em ordem crescente e sem repetição) das páginas selecionadas.
+    Páginas além do fim do PDF são ignoradas.
+    
+    Args:
+        pages: Seleção de páginas (ver parse_page_ranges)
+        total_pages: Número de páginas do PDF
+    
+    Returns:
+        Lista de índices de páginas
+    
+    Raises:
+        ValueError: Se a seleção for inválida ou nenhuma página selecionada existir no PDF
+    """
+    ranges = parse_page_ranges(pages)
+    if ranges is None:
+        return list(range(total_pages))
+    
+    selected = set()
+    for start, stop in ranges:
+        first = total_pages + start if start < 0 else start - 1
+        if stop is None:
+            last = total_pages - 1
+        else:
+            last = total_pages + stop if stop < 0 else stop - 1
+        selected.update(range(max(first, 0), min(last, total_pages - 1) + 1))
+    if not selected:
+        raise ValueError(f"Nenhuma das páginas selecionadas existe no PDF ({total_pages} página(s))")
+    return sorted(selected)
+
+
+def extract_text_from_pdf(pdf_path: str, progress_callback=None, cancel_token=None,
+                          preview_pages: Optional[int] = None, preview_text_callback=None,
+                          pages=None) -> str:
     """
     Extrai todo o texto de um arquivo PDF.
     
     Args:
         pdf_path: Caminho para o arquivo PDF
         progress_callback: Fun├º├úo callback(opcional) chamada com (p├ígina_atual, total_p├íginas) durante o processamento
+        cancel_token: CancellationToken (opcional), verificado a cada página
+        preview_pages: Número de páginas da pré-visualização (opcional)
+        preview_text_callback: Função callback(texto) chamada uma única vez com o texto das
+            primeiras preview_pages páginas, se o PDF tiver mais páginas; a extração continua
+            em seguida, aproveitando as páginas já extraídas
+        pages: Seleção de páginas (ver parse_page_ranges); None = todas
         
     Returns:
         String com todo o texto extra├¡do do PDF
@@ -191,6 +332,7 @@ def extract_text_from_pdf(pdf_path: str, progress_callback=None) -> str:
     Raises:
         FileNotFoundError: Se o arquivo n├úo for encontrado
         Exception: Se houver erro ao processar o PDF
+        OperationCancelled: Se o cancelamento for solicitado
     """
     logger.separador("EXTRAÇÃO DE TEXTO DO PDF")
     logger.info(f"Iniciando extração de texto: {pdf_path}")
@@ -200,26 +342,37 @@ def extract_text_from_pdf(pdf_path: str, progress_callback=None) -> str:
         with pdfplumber.open(pdf_path) as pdf:
             total_pages = len(pdf.pages)
             logger.info(f"PDF aberto com sucesso. Total de páginas: {total_pages}")
+            selected = select_pages(pages, total_pages)
+            if len(selected) < total_pages:
+                logger.info(f"Páginas selecionadas: {len(selected)} de {total_pages} ({pages})")
             
             paginas_com_texto = 0
-            for page_num, page in enumerate(pdf.pages, 1):
-                page_text = page.extract_text()
+            for page_num, page_index in enumerate(selected, 1):
+                if cancel_token is not None:
+                    cancel_token.raise_if_cancelled()
+                page_text = pdf.pages[page_index].extract_text()
                 if page_text:
                     text += page_text + "\n"
                     paginas_com_texto += 1
                 
                 # Log a cada 100 páginas para não sobrecarregar
-                if page_num % 100 == 0 or page_num == total_pages:
-                    logger.debug(f"Página {page_num}/{total_pages} processada. Páginas com texto: {paginas_com_texto}")
+                if page_num % 100 == 0 or page_num == len(selected):
+                    logger.debug(f"Página {page_num}/{len(selected)} processada. Páginas com texto: {paginas_com_texto}")
                 
                 # Chamar callback de progresso se fornecido
                 if progress_callback:
-                    progress_callback(page_num, total_pages)
+                    progress_callback(page_num, len(selected))
+                
+                if preview_text_callback and page_num == preview_pages and page_num < len(selected):
+                    preview_text_callback(text)
             
             logger.detalhes_paginas(total_pages, paginas_com_texto)
             logger.detalhes_texto(text)
         
         return text
+    except OperationCancelled:
+        logger.info(f"Extração de texto cancelada: {pdf_path}")
+        raise
     except FileNotFoundError as e:
         logger.error(f"Arquivo não encontrado: {pdf_path}", exc_info=True)
         raise FileNotFoundError(f"Arquivo n├úo encontrado: {pdf_path}")
@@ -241,6 +394,7 @@ def extract_receipt_data(text: str) -> Dict:
             'numero': str,
             'vendedor': str,
             'cliente': str,
+            'data_venda': str (ISO "AAAA-MM-DD HH:MM:SS") ou None,
             'produtos': [
                 {
                     'descricao': str,
@@ -254,9 +408,13 @@ def extract_receipt_data(text: str) -> Dict:
         'numero': None,
         'vendedor': None,
         'cliente': None,
+        'data_venda': None,
         'produtos': []
     }
     
+    # Extrair data/hora da venda do cabeçalho "RECIBO DE VENDA DD/MM/YYYY HH:MM:SS"
+    data['data_venda'] = parse_sale_timestamp(text)
+    
     # Extrair N┬║ do recibo - pode aparecer como "N┬║ 0000004510" ou "N┬║: 0000004510"
     numero_match = re.search(r'N┬║\s*:?\s*(\d+)', text, re.IGNORECASE)
     if numero_match:
@@ -774,7 +932,16 @@ def extract_receipt_data(text: str) -> Dict:
     return data
 
 
-def extract_from_pdf(pdf_path: str, progress_callback=None) -> List[Dict]:
+# Páginas extraídas e analisadas na pré-visualização rápida
+QUICK_PREVIEW_PAGES = 10
+
+# Marca, em parsed_receipts, os recibos pulados por já terem sido importados
+_SKIPPED = object()
+
+
+def extract_from_pdf(pdf_path: str, progress_callback=None, dedup_index=None, cancel_token=None,
+                     receipt_callback=None, preview_pages: Optional[int] = None,
+                     preview_callback=None, pages=None) -> List[Dict]:
     """
     Fun├º├úo principal para extrair dados de um PDF.
     Suporta m├║ltiplos recibos no mesmo PDF.
@@ -783,28 +950,124 @@ def extract_from_pdf(pdf_path: str, progress_callback=None) -> List[Dict]:
     Args:
         pdf_path: Caminho para o arquivo PDF
         progress_callback: Fun├º├úo callback(opcional) chamada com (p├ígina_atual, total_p├íginas, mensagem) durante o processamento
+        dedup_index: Índice de recibos já importados (opcional, ReceiptDedupIndex).
+            Recibos conhecidos são pulados logo após a detecção de limites,
+            antes de extract_receipt_data. Cada recibo retornado recebe a chave 'fingerprint'.
+        cancel_token: CancellationToken (opcional), verificado a cada página e a cada recibo
+        receipt_callback: Função callback(recibo) (opcional) chamada com cada recibo assim que
+            é extraído, para exibir resultados parciais antes do fim da extração
+        preview_pages: Pré-visualização rápida (opcional): depois das primeiras preview_pages
+            páginas, os recibos completos encontrados nelas são extraídos e enviados a
+            receipt_callback antes de continuar. A extração completa reaproveita as páginas
+            e os recibos já extraídos (cada recibo é enviado uma única vez)
+        preview_callback: Função callback(recibos) (opcional) chamada ao fim da pré-visualização
+        pages: Seleção de páginas (ver parse_page_ranges), respeitada na extração de texto,
+            na detecção de recibos, nas tabelas e na alternativa por páginas; None = todas
         
     Returns:
         Lista de dicion├írios com os dados extra├¡dos de cada recibo
+        
+    Raises:
+        OperationCancelled: Se o cancelamento for solicitado
     """
     logger.separador("EXTRACTION FROM PDF")
     logger.info(f"Processando arquivo: {pdf_path}")
     
     if progress_callback:
         progress_callback(0, 0, "Extraindo texto do PDF...")
-    text = extract_text_from_pdf(pdf_path, progress_callback)
+    
+    # Recibos extraídos na pré-visualização, pelo texto do recibo
+    parsed_receipts = {} if preview_pages else None
+    
+    def show_preview(partial_text):
+        preview = _parse_receipts(pdf_path, partial_text, dedup_index=dedup_index, cancel_token=cancel_token,
+                                  receipt_callback=receipt_callback, parsed_receipts=parsed_receipts,
+                                  partial=True)
+        logger.info(f"Pré-visualização: {len(preview)} recibo(s) nas primeiras {preview_pages} páginas")
+        if preview_callback:
+            preview_callback(preview)
+    
+    text = extract_text_from_pdf(pdf_path, progress_callback, cancel_token, preview_pages=preview_pages,
+                                 preview_text_callback=show_preview if preview_pages else None, pages=pages)
     
     if progress_callback:
         progress_callback(0, 0, "Processando recibos...")
     
+    return _parse_receipts(pdf_path, text, progress_callback, dedup_index, cancel_token,
+                           receipt_callback=receipt_callback, parsed_receipts=parsed_receipts, pages=pages)
+
+
+def _parse_receipts(pdf_path: str, text: str, progress_callback=None, dedup_index=None, cancel_token=None,
+                    receipt_callback=None, parsed_receipts: Optional[Dict] = None, partial: bool = False,
+                    pages=None) -> List[Dict]:
+    """
+    Detecta os limites dos recibos no texto extraído e extrai os dados de cada um
+    (ver extract_from_pdf para os argumentos em comum).
+    
+    Args:
+        parsed_receipts: Recibos já extraídos, indexados pelo texto do recibo (opcional).
+            Recibos encontrados aqui são reaproveitados sem nova extração e sem novo
+            receipt_callback; os novos recibos são acrescentados
+        partial: True se o texto contém apenas as primeiras páginas do PDF: o último recibo
+            (possivelmente incompleto) é ignorado, assim como as alternativas para PDFs
+            sem limites de recibo detectados
+        pages: Páginas de onde o texto foi extraído (usadas nas tabelas e na alternativa por páginas)
+    
+    Returns:
+        Lista de dicionários com os dados extraídos de cada recibo
+    """
     logger.info("Procurando recibos no texto extraído...")
     
     # Detectar múltiplos recibos usando múltiplos critérios
     receipts = []
     
+    def add_receipt(data):
+        receipts.append(data)
+        if receipt_callback:
+            receipt_callback(data)
+    
+    recibos_vistos = set()  # (número, impressão digital) já vistos neste PDF
+    recibos_pulados = 0
+    
+    def is_duplicate(numero, receipt_text, fingerprint) -> bool:
+        """
+        Indica se o recibo deve ser pulado: repetido neste PDF ou já importado.
+        As repetições também contam em dedup_index.skipped_count, mas só na análise do
+        texto completo (a pré-visualização é analisada de novo depois).
+        """
+        chave_recibo = (numero, fingerprint)
+        if numero and chave_recibo in recibos_vistos:
+            if not partial:
+                dedup_index.skipped_count += 1
+            return True
+        recibos_vistos.add(chave_recibo)
+        
+        # Recibo já consultado na pré-visualização (mesmo texto)
+        anterior = parsed_receipts.get(receipt_text) if parsed_receipts is not None else None
+        if anterior is not None:
+            return anterior is _SKIPPED
+        ja_importado = dedup_index.should_skip(numero, fingerprint)
+        if ja_importado and parsed_receipts is not None:
+            parsed_receipts[receipt_text] = _SKIPPED
+        return ja_importado
+    
+    def skip_fallback_receipt(data, receipt_text) -> bool:
+        """Deduplicação dos recibos das alternativas (por páginas e recibo único), após a extração."""
+        nonlocal recibos_pulados
+        numero = data.get('numero')
+        if dedup_index is None or not numero:
+            return False
+        fingerprint = receipt_fingerprint(receipt_text)
+        if is_duplicate(numero, receipt_text, fingerprint):
+            recibos_pulados += 1
+            logger.info(f"Recibo Nº {numero} já importado ou repetido no PDF - ignorado")
+            return True
+        data['fingerprint'] = fingerprint
+        return False
+    
     # Critério 1: Procurar por padrão "RECIBO DE VENDA" seguido de data (mais confiável)
     # Formato: "RECIBO DE VENDA DD/MM/YYYY HH:MM:SS"
-    recibo_pattern = r'RECIBO\s+DE\s+VENDA\s+\d{2}/\d{2}/\d{4}\s+\d{2}:\d{2}:\d{2}'
+    recibo_pattern = RECIBO_HEADER_PATTERN
     recibo_matches = list(re.finditer(recibo_pattern, text, re.IGNORECASE))
     
     # Critério 2: Procurar por todos os números de recibo no texto (padrão "Nº", "N°", etc.)
@@ -878,13 +1141,20 @@ def extract_from_pdf(pdf_path: str, progress_callback=None) -> List[Dict]:
     total_recibos = len(all_positions) if all_positions else 1
     logger.info(f"Total de recibos encontrados: {total_recibos}")
     
-    if len(all_positions) == 0:
+    if partial:
+        # O último recibo pode continuar nas páginas seguintes
+        if len(all_positions) < 2:
+            return receipts
+        total_recibos = len(all_positions) - 1
+    
+    if len(all_positions) == 0 and not partial:
         # Nenhum padrão encontrado, tentar detectar por divisão de páginas
         logger.warning("Nenhum padrão claro encontrado, tentando detectar por páginas...")
         
         # Verificar se há múltiplas páginas no PDF
         with pdfplumber.open(pdf_path) as pdf:
-            total_pages = len(pdf.pages)
+            page_numbers = [page_index + 1 for page_index in select_pages(pages, len(pdf.pages))]
+            total_pages = len(page_numbers)
             logger.info(f"PDF tem {total_pages} páginas")
             
             # Se tem mais de 1 página, tentar processar cada página separadamente
@@ -895,6 +1165,8 @@ def extract_from_pdf(pdf_path: str, progress_callback=None) -> List[Dict]:
                 caracteres_por_pagina = len(text) // total_pages
                 
                 for page_num in range(total_pages):
+                    if cancel_token is not None:
+                        cancel_token.raise_if_cancelled()
                     start_pos = page_num * caracteres_por_pagina
                     end_pos = (page_num + 1) * caracteres_por_pagina if page_num < total_pages - 1 else len(text)
                     
@@ -905,32 +1177,40 @@ def extract_from_pdf(pdf_path: str, progress_callback=None) -> List[Dict]:
                     
                     # Extrair dados da página
                     data = extract_receipt_data(page_text)
+                    if skip_fallback_receipt(data, page_text):
+                        continue
                     
                     # Adicionar número de página como identificador
                     if not data.get('numero'):
-                        data['numero'] = f"PAGINA_{page_num + 1}"
+                        data['numero'] = f"PAGINA_{page_numbers[page_num]}"
                     
                     if data.get('produtos') or data.get('vendedor'):
-                        receipts.append(data)
-                        logger.info(f"Página {page_num + 1}: {len(data.get('produtos', []))} produtos encontrados")
+                        add_receipt(data)
+                        logger.debug(f"Página {page_numbers[page_num]}: {len(data.get('produtos', []))} produtos encontrados")
             else:
                 # Apenas 1 página, processar como recibo único
                 logger.warning("Apenas 1 página encontrada, processando como recibo único...")
                 if progress_callback:
                     progress_callback(1, 1, "Processando recibo único...")
                 data = extract_receipt_data(text)
-                data = _enhance_with_tables(pdf_path, data, progress_callback)
+                if skip_fallback_receipt(data, text):
+                    data = {}
+                else:
+                    data = _enhance_with_tables(pdf_path, data, progress_callback=progress_callback,
+                                                cancel_token=cancel_token, pages=pages)
                 if data.get('numero') or data.get('produtos'):
-                    receipts.append(data)
+                    add_receipt(data)
     else:
         # Processar cada recibo separadamente
         logger.info(f"Processando {total_recibos} recibos separadamente...")
-        for i, recibo_info in enumerate(all_positions):
+        for i, recibo_info in enumerate(all_positions[:total_recibos]):
+            if cancel_token is not None:
+                cancel_token.raise_if_cancelled()
             numero_recibo = recibo_info.get('numero')
             start_pos = recibo_info['pos']
             tipo_recibo = recibo_info['tipo']
             
-            logger.info(f"Processando recibo {i + 1}/{total_recibos}: Tipo={tipo_recibo}, Nº={numero_recibo}")
+            logger.debug(f"Processando recibo {i + 1}/{total_recibos}: Tipo={tipo_recibo}, Nº={numero_recibo}")
             
             if progress_callback:
                 progress_callback(i + 1, total_recibos, f"Processando recibo {i + 1} de {total_recibos}...")
@@ -981,10 +1261,29 @@ def extract_from_pdf(pdf_path: str, progress_callback=None) -> List[Dict]:
                         if proximo_inicio:
                             receipt_text = texto_antes_proximo[:ultimo_fim + proximo_inicio.start()]
             
+            # Recibo já extraído na pré-visualização (mesmo texto)
+            anterior = parsed_receipts.get(receipt_text) if parsed_receipts is not None else None
+            
+            # Deduplicação: pular recibos já importados (ou repetidos neste PDF)
+            # antes de gastar tempo com extract_receipt_data
+            fingerprint = None
+            if dedup_index is not None:
+                fingerprint = receipt_fingerprint(receipt_text)
+                if is_duplicate(numero_recibo, receipt_text, fingerprint):
+                    recibos_pulados += 1
+                    logger.info(f"Recibo {i + 1}: Nº {numero_recibo} já importado ou repetido no PDF - ignorado")
+                    continue
+            
+            if anterior is not None:
+                receipts.append(anterior)
+                continue
+            
             # Extrair dados do recibo APENAS do texto desta seção isolada
             # Criar um novo dicionário limpo para este recibo
             logger.debug(f"Recibo {i + 1}: Extraindo dados do texto...")
             data = extract_receipt_data(receipt_text)
+            if fingerprint:
+                data['fingerprint'] = fingerprint
             
             # Garantir que o número do recibo está correto e forçar
             if numero_recibo:
@@ -1037,22 +1336,34 @@ def extract_from_pdf(pdf_path: str, progress_callback=None) -> List[Dict]:
             
             # Adicionar apenas se tiver dados v├ílidos
             if data.get('numero') or data.get('produtos') or data.get('vendedor'):
-                receipts.append(data)
+                if parsed_receipts is not None:
+                    parsed_receipts[receipt_text] = data
+                add_receipt(data)
                 logger.info(f"Recibo {i + 1}: Adicionado à lista de recibos processados")
             else:
                 logger.warning(f"Recibo {i + 1}: Não foi adicionado (sem dados válidos)")
     
+    if recibos_pulados:
+        logger.info(f"Total de recibos já importados ou repetidos ignorados: {recibos_pulados}")
+        if not receipts:
+            logger.separador("FIM DA EXTRAÇÃO")
+            logger.info("Todos os recibos do PDF já haviam sido importados")
+            return receipts
+    
     logger.separador("FIM DA EXTRAÇÃO")
     logger.info(f"Total de recibos processados com sucesso: {len(receipts)}")
     
-    if not receipts:
+    if not receipts and not partial:
         logger.warning("Nenhum recibo processado com sucesso, tentando extrair como recibo único...")
-        return [extract_receipt_data(text)]
+        data = extract_receipt_data(text)
+        if not skip_fallback_receipt(data, text):
+            add_receipt(data)
     
     return receipts
 
 
-def _enhance_with_tables(pdf_path: str, data: Dict, text_start: int = 0, text_end: int = None, progress_callback=None) -> Dict:
+def _enhance_with_tables(pdf_path: str, data: Dict, text_start: int = 0, text_end: int = None, progress_callback=None,
+                         cancel_token=None, pages=None) -> Dict:
     """
     Melhora os dados extra├¡dos usando tabelas do PDF quando dispon├¡vel.
     
@@ -1061,13 +1372,18 @@ def _enhance_with_tables(pdf_path: str, data: Dict, text_start: int = 0, text_en
         data: Dicion├írio com dados j├í extra├¡dos
         text_start: Posi├º├úo inicial do texto do recibo (para m├║ltiplos recibos)
         text_end: Posi├º├úo final do texto do recibo (para m├║ltiplos recibos)
+        cancel_token: CancellationToken (opcional), verificado a cada página
+        pages: Seleção de páginas (ver parse_page_ranges); None = todas
         
     Returns:
         Dicion├írio com dados melhorados
     """
     try:
         with pdfplumber.open(pdf_path) as pdf:
-            for page in pdf.pages:
+            for page_index in select_pages(pages, len(pdf.pages)):
+                page = pdf.pages[page_index]
+                if cancel_token is not None:
+                    cancel_token.raise_if_cancelled()
                 # Procurar tabelas na p├ígina
                 tables = page.extract_tables()
                 
@@ -1224,6 +1540,8 @@ def _enhance_with_tables(pdf_path: str, data: Dict, text_start: int = 0, text_en
                                         logger.debug(f"    Tabela tem {len(produtos_encontrados) - produtos_tabela_validos} produtos com descrições inválidas (caracteres duplicados)")
                                 # Caso contr├írio, manter produtos do texto (j├í foram extra├¡dos corretamente)
                                 break
+    except OperationCancelled:
+        raise
     except Exception:
         # Se falhar ao extrair tabelas, usar dados do texto
         pass
@@ -0,0 +1,185 @@
+"""
+Índices de busca e ordenação do preview.
+Para cada DataFrame exibido são calculados (uma vez, em segundo plano) um índice de
+palavras das colunas pesquisáveis e as permutações ordenadas de cada coluna.
+Filtrar e ordenar devolvem apenas um vetor de posições: o DataFrame não é copiado e o
+Treeview virtualizado só troca as linhas visíveis.
+"""
+import bisect
+import re
+import threading
+import unicodedata
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+# Colunas pesquisáveis pela barra de busca
+SEARCH_COLUMNS = ('Nº Recibo', 'Cliente', 'Vendedor', 'Descrição do Produto')
+
+_TOKEN_PATTERN = re.compile(r'\w+')
+
+
+def normalize_text(text) -> str:
+    """Texto em minúsculas e sem acentos (a busca por 'joao' encontra 'JOÃO')."""
+    decomposed = unicodedata.normalize('NFKD', str(text))
+    return ''.join(c for c in decomposed if not unicodedata.combining(c)).casefold()
+
+
+def tokenize(text) -> List[str]:
+    """
+    Palavras normalizadas de um texto.
+    Números também são indexados sem os zeros à esquerda ('0000004500' -> '4500').
+    """
+    tokens = _TOKEN_PATTERN.findall(normalize_text(text))
+    tokens += [token.lstrip('0') for token in tokens
+               if token.isdigit() and token.startswith('0') and token.lstrip('0')]
+    return tokens
+
+
+class _TokenIndex:
+    """
+    Índice de palavras de uma coluna.
+    As palavras são extraídas apenas dos valores distintos; cada linha guarda o código
+    do seu valor, então a busca custa uma leitura vetorizada por linha.
+    """
+    
+    def __init__(self, series: pd.Series):
+        codes, uniques = pd.factorize(series)
+        self.codes = codes  # -1 = valor vazio
+        self.num_uniques = len(uniques)
+        
+        postings = {}
+        for code, value in enumerate(uniques):
+            for token in set(tokenize(value)):
+                postings.setdefault(token, []).append(code)
+        self.tokens = sorted(postings)
+        self.postings = {token: np.asarray(value_codes, dtype=np.intp) for token, value_codes in postings.items()}
+    
+    def match(self, prefix: str) -> np.ndarray:
+        """Máscara das linhas com alguma palavra que começa com prefix."""
+        # Posição extra (sempre False) para as linhas com código -1
+        value_mask = np.zeros(self.num_uniques + 1, dtype=bool)
+        i = bisect.bisect_left(self.tokens, prefix)
+        while i < len(self.tokens) and self.tokens[i].startswith(prefix):
+            value_mask[self.postings[self.tokens[i]]] = True
+            i += 1
+        return value_mask[self.codes]
+
+
+class PreviewIndex:
+    """
+    Busca por palavras e ordenação por coluna sobre um DataFrame do preview.
+    Os índices são calculados sob demanda e guardados; build() calcula todos de uma vez
+    (chamado em segundo plano logo após a carga dos dados).
+    """
+    
+    def __init__(self, df: pd.DataFrame, search_columns: Iterable[str] = SEARCH_COLUMNS):
+        """
+        Args:
+            df: DataFrame exibido no preview
+            search_columns: Colunas consultadas pela busca (as ausentes no DataFrame são ignoradas)
+        """
+        self.df = df
+        self.search_columns = [col for col in search_columns if col in df.columns]
+        self._lock = threading.Lock()
+        self._token_indexes: Dict[str, _TokenIndex] = {}
+        self._orders: Dict[tuple, np.ndarray] = {}
+    
+    def build(self, sort_columns: Iterable[str] = ()):
+        """Calcula o índice de palavras e as permutações ordenadas das colunas indicadas."""
+        for col in self.search_columns:
+            self._token_index(col)
+        for col in sort_columns:
+            if col in self.df.columns:
+                self.order(col, True)
+                self.order(col, False)
+    
+    def _token_index(self, col: str) -> _TokenIndex:
+        with self._lock:
+            index = self._token_indexes.get(col)
+            if index is None:
+                index = _TokenIndex(self.df[col])
+                self._token_indexes[col] = index
+            return index
+    
+    def filter(self, query: str) -> Optional[np.ndarray]:
+        """
+        Linhas que contêm todas as palavras da busca (cada palavra pode estar em
+        qualquer coluna pesquisável e é comparada pelo início: 'jo' encontra 'JOÃO').
+        
+        Args:
+            query: Texto digitado na barra de busca
+        
+        Returns:
+            Máscara booleana das linhas, ou None se a busca estiver vazia
+        """
+        terms = list(dict.fromkeys(_TOKEN_PATTERN.findall(normalize_text(query))))
+        if not terms:
+            return None
+        
+        mask = np.ones(len(self.df), dtype=bool)
+        for term in terms:
+            term_mask = np.zeros(len(self.df), dtype=bool)
+            for col in self.search_columns:
+                term_mask |= self._token_index(col).match(term)
+                if term.isdigit() and term.startswith('0') and term.lstrip('0'):
+                    term_mask |= self._token_index(col).match(term.lstrip('0'))
+            mask &= term_mask
+        return mask
+    
+    def order(self, column: str, ascending: bool = True) -> np.ndarray:
+        """
+        Permutação que ordena as linhas pela coluna (ordenação estável; vazios por último).
+        
+        Args:
+            column: Nome da coluna
+            ascending: True = crescente
+        
+        Returns:
+            Vetor de posições no DataFrame
+        """
+        with self._lock:
+            order = self._orders.get((column, ascending))
+            if order is None:
+                key = self._sort_key(self.df[column])
+                # Valores vazios (NaN) ficam no fim nos dois sentidos
+                order = np.argsort(key if ascending else -key, kind='stable')
+                self._orders[(column, ascending)] = order
+            return order
+    
+    @staticmethod
+    def _sort_key(series: pd.Series) -> np.ndarray:
+        """Chave numérica (float, NaN = vazio) que reproduz a ordem natural da coluna."""
+        if pd.api.types.is_datetime64_any_dtype(series):
+            values = series.to_numpy(dtype='datetime64[ns]')
+            key = values.astype(np.int64).astype(np.float64)
+            key[pd.isna(values)] = np.nan
+            return key
+        if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+            return series.to_numpy(dtype=np.float64, na_value=np.nan)
+        
+        # Texto: ordem (sem acentos e sem diferenciar maiúsculas) dos valores distintos
+        codes, uniques = pd.factorize(series)
+        ranks = np.empty(len(uniques) + 1, dtype=np.float64)
+        ranks[:-1] = np.argsort(np.argsort([normalize_text(value) for value in uniques], kind='stable'))
+        ranks[-1] = np.nan  # código -1 (vazio)
+        return ranks[codes]
+    
+    def view(self, query: str = '', sort_column: Optional[str] = None, ascending: bool = True) -> Optional[np.ndarray]:
+        """
+        Posições das linhas a exibir (filtradas e ordenadas).
+        
+        Args:
+            query: Texto da busca ('' = todas as linhas)
+            sort_column: Coluna de ordenação (None = ordem original)
+            ascending: Sentido da ordenação
+        
+        Returns:
+            Vetor de posições no DataFrame, ou None para todas as linhas na ordem original
+        """
+        mask = self.filter(query)
+        if sort_column is None or sort_column not in self.df.columns:
+            return None if mask is None else np.flatnonzero(mask)
+        order = self.order(sort_column, ascending)
+        return order if mask is None else order[mask[order]]
@@ -0,0 +1,98 @@
+"""
+Estado de progresso compartilhado entre a thread de trabalho e a interface.
+A thread de trabalho apenas atualiza o estado (custo desprezível, sem agendar nada
+no Tk); a interface lê o estado mais recente em intervalo fixo (POLL_INTERVAL_MS).
+Milhares de eventos de progresso resultam, no máximo, em 10 atualizações de tela por
+segundo, e o log recebe estatísticas de vazão periódicas em vez de uma linha por evento.
+"""
+import threading
+import time
+from typing import Tuple
+
+# Intervalo de leitura do estado pela interface (10 Hz)
+POLL_INTERVAL_MS = 100
+
+# Intervalo (segundos) entre as linhas de vazão no log
+THROUGHPUT_LOG_INTERVAL = 5.0
+
+
+class ProgressState:
+    """
+    Último progresso informado por uma operação (current, total, mensagem).
+    Cada atualização incrementa a versão; quem renderiza só redesenha quando a versão muda.
+    """
+    
+    def __init__(self, name: str = "Processamento", unit: str = "páginas", logger=None):
+        """
+        Args:
+            name: Nome da operação (usado no log)
+            unit: Unidade de current/total (usada no log)
+            logger: Logger para as estatísticas de vazão (opcional)
+        """
+        self.name = name
+        self.unit = unit
+        self.logger = logger
+        self._lock = threading.Lock()
+        self._current = 0
+        self._total = 0
+        self._message = ""
+        self._version = 0
+        self._events = 0
+        self._finished = False
+        self._start = time.perf_counter()
+        self._phase_start = self._start
+        # Referência para a vazão do intervalo (reiniciada quando a fase muda)
+        self._last_log_time = self._start
+        self._last_log_current = 0
+    
+    def update(self, current, total, message: str = ""):
+        """Registra o progresso atual (chamado pela thread de trabalho)."""
+        with self._lock:
+            if total != self._total:
+                # Nova fase (ex: páginas -> recibos): reiniciar a referência de vazão
+                self._phase_start = time.perf_counter()
+                self._last_log_time = self._phase_start
+                self._last_log_current = 0
+            self._current = current
+            self._total = total
+            if message:
+                self._message = message
+            self._version += 1
+            self._events += 1
+            
+            now = time.perf_counter()
+            should_log = self.logger is not None and now - self._last_log_time >= THROUGHPUT_LOG_INTERVAL
+            if should_log:
+                interval = now - self._last_log_time
+                rate = (current - self._last_log_current) / interval if interval > 0 else 0.0
+                self._last_log_time = now
+                self._last_log_current = current
+                line = (f"{self.name}: {current}/{total} {self.unit} ({rate:.1f} {self.unit}/s, "
+                        f"{self._events} evento(s) de progresso) - {self._message}")
+        if should_log:
+            self.logger.info(line)
+    
+    def snapshot(self) -> Tuple[int, int, int, str]:
+        """Retorna (versão, current, total, mensagem) do estado mais recente."""
+        with self._lock:
+            return self._version, self._current, self._total, self._message
+    
+    @property
+    def finished(self) -> bool:
+        """True depois de finish()."""
+        return self._finished
+    
+    def finish(self):
+        """Marca a operação como encerrada e registra a vazão média no log."""
+        with self._lock:
+            if self._finished:
+                return
+            self._finished = True
+            now = time.perf_counter()
+            elapsed = now - self._start
+            phase = now - self._phase_start
+            current, total, events = self._current, self._total, self._events
+        if self.logger is not None:
+            rate = current / phase if phase > 0 else 0.0
+            self.logger.info(f"{self.name}: concluído em {elapsed:.1f}s - última fase {current}/{total} "
+                             f"{self.unit} ({rate:.1f} {self.unit}/s), {events} evento(s) de progresso")
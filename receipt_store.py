@@ -0,0 +1,361 @@
+"""
+Armazenamento local (SQLite) dos recibos processados.
+Permite consultar dados históricos sem reprocessar os PDFs.
+"""
+import sqlite3
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from data_processor import calculate_seller_statistics
+
+# Importar logger
+try:
+    from logger import get_logger
+    logger = get_logger()
+except ImportError:
+    # Se logger não estiver disponível, criar um logger silencioso
+    class DummyLogger:
+        def info(self, *args, **kwargs): pass
+        def debug(self, *args, **kwargs): pass
+        def warning(self, *args, **kwargs): pass
+        def error(self, *args, **kwargs): pass
+        def separador(self, *args, **kwargs): pass
+    logger = DummyLogger()
+
+
+# Caminho padrão do banco de dados
+DEFAULT_DB_PATH = Path("dados") / "recibos.db"
+
+# Colunas do DataFrame processado, na mesma ordem usada pelo data_processor
+RECEIPT_COLUMNS = ['Nº Recibo', 'Vendedor', 'Cliente', 'Descrição do Produto', 'Quantidade', 'Valor Unitário']
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS recibos (
+    id INTEGER PRIMARY KEY,
+    numero TEXT NOT NULL UNIQUE,
+    vendedor TEXT,
+    cliente TEXT,
+    data_venda TEXT,
+    arquivo_origem TEXT,
+    importado_em TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS produtos (
+    id INTEGER PRIMARY KEY,
+    recibo_id INTEGER NOT NULL REFERENCES recibos(id) ON DELETE CASCADE,
+    descricao TEXT,
+    quantidade INTEGER NOT NULL DEFAULT 0,
+    valor_unitario INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS indice_recibos (
+    numero TEXT PRIMARY KEY,
+    fingerprint TEXT NOT NULL,
+    arquivo_origem TEXT,
+    importado_em TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_recibos_vendedor ON recibos(vendedor);
+CREATE INDEX IF NOT EXISTS idx_recibos_cliente ON recibos(cliente);
+CREATE INDEX IF NOT EXISTS idx_recibos_data_venda ON recibos(data_venda);
+CREATE INDEX IF NOT EXISTS idx_produtos_recibo ON produtos(recibo_id);
+CREATE INDEX IF NOT EXISTS idx_produtos_descricao ON produtos(descricao);
+"""
+
+
+class ReceiptStore:
+    """
+    Armazém de recibos em SQLite.
+    
+    Os valores são guardados na mesma representação inteira do data_processor:
+    quantidade em milésimos e valor unitário em centavos.
+    """
+    
+    def __init__(self, db_path=None, read_only: bool = False):
+        """
+        Inicializa o armazém, criando o banco e as tabelas se necessário.
+        
+        Args:
+            db_path: Caminho do arquivo SQLite. Se None, usa dados/recibos.db
+            read_only: Se True, abre um banco já existente apenas para leitura, sem criar
+                tabelas nem alterar o modo de journal (usado pelos processos de trabalho)
+        """
+        self.db_path = Path(db_path) if db_path is not None else DEFAULT_DB_PATH
+        self.read_only = read_only
+        if read_only:
+            return
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+    
+    @contextmanager
+    def _connect(self):
+        """
+        Abre uma conexão por operação (seguro para uso a partir de threads diferentes).
+        Faz commit ao final ou rollback em caso de erro.
+        """
+        if self.read_only:
+            conn = sqlite3.connect(f"{self.db_path.resolve().as_uri()}?mode=ro", uri=True)
+        else:
+            conn = sqlite3.connect(self.db_path)
+        try:
+            if not self.read_only:
+                conn.execute("PRAGMA foreign_keys = ON")
+                conn.execute("PRAGMA journal_mode = WAL")
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+    
+    def save_dataframe(self, df: pd.DataFrame, arquivo_origem: Optional[str] = None) -> int:
+        """
+        Grava os recibos de um DataFrame processado.
+        Recibos já existentes (mesmo número) são atualizados e seus produtos substituídos,
+        portanto gravar o mesmo PDF duas vezes não duplica dados.
+        
+        Args:
+            df: DataFrame processado (saída de process_multiple_receipts)
+            arquivo_origem: Caminho do PDF de origem (opcional)
+        
+        Returns:
+            Número de recibos gravados
+        """
+        if df is None or df.empty or 'Nº Recibo' not in df.columns:
+            return 0
+        
+        importado_em = datetime.now().isoformat(timespec='seconds')
+        origem = str(arquivo_origem) if arquivo_origem else None
+        
+        # Dados do recibo: primeira linha de cada número
+        recibos = df.drop_duplicates('Nº Recibo')
+        data_venda = recibos['Data da Venda'] if 'Data da Venda' in recibos.columns else pd.Series(None, index=recibos.index)
+        recibo_rows = [
+            (str(numero), _text_or_none(vendedor), _text_or_none(cliente), _date_or_none(data), origem, importado_em)
+            for numero, vendedor, cliente, data in zip(
+                recibos['Nº Recibo'], recibos['Vendedor'], recibos['Cliente'], data_venda
+            )
+        ]
+        
+        with self._connect() as conn:
+            conn.executemany(
+                """
+                INSERT INTO recibos (numero, vendedor, cliente, data_venda, arquivo_origem, importado_em)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(numero) DO UPDATE SET
+                    vendedor = excluded.vendedor,
+                    cliente = excluded.cliente,
+                    data_venda = COALESCE(excluded.data_venda, recibos.data_venda),
+                    arquivo_origem = excluded.arquivo_origem,
+                    importado_em = excluded.importado_em
+                """,
+                recibo_rows
+            )
+            
+            # Mapear número -> id e substituir os produtos desses recibos
+            numeros = [row[0] for row in recibo_rows]
+            ids = self._receipt_ids(conn, numeros)
+            conn.executemany("DELETE FROM produtos WHERE recibo_id = ?", [(ids[n],) for n in numeros])
+            
+            produto_rows = [
+                (ids[str(numero)], _text_or_none(descricao), int(quantidade), int(valor))
+                for numero, descricao, quantidade, valor in zip(
+                    df['Nº Recibo'], df['Descrição do Produto'], df['Quantidade'], df['Valor Unitário']
+                )
+            ]
+            conn.executemany(
+                "INSERT INTO produtos (recibo_id, descricao, quantidade, valor_unitario) VALUES (?, ?, ?, ?)",
+                produto_rows
+            )
+        
+        logger.info(f"Armazém SQLite: {len(recibo_rows)} recibo(s) e {len(produto_rows)} produto(s) gravados em {self.db_path}")
+        return len(recibo_rows)
+    
+    @staticmethod
+    def _receipt_ids(conn, numeros: List[str]) -> Dict[str, int]:
+        """Retorna o id interno de cada número de recibo (consultas em lotes)."""
+        ids = {}
+        # SQLite limita o número de parâmetros por consulta
+        for start in range(0, len(numeros), 500):
+            lote = numeros[start:start + 500]
+            placeholders = ','.join('?' * len(lote))
+            for recibo_id, numero in conn.execute(
+                f"SELECT id, numero FROM recibos WHERE numero IN ({placeholders})", lote
+            ):
+                ids[numero] = recibo_id
+        return ids
+    
+    def query_products(self, numero: Optional[str] = None, vendedor: Optional[str] = None,
+                       cliente: Optional[str] = None, produto: Optional[str] = None,
+                       inicio: Optional[str] = None, fim: Optional[str] = None) -> pd.DataFrame:
+        """
+        Consulta linhas de produto no mesmo formato do DataFrame processado.
+        Filtros de texto com '%' usam LIKE; sem '%' usam igualdade (aproveitando os índices).
+        
+        Args:
+            numero: Número do recibo
+            vendedor: Nome do vendedor
+            cliente: Nome do cliente
+            produto: Descrição do produto
+            inicio: Data/hora inicial da venda (ISO, inclusiva), ex: "2025-07-01"
+            fim: Data/hora final da venda (ISO, exclusiva), ex: "2025-10-01"
+        
+        Returns:
+            DataFrame com as colunas do processamento e 'Data da Venda'
+        """
+        conditions = []
+        params = []
+        
+        for column, value in (('r.numero', numero), ('r.vendedor', vendedor),
+                              ('r.cliente', cliente), ('p.descricao', produto)):
+            if value is not None:
+                conditions.append(f"{column} LIKE ?" if '%' in value else f"{column} = ?")
+                params.append(value)
+        if inicio is not None:
+            conditions.append("r.data_venda >= ?")
+            params.append(_date_or_none(inicio))
+        if fim is not None:
+            conditions.append("r.data_venda < ?")
+            params.append(_date_or_none(fim))
+        
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        sql = f"""
+            SELECT r.numero, r.vendedor, r.cliente, p.descricao, p.quantidade, p.valor_unitario, r.data_venda
+            FROM produtos p
+            JOIN recibos r ON r.id = p.recibo_id
+            {where}
+            ORDER BY r.data_venda, r.numero, p.id
+        """
+        
+        with self._connect() as conn:
+            rows = conn.execute(sql, params).fetchall()
+        
+        df = pd.DataFrame(rows, columns=RECEIPT_COLUMNS + ['Data da Venda'])
+        df['Quantidade'] = df['Quantidade'].astype('int64')
+        df['Valor Unitário'] = df['Valor Unitário'].astype('int64')
+        df['Data da Venda'] = pd.to_datetime(df['Data da Venda'])
+        return df
+    
+    def seller_statistics(self, **filters) -> pd.DataFrame:
+        """
+        Calcula as estatísticas por vendedor sobre os dados armazenados.
+        Aceita os mesmos filtros de query_products, por exemplo:
+            store.seller_statistics(vendedor="JOAO SILVA", inicio="2025-07-01", fim="2025-10-01")
+        
+        Returns:
+            DataFrame no formato de calculate_seller_statistics
+        """
+        return calculate_seller_statistics(self.query_products(**filters))
+    
+    def count_receipts(self) -> int:
+        """Retorna o número de recibos armazenados."""
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM recibos").fetchone()[0]
+
+
+class ReceiptDedupIndex:
+    """
+    Índice persistente dos recibos já importados (número + impressão digital do conteúdo).
+    
+    Usado pelo extract_from_pdf logo após a detecção dos limites de cada recibo,
+    para pular recibos conhecidos antes de extract_receipt_data.
+    O índice é carregado em memória na criação, então as consultas não tocam o disco.
+    """
+    
+    def __init__(self, db_path=None, read_only: bool = False):
+        """
+        Args:
+            db_path: Caminho do arquivo SQLite. Se None, usa dados/recibos.db
+            read_only: Se True, apenas carrega o índice de um banco já existente
+                (register não pode ser usado)
+        """
+        self.store = ReceiptStore(db_path, read_only=read_only)
+        self.skipped_count = 0
+        # Incrementada a cada registro; cópias do índice em outros processos recarregam quando muda
+        self.version = 0
+        with self.store._connect() as conn:
+            self._known = dict(conn.execute("SELECT numero, fingerprint FROM indice_recibos"))
+    
+    def should_skip(self, numero: Optional[str], fingerprint: str) -> bool:
+        """
+        Indica se o recibo já foi importado com o mesmo conteúdo.
+        Recibos com o mesmo número mas conteúdo diferente não são pulados.
+        A impressão digital é calculada por pdf_extractor.receipt_fingerprint.
+        
+        Args:
+            numero: Número do recibo (None = não é possível deduplicar)
+            fingerprint: Impressão digital do conteúdo do recibo
+        
+        Returns:
+            True se o recibo deve ser pulado
+        """
+        if not numero:
+            return False
+        known = self._known.get(str(numero))
+        if known is None:
+            return False
+        if known != fingerprint:
+            logger.warning(f"Recibo Nº {numero} já importado, mas com conteúdo diferente - será processado novamente")
+            return False
+        self.skipped_count += 1
+        return True
+    
+    def register(self, receipts: List[Dict], arquivo_origem: Optional[str] = None) -> int:
+        """
+        Registra recibos como importados.
+        
+        Args:
+            receipts: Lista de recibos extraídos (com 'numero' e 'fingerprint')
+            arquivo_origem: Caminho do PDF de origem (opcional)
+        
+        Returns:
+            Número de recibos registrados
+        """
+        importado_em = datetime.now().isoformat(timespec='seconds')
+        origem = str(arquivo_origem) if arquivo_origem else None
+        rows = [
+            (str(receipt['numero']), receipt['fingerprint'], origem, importado_em)
+            for receipt in receipts
+            if receipt.get('numero') and receipt.get('fingerprint')
+        ]
+        if not rows:
+            return 0
+        
+        with self.store._connect() as conn:
+            conn.executemany(
+                """
+                INSERT INTO indice_recibos (numero, fingerprint, arquivo_origem, importado_em)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT(numero) DO UPDATE SET
+                    fingerprint = excluded.fingerprint,
+                    arquivo_origem = excluded.arquivo_origem,
+                    importado_em = excluded.importado_em
+                """,
+                rows
+            )
+        self._known.update((numero, fingerprint) for numero, fingerprint, _, _ in rows)
+        self.version += 1
+        logger.info(f"Índice de deduplicação: {len(rows)} recibo(s) registrados")
+        return len(rows)
+
+
+def _text_or_none(value) -> Optional[str]:
+    """Converte valores de texto do DataFrame para o banco (vazios viram NULL)."""
+    if value is None or pd.isna(value):
+        return None
+    text = str(value).strip()
+    return text or None
+
+
+def _date_or_none(value) -> Optional[str]:
+    """Converte datas para texto ISO (ordenável no SQLite) ou None."""
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return None
+    return pd.Timestamp(value).isoformat(sep=' ')
@@ -0,0 +1,84 @@
+"""
+Configuração dos testes: os módulos do sistema ficam na raiz do repositório.
+Os PDFs de teste são gerados aqui (um recibo por página, texto em Helvetica),
+sem depender de bibliotecas de geração de PDF.
+"""
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+@pytest.fixture
+def recibos_processados():
+    """DataFrame no formato do processamento (centavos e milésimos em inteiros)."""
+    return pd.DataFrame({
+        'Nº Recibo': ['0000004500', '0000004501', '0000004501', '0000004502'],
+        'Vendedor': ['JOAO SILVA', 'MARIA SOUZA', 'MARIA SOUZA', 'JOAO SILVA'],
+        'Cliente': ['CLIENTE A', 'CLIENTE B', 'CLIENTE B', 'CLIENTE C'],
+        'Descrição do Produto': ['TIRZEPATIDE 50 MG', 'TIRZEPATIDE 50 MG', 'TIRZEPATIDE 60 MG',
+                                 'TIRZEPATIDE 50 MG'],
+        'Quantidade': [1000, 1000, 2000, 1500],
+        'Valor Unitário': [90000, 90000, 108000, 95000],
+        'Data da Venda': pd.to_datetime(['2025-10-01 10:00', '2025-10-02 10:01', '2025-10-02 10:01',
+                                         '2025-10-03 14:30']),
+    })
+
+
+VENDEDORES = ["JOAO SILVA", "MARIA SOUZA", "PEDRO LIMA"]
+PRODUTOS = [("TIRZEPATIDE 50 MG/2ML - SOL INJ", "900,00"), ("TIRZEPATIDE 60 MG/2.4ML - SOL INJ", "1.080,00"),
+            ("CANETA TIRZEPATIDE 60MG (4 DOSES 15MG) L-", "3.100,00")]
+
+
+def receipt_lines(i: int, numero: int) -> list:
+    """Linhas de texto do i-ésimo recibo: vendedor i % 3, dia 1 + i % 3 e 1 + i % 3 produtos."""
+    lines = [f"RECIBO DE VENDA {1 + i % 3:02d}/10/2025 10:{i % 60:02d}:00", f"Nº {numero:010d}",
+             f"Vendedor: {VENDEDORES[i % 3]}", f"NOME/RAZÃO SOCIAL: CLIENTE {i} LTDA", "DADOS DO PRODUTO",
+             "CÓDIGO DESCRIÇÃO DOS PRODUTOS UNID QTD V.UNITÁRIO"]
+    for k in range(1 + i % 3):
+        descricao, valor = PRODUTOS[k]
+        lines += [descricao, f"789{k}123 ANVISA 10231 FR {k + 1},000 {valor}"]
+    return lines + ["."] * 30 + ["TOTAIS", "PAGAMENTO PIX"]
+
+
+def _pdf_string(text: str) -> bytes:
+    raw = text.encode('cp1252')
+    return b'(' + raw.replace(b'\\', b'\\\\').replace(b'(', b'\\(').replace(b')', b'\\)') + b')'
+
+
+def write_pdf(path: Path, pages: list):
+    """Grava um PDF mínimo com uma página por lista de linhas."""
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None,
+               b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>"]
+    kids = []
+    for lines in pages:
+        stream = b"BT /F1 10 Tf 14 TL 30 800 Td " + b" ".join(_pdf_string(line) + b" Tj T*" for line in lines) + b" ET"
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        objects.append(b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+                       b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % len(objects))
+        kids.append(len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (b" ".join(b"%d 0 R" % kid for kid in kids), len(kids))
+    
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, obj in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + obj + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    Path(path).write_bytes(bytes(out))
+
+
+@pytest.fixture
+def pdf_recibos(tmp_path):
+    """Cria PDFs de teste: pdf_recibos(nome, quantidade, inicio) -> caminho (recibos inicio, inicio + 1, ...)."""
+    def create(name: str = "recibos.pdf", count: int = 6, start: int = 4500) -> str:
+        path = tmp_path / name
+        write_pdf(path, [receipt_lines(i, start + i) for i in range(count)])
+        return str(path)
+    return create
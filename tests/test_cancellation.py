@@ -0,0 +1,94 @@
+"""
+Testes do cancelamento cooperativo (CancellationToken) e da exportação cancelável.
+"""
+import pytest
+
+import excel_exporter
+from cancellation import CancellationToken, OperationCancelled
+from excel_exporter import export_to_excel_with_path
+
+
+def test_token_novo_nao_interrompe():
+    token = CancellationToken()
+    assert not token.cancelled
+    token.raise_if_cancelled()
+
+
+def test_cancelamento_interrompe():
+    token = CancellationToken()
+    token.cancel()
+    assert token.cancelled
+    with pytest.raises(OperationCancelled):
+        token.raise_if_cancelled()
+
+
+def test_callbacks_chamados_uma_unica_vez():
+    token = CancellationToken()
+    chamadas = []
+    token.add_callback(lambda: chamadas.append('a'))
+    token.add_callback(lambda: chamadas.append('b'))
+    
+    token.cancel()
+    token.cancel()
+    assert chamadas == ['a', 'b']
+
+
+def test_callback_com_erro_nao_impede_os_demais():
+    token = CancellationToken()
+    chamadas = []
+    
+    def falha():
+        raise RuntimeError("falha")
+    
+    token.add_callback(falha)
+    token.add_callback(lambda: chamadas.append('ok'))
+    token.cancel()
+    assert chamadas == ['ok']
+
+
+def test_callback_registrado_apos_cancelamento_e_chamado_imediatamente():
+    token = CancellationToken()
+    token.cancel()
+    chamadas = []
+    token.add_callback(lambda: chamadas.append('ok'))
+    assert chamadas == ['ok']
+
+
+def test_callback_removido_nao_e_chamado():
+    token = CancellationToken()
+    chamadas = []
+    callback = lambda: chamadas.append('removido')
+    token.add_callback(callback)
+    token.remove_callback(callback)
+    token.remove_callback(callback)
+    
+    token.cancel()
+    assert chamadas == []
+
+
+@pytest.mark.parametrize('backend', ['openpyxl', 'csv'])
+def test_exportacao_cancelada_remove_o_arquivo_parcial(tmp_path, recibos_processados, backend, monkeypatch):
+    # Verificar o cancelamento a cada linha; o pedido chega depois da primeira
+    monkeypatch.setattr(excel_exporter, 'PROGRESS_ROW_STEP', 1)
+    monkeypatch.setattr(excel_exporter.CsvBackend, 'chunksize', 1)
+    token = CancellationToken()
+    progresso = []
+    
+    def callback(current, total, message):
+        progresso.append(current)
+        token.cancel()
+    
+    output = tmp_path / f"saida.{'xlsx' if backend == 'openpyxl' else 'csv'}"
+    with pytest.raises(OperationCancelled):
+        export_to_excel_with_path(recibos_processados, str(output), backend=backend,
+                                  progress_callback=callback, cancel_token=token)
+    assert progresso == [1]
+    assert not output.exists()
+
+
+def test_progresso_da_exportacao(tmp_path, recibos_processados):
+    progresso = []
+    export_to_excel_with_path(recibos_processados, str(tmp_path / "saida.xlsx"),
+                              progress_callback=lambda current, total, message: progresso.append((current, total)))
+    assert progresso
+    assert progresso[-1] == (len(recibos_processados), len(recibos_processados))
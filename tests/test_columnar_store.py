@@ -0,0 +1,53 @@
+"""
+Testes da gravação e recarga de resultados em formato colunar (Feather/Parquet).
+"""
+import pandas as pd
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from columnar_store import load_results, merge_results, results_paths, save_results
+from data_processor import calculate_seller_statistics
+
+
+def test_caminhos_a_partir_do_xlsx_exportado(tmp_path):
+    recibos, estatisticas = results_paths(tmp_path / "dia.xlsx")
+    assert (recibos.name, estatisticas.name) == ('dia.recibos.feather', 'dia.estatisticas.feather')
+    assert results_paths(tmp_path / "dia.estatisticas.parquet", 'parquet')[0].name == 'dia.recibos.parquet'
+
+
+@pytest.mark.parametrize('formato', ['feather', 'parquet'])
+def test_grava_e_recarrega_sem_perdas(tmp_path, recibos_processados, formato):
+    df_stats = calculate_seller_statistics(recibos_processados)
+    written = save_results(recibos_processados, df_stats, tmp_path / "dia.xlsx", formato)
+    
+    for path in written.values():
+        df, stats = load_results(path)
+        pd.testing.assert_frame_equal(df, recibos_processados)
+        pd.testing.assert_frame_equal(stats, df_stats)
+
+
+def test_estatisticas_ausentes_sao_recalculadas(tmp_path, recibos_processados):
+    written = save_results(recibos_processados, None, tmp_path / "dia.xlsx")
+    
+    assert set(written) == {'recibos'}
+    _, stats = load_results(tmp_path / "dia.xlsx")
+    pd.testing.assert_frame_equal(stats, calculate_seller_statistics(recibos_processados))
+
+
+def test_formato_desconhecido(tmp_path, recibos_processados):
+    with pytest.raises(ValueError):
+        save_results(recibos_processados, None, tmp_path / "dia.xlsx", 'csv')
+
+
+def test_combina_sessoes_sem_repetir_recibos(tmp_path, recibos_processados):
+    diario = recibos_processados[recibos_processados['Nº Recibo'] != '0000004502']
+    mensal = recibos_processados.copy()
+    mensal['Vendedor'] = 'OUTRO'
+    save_results(diario, None, tmp_path / "diario.xlsx")
+    save_results(mensal, None, tmp_path / "mensal.xlsx", 'parquet')
+    
+    df, stats = merge_results([tmp_path / "diario.xlsx", tmp_path / "mensal.recibos.parquet"])
+    assert df['Nº Recibo'].tolist() == recibos_processados['Nº Recibo'].tolist()
+    assert df['Vendedor'].tolist() == ['JOAO SILVA', 'MARIA SOUZA', 'MARIA SOUZA', 'OUTRO']
+    pd.testing.assert_frame_equal(stats, calculate_seller_statistics(df))
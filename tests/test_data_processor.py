@@ -0,0 +1,79 @@
+"""
+Testes da representação inteira escalada (centavos e milésimos) do data_processor.
+"""
+import numpy as np
+import pandas as pd
+
+from data_processor import (CENTS_SCALE, PRICE_PER_MG_SCALE, QUANTITY_SCALE, _round_div,
+                            calculate_seller_statistics, format_brazilian_scaled,
+                            parse_brazilian_scaled, to_scaled)
+
+
+def test_round_div_arredonda_meio_para_cima():
+    result = _round_div([10, 15, 14, 25, 0], [10, 10, 10, 10, 7])
+    assert result.dtype == np.int64
+    assert result.tolist() == [1, 2, 1, 3, 0]
+
+
+def test_round_div_sem_estouro_em_valores_grandes():
+    # Valor total de linha (centavos x milésimos) perto do limite usado na exportação
+    numerador = 9_000_000_000_000
+    assert _round_div([numerador], [QUANTITY_SCALE]).tolist() == [9_000_000_000]
+
+
+def test_parse_brazilian_scaled_centavos():
+    values = pd.Series(["1.080,00", "900,000", "", "0,5", "12", "-3,25", "abc"])
+    result = parse_brazilian_scaled(values, CENTS_SCALE)
+    assert result.dtype == np.int64
+    assert result.tolist() == [108000, 90000, 0, 50, 1200, -325, 0]
+
+
+def test_parse_brazilian_scaled_arredonda_casas_extras():
+    values = pd.Series(["0,0015", "0,0014", "1,9995"])
+    assert parse_brazilian_scaled(values, QUANTITY_SCALE).tolist() == [2, 1, 2000]
+
+
+def test_parse_brazilian_scaled_e_exato():
+    # 0,1 + 0,2 não sofre o erro de arredondamento do float
+    values = pd.Series(["0,10", "0,20"])
+    assert parse_brazilian_scaled(values, CENTS_SCALE).sum() == 30
+
+
+def test_parse_brazilian_scaled_valores_numericos():
+    values = pd.Series([1.5, 2.0, np.nan])
+    assert parse_brazilian_scaled(values, QUANTITY_SCALE).tolist() == [1500, 2000, 0]
+
+
+def test_to_scaled_mantem_inteiros():
+    values = pd.Series([108000, 50], dtype='int64')
+    assert to_scaled(values, CENTS_SCALE).tolist() == [108000, 50]
+    assert to_scaled(pd.Series(["1.080,00"]), CENTS_SCALE).tolist() == [108000]
+
+
+def test_format_brazilian_scaled_ida_e_volta():
+    values = pd.Series([108000, 2000, -325, 0], dtype='int64')
+    formatted = format_brazilian_scaled(values, CENTS_SCALE)
+    assert formatted.tolist() == ["1.080,00", "20,00", "-3,25", ""]
+    assert parse_brazilian_scaled(formatted, CENTS_SCALE).tolist() == values.tolist()
+
+
+def test_estatisticas_por_vendedor_em_inteiros():
+    df = pd.DataFrame({
+        'Nº Recibo': ['1', '2', '3'],
+        'Vendedor': ['ANA', 'ANA', 'BRUNO'],
+        'Cliente': ['X', 'Y', 'Z'],
+        'Descrição do Produto': ['TIRZEPATIDE 50 MG', 'TIRZEPATIDE 50 MG', 'TIRZEPATIDE 60 MG'],
+        'Quantidade': [10 * QUANTITY_SCALE, 5 * QUANTITY_SCALE, 1 * QUANTITY_SCALE],
+        'Valor Unitário': [900 * CENTS_SCALE, 1000 * CENTS_SCALE, 1080 * CENTS_SCALE],
+    })
+    stats = calculate_seller_statistics(df).set_index('Vendedor')
+    
+    ana = stats.loc['ANA']
+    assert ana['Quantidade Total'] == 15 * QUANTITY_SCALE
+    assert ana['Valor Total'] == 14000 * CENTS_SCALE
+    # 14.000 / (15 x 50) = 18,66667 por MG
+    assert ana['Preço Médio por MG'] == 1866667
+    assert ana['Preço Mínimo por MG'] == 18 * PRICE_PER_MG_SCALE
+    assert ana['Preço Máximo por MG'] == 20 * PRICE_PER_MG_SCALE
+    
+    assert stats.loc['BRUNO', 'Preço Médio por MG'] == 18 * PRICE_PER_MG_SCALE
@@ -0,0 +1,94 @@
+"""
+Testes do índice de recibos particionado por dia (DatePartitionedIndex).
+"""
+import pandas as pd
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from date_partitions import RECEIPT_MAP_FILE, DatePartitionedIndex
+
+
+def recibos(*linhas):
+    """DataFrame processado a partir de (Nº Recibo, Vendedor, Data da Venda)."""
+    return pd.DataFrame({
+        'Nº Recibo': [numero for numero, _, _ in linhas],
+        'Vendedor': [vendedor for _, vendedor, _ in linhas],
+        'Descrição do Produto': ['TIRZEPATIDE 50 MG'] * len(linhas),
+        'Quantidade': [1000] * len(linhas),
+        'Valor Unitário': [90000] * len(linhas),
+        'Data da Venda': pd.to_datetime([data for _, _, data in linhas]),
+    })
+
+
+@pytest.fixture
+def index(tmp_path):
+    return DatePartitionedIndex(tmp_path / "particoes")
+
+
+def test_particiona_por_dia_e_mes(index):
+    index.add(recibos(('1', 'ANA', '2025-10-01 10:00'), ('2', 'ANA', '2025-10-02 11:00'),
+                      ('3', 'BIA', '2025-11-05 09:00')))
+    
+    nomes = [path.relative_to(index.base_dir).as_posix() for path in index.partitions()]
+    assert nomes == ['2025-10/2025-10-01.feather', '2025-10/2025-10-02.feather', '2025-11/2025-11-05.feather']
+    assert [p.name for p in index.partitions('2025-10-02', '2025-11-01')] == ['2025-10-02.feather']
+
+
+def test_consulta_filtra_horario_e_vendedor(index):
+    index.add(recibos(('1', 'ANA', '2025-10-01 10:00'), ('2', 'BIA', '2025-10-01 15:00'),
+                      ('3', 'ANA', '2025-10-02 09:00')))
+    
+    assert index.query('2025-10-01 12:00', '2025-10-02')['Nº Recibo'].tolist() == ['2']
+    assert index.query(vendedor='ANA')['Nº Recibo'].tolist() == ['1', '3']
+
+
+def test_reimportacao_substitui_recibo_do_mesmo_dia(index):
+    index.add(recibos(('1', 'ANA', '2025-10-01 10:00')))
+    index.add(recibos(('1', 'BIA', '2025-10-01 10:00')))
+    
+    df = index.query()
+    assert df['Nº Recibo'].tolist() == ['1']
+    assert df['Vendedor'].tolist() == ['BIA']
+
+
+def test_recibo_com_data_corrigida_muda_de_particao(index):
+    index.add(recibos(('1', 'ANA', '2025-10-01 10:00'), ('2', 'ANA', '2025-10-01 11:00')))
+    index.add(recibos(('1', 'ANA', '2025-10-03 10:00')))
+    
+    df = index.query()
+    assert sorted(df['Nº Recibo']) == ['1', '2']
+    assert index.query('2025-10-03', '2025-10-04')['Nº Recibo'].tolist() == ['1']
+    assert index.query('2025-10-01', '2025-10-02')['Nº Recibo'].tolist() == ['2']
+
+
+def test_particao_vazia_e_removida(index):
+    index.add(recibos(('1', 'ANA', '2025-10-01 10:00')))
+    index.add(recibos(('1', 'ANA', '2025-10-03 10:00')))
+    
+    assert [p.name for p in index.partitions()] == ['2025-10-03.feather']
+
+
+def test_data_corrigida_com_nova_instancia(index):
+    index.add(recibos(('1', 'ANA', '2025-10-01 10:00')))
+    
+    DatePartitionedIndex(index.base_dir).add(recibos(('1', 'ANA', '2025-10-03 10:00')))
+    assert DatePartitionedIndex(index.base_dir).query()['Nº Recibo'].tolist() == ['1']
+
+
+def test_mapa_de_recibos_apagado_e_reconstruido(index):
+    index.add(recibos(('1', 'ANA', '2025-10-01 10:00'), ('2', 'ANA', '2025-10-01 11:00')))
+    (index.base_dir / RECEIPT_MAP_FILE).unlink()
+    
+    DatePartitionedIndex(index.base_dir).add(recibos(('1', 'ANA', '2025-10-03 10:00')))
+    df = DatePartitionedIndex(index.base_dir).query()
+    assert sorted(df['Nº Recibo']) == ['1', '2']
+    assert (index.base_dir / RECEIPT_MAP_FILE).exists()
+
+
+def test_recibos_sem_data(index):
+    df = recibos(('1', 'ANA', '2025-10-01 10:00'), ('2', 'ANA', None))
+    index.add(df)
+    
+    assert index.query()['Nº Recibo'].tolist() == ['1']
+    assert index.query(incluir_sem_data=True)['Nº Recibo'].tolist() == ['1', '2']
@@ -0,0 +1,73 @@
+"""
+Testes do monitor de travamentos da interface (EventLoopMonitor).
+"""
+import time
+
+from event_loop_monitor import EventLoopMonitor
+
+
+class FakeRoot:
+    """Janela falsa: guarda os callbacks agendados com after em vez de executá-los."""
+    
+    def __init__(self):
+        self.scheduled = []
+    
+    def after(self, ms, callback):
+        self.scheduled.append((ms, callback))
+
+
+class RecordingLogger:
+    def __init__(self):
+        self.infos = []
+        self.warnings = []
+    
+    def info(self, message):
+        self.infos.append(message)
+    
+    def warning(self, message):
+        self.warnings.append(message)
+
+
+def test_batimento_reagendado_ate_parar():
+    root, logger = FakeRoot(), RecordingLogger()
+    monitor = EventLoopMonitor(root, logger, heartbeat_ms=50, threshold_ms=200)
+    monitor.start()
+    assert [ms for ms, _ in root.scheduled] == [50]
+    
+    root.scheduled.pop()[1]()
+    assert len(root.scheduled) == 1
+    
+    monitor.stop()
+    root.scheduled.pop()[1]()
+    assert root.scheduled == []
+    assert logger.infos[-1].startswith("Monitor da interface: 0 travamento(s)")
+
+
+def test_batimento_atrasado_conta_como_travamento():
+    root, logger = FakeRoot(), RecordingLogger()
+    monitor = EventLoopMonitor(root, logger, heartbeat_ms=50, threshold_ms=200)
+    monitor.start()
+    monitor.stop()
+    
+    # Batimento que chega 0,5 s depois do anterior
+    monitor._last_beat = time.perf_counter() - 0.55
+    root.scheduled.pop()[1]()
+    assert monitor.stall_count == 1
+    assert 0.45 <= monitor.max_stall < 1.0
+    assert logger.warnings[-1].startswith("Interface travada por")
+
+
+def test_pilha_da_thread_principal_registrada_durante_travamento():
+    root, logger = FakeRoot(), RecordingLogger()
+    monitor = EventLoopMonitor(root, logger, heartbeat_ms=10, threshold_ms=50)
+    monitor.start()
+    
+    # Sem batimentos (a janela falsa não os executa): a thread principal "trava" aqui
+    deadline = time.monotonic() + 5
+    while not logger.warnings and time.monotonic() < deadline:
+        time.sleep(0.01)
+    monitor.stop()
+    
+    assert len(logger.warnings) == 1  # Uma única pilha por travamento
+    assert "Pilha da thread principal" in logger.warnings[0]
+    assert "test_pilha_da_thread_principal_registrada_durante_travamento" in logger.warnings[0]
@@ -0,0 +1,69 @@
+"""
+Testes da anexação de recibos a um arquivo Excel já exportado.
+"""
+from pathlib import Path
+
+import pandas as pd
+import pytest
+from openpyxl import Workbook
+
+from data_processor import calculate_seller_statistics
+from excel_appender import append_to_workbook
+from excel_exporter import RECEIPTS_SHEET, export_to_excel_with_path
+from excel_loader import load_export
+
+
+@pytest.fixture
+def exportado(tmp_path, recibos_processados):
+    """Arquivo exportado com os três primeiros recibos."""
+    df = recibos_processados[recibos_processados['Nº Recibo'] != '0000004502'].reset_index(drop=True)
+    return export_to_excel_with_path(df, str(tmp_path / "recibos.xlsx"), calculate_seller_statistics(df))
+
+
+def test_anexa_e_recalcula_estatisticas(exportado, recibos_processados):
+    novos = pd.concat([
+        recibos_processados[recibos_processados['Nº Recibo'] == '0000004501'],  # já exportado
+        recibos_processados[recibos_processados['Nº Recibo'] == '0000004502'],
+        pd.DataFrame({
+            'Nº Recibo': ['0000004503'], 'Vendedor': ['ANA LIMA'], 'Cliente': ['CLIENTE D'],
+            'Descrição do Produto': ['TIRZEPATIDE 60 MG'], 'Quantidade': [3000], 'Valor Unitário': [100000],
+            'Data da Venda': pd.to_datetime(['2025-10-04 09:00']),
+        }),
+    ], ignore_index=True)
+    
+    path, df_added = append_to_workbook(exportado, novos)
+    assert path == exportado
+    assert df_added['Nº Recibo'].tolist() == ['0000004502', '0000004503']
+    
+    esperado = pd.concat([recibos_processados, novos.tail(1)], ignore_index=True)
+    df, stats = load_export(path)
+    pd.testing.assert_frame_equal(df, esperado, check_dtype=False)
+    pd.testing.assert_frame_equal(stats, calculate_seller_statistics(esperado), check_dtype=False)
+
+
+def test_anexacoes_sucessivas(exportado, recibos_processados):
+    ultimo = recibos_processados[recibos_processados['Nº Recibo'] == '0000004502']
+    append_to_workbook(exportado, ultimo)
+    _, df_added = append_to_workbook(exportado, ultimo)
+    assert df_added.empty
+    
+    df, stats = load_export(exportado)
+    pd.testing.assert_frame_equal(df, recibos_processados, check_dtype=False)
+    pd.testing.assert_frame_equal(stats, calculate_seller_statistics(recibos_processados), check_dtype=False)
+
+
+def test_nada_novo_mantem_o_arquivo(exportado, recibos_processados):
+    antes = Path(exportado).read_bytes()
+    _, df_added = append_to_workbook(exportado, recibos_processados.head(1))
+    
+    assert df_added.empty
+    assert Path(exportado).read_bytes() == antes
+
+
+def test_arquivo_sem_agregados_e_recusado(tmp_path, recibos_processados):
+    wb = Workbook()
+    wb.active.title = RECEIPTS_SHEET
+    wb.save(tmp_path / "antigo.xlsx")
+    
+    with pytest.raises(ValueError, match='versão anterior'):
+        append_to_workbook(str(tmp_path / "antigo.xlsx"), recibos_processados)
@@ -0,0 +1,189 @@
+"""
+Testes dos backends de exportação (CSV, Parquet e xlsx), dos estilos das abas,
+da divisão em partes e da exportação de um arquivo por vendedor.
+"""
+import multiprocessing
+import time
+from pathlib import Path
+
+import pandas as pd
+import pytest
+from openpyxl import load_workbook
+
+from cancellation import CancellationToken, OperationCancelled
+from data_processor import calculate_seller_statistics
+from excel_exporter import (INDEX_SHEET, RECEIPTS_SHEET, STATS_SHEET, CsvBackend, ExportBackend, OpenpyxlBackend,
+                            ParquetBackend, _XlsxBackend, export_per_seller, export_to_excel_with_path,
+                            select_backend, shard_by_receipt)
+from excel_loader import load_export
+
+
+def test_backends_abstratos_nao_podem_ser_instanciados():
+    with pytest.raises(TypeError):
+        ExportBackend()
+    with pytest.raises(TypeError):
+        _XlsxBackend()
+
+
+def test_escolha_do_backend_pela_extensao():
+    assert select_backend('saida.csv', 10).name == 'csv'
+    assert select_backend('saida.parquet', 10).name == 'parquet'
+    assert select_backend('saida.xlsx', 10).name == 'openpyxl'
+
+
+def test_csv_com_casas_decimais_fixas(tmp_path, recibos_processados):
+    df_stats = calculate_seller_statistics(recibos_processados)
+    path = export_to_excel_with_path(recibos_processados, str(tmp_path / "saida.csv"), df_stats,
+                                     backend=CsvBackend())
+    
+    linhas = (tmp_path / "saida.csv").read_text(encoding='utf-8-sig').splitlines()
+    assert path == str(tmp_path / "saida.csv")
+    assert linhas[0].split(';')[4:6] == ['Quantidade', 'Valor Unitário']
+    assert linhas[1] == "0000004500;JOAO SILVA;CLIENTE A;TIRZEPATIDE 50 MG;1,000;900,00;01/10/2025 10:00:00"
+    assert linhas[4].split(';')[4:6] == ['1,500', '950,00']
+    
+    estatisticas = (tmp_path / "saida.estatisticas.csv").read_text(encoding='utf-8-sig').splitlines()
+    assert estatisticas[1].split(';')[2:] == ['2,500', '2325,00', '18,60000', '18,00000', '19,00000']
+
+
+def test_parquet_grava_no_caminho_escolhido(tmp_path, recibos_processados):
+    pytest.importorskip("pyarrow")
+    from columnar_store import load_results
+    
+    df_stats = calculate_seller_statistics(recibos_processados)
+    output = tmp_path / "saida.parquet"
+    path = export_to_excel_with_path(recibos_processados, str(output), df_stats, backend=ParquetBackend())
+    
+    assert path == str(output)
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['saida.estatisticas.parquet', 'saida.parquet']
+    
+    df, stats = load_results(output)
+    pd.testing.assert_frame_equal(df, recibos_processados, check_dtype=False)
+    pd.testing.assert_frame_equal(stats, df_stats, check_dtype=False)
+
+
+@pytest.mark.parametrize('backend', ['openpyxl', 'xlsxwriter'])
+def test_xlsx_recarregado_sem_perdas(tmp_path, recibos_processados, backend):
+    if backend == 'xlsxwriter':
+        pytest.importorskip("xlsxwriter")
+    df_stats = calculate_seller_statistics(recibos_processados)
+    path = export_to_excel_with_path(recibos_processados, str(tmp_path / "saida.xlsx"), df_stats, backend=backend)
+    
+    df, stats = load_export(path)
+    pd.testing.assert_frame_equal(df, recibos_processados, check_dtype=False)
+    pd.testing.assert_frame_equal(stats, df_stats, check_dtype=False)
+
+
+
+def _fill(cell) -> str:
+    return cell.fill.start_color.rgb[-6:]
+
+
+def _top_border(cell):
+    return cell.border.top.style if cell.border.top is not None else None
+
+
+@pytest.mark.parametrize('backend', ['openpyxl', 'xlsxwriter'])
+def test_estilos_aplicados_na_gravacao(tmp_path, recibos_processados, backend):
+    if backend == 'xlsxwriter':
+        pytest.importorskip("xlsxwriter")
+    path = export_to_excel_with_path(recibos_processados, str(tmp_path / "saida.xlsx"),
+                                     calculate_seller_statistics(recibos_processados), backend=backend)
+    wb = load_workbook(path)
+    
+    ws = wb[RECEIPTS_SHEET]
+    assert ws.freeze_panes == 'A2'
+    assert ws['A1'].font.b and _fill(ws['A1']) == '366092'
+    # Linhas zebradas a partir da primeira linha de dados (branca)
+    assert [_fill(ws.cell(row, 1)) for row in range(2, 6)] == ['FFFFFF', 'F2F2F2', 'FFFFFF', 'F2F2F2']
+    
+    ws = wb[STATS_SHEET]
+    assert _fill(ws['A1']) == '70AD47'
+    # Um bloco por vendedor, com cores alternadas e borda superior a partir do segundo bloco
+    assert [ws.cell(row, 1).value for row in range(2, 5)] == ['JOAO SILVA', 'MARIA SOUZA', 'MARIA SOUZA']
+    assert [_fill(ws.cell(row, 2)) for row in range(2, 5)] == ['E8F5E9', 'C8E6C9', 'C8E6C9']
+    assert [_top_border(ws.cell(row, 2)) for row in range(2, 5)] == [None, 'medium', None]
+    assert ws['A2'].font.b and not ws['B2'].font.b
+
+
+@pytest.mark.parametrize('backend', ['openpyxl', 'xlsxwriter'])
+def test_celulas_numericas_com_formato(tmp_path, recibos_processados, backend):
+    if backend == 'xlsxwriter':
+        pytest.importorskip("xlsxwriter")
+    path = export_to_excel_with_path(recibos_processados, str(tmp_path / "saida.xlsx"),
+                                     calculate_seller_statistics(recibos_processados), backend=backend)
+    wb = load_workbook(path)
+    
+    ws = wb[RECEIPTS_SHEET]
+    quantidade, valor, data = ws['E5'], ws['F5'], ws['G5']
+    assert (quantidade.value, quantidade.number_format) == (1.5, '#,##0.000')
+    assert (valor.value, valor.number_format) == (950, '#,##0.00')
+    assert data.is_date and data.number_format == 'dd/mm/yyyy hh:mm:ss'
+    assert ws['A2'].value == '0000004500' and ws['A2'].number_format == 'General'
+    
+    ws = wb[STATS_SHEET]
+    assert [ws.cell(2, col).value for col in range(3, 8)] == [2.5, 2325, 18.6, 18, 19]
+    assert ws['E2'].number_format == '#,##0.00###'
+
+
+def test_divisao_nao_separa_recibos(recibos_processados):
+    shards = shard_by_receipt(recibos_processados, 2)
+    assert [shard['Nº Recibo'].tolist() for shard in shards] == [
+        ['0000004500'], ['0000004501', '0000004501'], ['0000004502']]
+    
+    assert [len(shard) for shard in shard_by_receipt(recibos_processados, 3)] == [3, 1]
+    assert shard_by_receipt(recibos_processados, 4)[0] is recibos_processados
+
+
+def test_recibo_maior_que_o_limite_e_dividido(recibos_processados):
+    df = recibos_processados.assign(**{'Nº Recibo': '0000004500'})
+    assert [len(shard) for shard in shard_by_receipt(df, 3)] == [3, 1]
+
+
+@pytest.mark.parametrize('shard_mode', ['sheets', 'workbooks'])
+def test_exportacao_dividida_recarregada_sem_perdas(tmp_path, recibos_processados, shard_mode):
+    backend = OpenpyxlBackend(shard_mode, max_rows_per_sheet=2, max_workers=1)
+    path = export_to_excel_with_path(recibos_processados, str(tmp_path / "saida.xlsx"),
+                                     calculate_seller_statistics(recibos_processados), backend=backend)
+    
+    sheetnames = load_workbook(path, read_only=True).sheetnames
+    assert INDEX_SHEET in sheetnames
+    if shard_mode == 'sheets':
+        assert [name for name in sheetnames if name.startswith('Recibos')] == ['Recibos_1', 'Recibos_2', 'Recibos_3']
+    else:
+        assert sorted(p.name for p in tmp_path.iterdir()) == ['saida.xlsx', 'saida_1.xlsx', 'saida_2.xlsx',
+                                                               'saida_3.xlsx']
+    
+    df, _ = load_export(path)
+    pd.testing.assert_frame_equal(df, recibos_processados, check_dtype=False)
+
+
+def test_um_arquivo_por_vendedor(tmp_path, recibos_processados):
+    df = pd.concat([recibos_processados, recibos_processados.tail(1).assign(Vendedor='Joao Silva')],
+                   ignore_index=True)
+    df_stats = calculate_seller_statistics(df)
+    files = export_per_seller(df, str(tmp_path), df_stats, max_workers=2)
+    
+    assert {vendedor: Path(path).name for vendedor, path in files.items()} == {
+        'JOAO SILVA': 'recibos_JOAO_SILVA.xlsx',
+        'Joao Silva': 'recibos_Joao_Silva_2.xlsx',
+        'MARIA SOUZA': 'recibos_MARIA_SOUZA.xlsx',
+    }
+    for vendedor, path in files.items():
+        df_seller, stats = load_export(path)
+        esperado = df[df['Vendedor'] == vendedor].reset_index(drop=True)
+        pd.testing.assert_frame_equal(df_seller, esperado, check_dtype=False)
+        pd.testing.assert_frame_equal(stats, calculate_seller_statistics(esperado), check_dtype=False)
+
+
+def test_exportacao_por_vendedor_cancelada_nao_deixa_arquivos(tmp_path, recibos_processados):
+    token = CancellationToken()
+    token.cancel()
+    with pytest.raises(OperationCancelled):
+        export_per_seller(recibos_processados, str(tmp_path), max_workers=1, cancel_token=token)
+    
+    # Arquivos que estavam sendo gravados são removidos quando o processo termina
+    deadline = time.monotonic() + 30
+    while (multiprocessing.active_children() or any(tmp_path.iterdir())) and time.monotonic() < deadline:
+        time.sleep(0.1)
+    assert not any(tmp_path.iterdir())
@@ -0,0 +1,78 @@
+"""
+Testes da leitura de arquivos Excel exportados (excel_loader).
+"""
+from datetime import datetime
+
+import pandas as pd
+import pytest
+from openpyxl import Workbook, load_workbook
+
+from cancellation import CancellationToken, OperationCancelled
+from data_processor import calculate_seller_statistics
+from excel_exporter import RECEIPTS_SHEET, export_to_excel_with_path
+from excel_loader import load_export, merge_exports, read_exported_receipts
+
+COLUNAS = ['Nº Recibo', 'Vendedor', 'Cliente', 'Descrição do Produto', 'Quantidade', 'Valor Unitário',
+           'Data da Venda']
+
+
+def test_arquivo_salvo_novamente_no_excel(tmp_path, recibos_processados):
+    # Salvar com openpyxl (modo normal) grava os textos na tabela de textos compartilhados
+    path = export_to_excel_with_path(recibos_processados, str(tmp_path / "saida.xlsx"))
+    wb = load_workbook(path)
+    wb[RECEIPTS_SHEET]['B2'] = 'JOAO S.'
+    wb.save(path)
+    
+    df = read_exported_receipts(path)
+    esperado = recibos_processados.copy()
+    esperado.loc[0, 'Vendedor'] = 'JOAO S.'
+    pd.testing.assert_frame_equal(df, esperado, check_dtype=False)
+
+
+def test_valores_gravados_como_texto(tmp_path):
+    # Arquivos antigos: valores no padrão brasileiro e datas em texto
+    wb = Workbook()
+    ws = wb.active
+    ws.title = RECEIPTS_SHEET
+    ws.append(COLUNAS)
+    ws.append(['0000004500', 'ANA', 'CLIENTE', 'TIRZEPATIDE 50 MG', '1,500', '1.080,00', '02/10/2025 10:01:00'])
+    ws.append([4501, 'ANA', None, 'TIRZEPATIDE 60 MG', 2, 900.5, datetime(2025, 10, 3, 9, 30)])
+    wb.save(tmp_path / "antigo.xlsx")
+    
+    df = read_exported_receipts(tmp_path / "antigo.xlsx")
+    assert df['Nº Recibo'].tolist() == ['0000004500', '4501']
+    assert df['Quantidade'].tolist() == [1500, 2000]
+    assert df['Valor Unitário'].tolist() == [108000, 90050]
+    assert df['Data da Venda'].tolist() == [pd.Timestamp('2025-10-02 10:01'), pd.Timestamp('2025-10-03 09:30')]
+    assert pd.isna(df.loc[1, 'Cliente'])
+
+
+def test_estatisticas_recalculadas_sem_agregados(tmp_path, recibos_processados):
+    wb = Workbook()
+    ws = wb.active
+    ws.title = RECEIPTS_SHEET
+    ws.append(COLUNAS)
+    for row in recibos_processados.itertuples(index=False):
+        ws.append([row[0], row[1], row[2], row[3], row[4] / 1000, row[5] / 100, row[6].to_pydatetime()])
+    wb.save(tmp_path / "sem_agregados.xlsx")
+    
+    df, stats = load_export(tmp_path / "sem_agregados.xlsx")
+    pd.testing.assert_frame_equal(df, recibos_processados, check_dtype=False)
+    pd.testing.assert_frame_equal(stats, calculate_seller_statistics(recibos_processados), check_dtype=False)
+
+
+def test_combina_arquivos_sem_repetir_recibos(tmp_path, recibos_processados):
+    primeiro = export_to_excel_with_path(recibos_processados.head(3), str(tmp_path / "a.xlsx"))
+    segundo = export_to_excel_with_path(recibos_processados.tail(2), str(tmp_path / "b.xlsx"))
+    
+    df, stats = merge_exports([primeiro, segundo])
+    pd.testing.assert_frame_equal(df, recibos_processados, check_dtype=False)
+    pd.testing.assert_frame_equal(stats, calculate_seller_statistics(recibos_processados), check_dtype=False)
+
+
+def test_leitura_cancelada(tmp_path, recibos_processados):
+    path = export_to_excel_with_path(recibos_processados, str(tmp_path / "saida.xlsx"))
+    token = CancellationToken()
+    token.cancel()
+    with pytest.raises(OperationCancelled):
+        read_exported_receipts(path, cancel_token=token)
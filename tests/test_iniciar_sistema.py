@@ -0,0 +1,58 @@
+"""
+Testes do cache da verificação de ambiente do iniciador (iniciar_sistema).
+"""
+import os
+
+import pytest
+
+import iniciar_sistema
+from iniciar_sistema import (ARQUIVO_VERIFICACAO, ARQUIVOS_NECESSARIOS, ambiente_ja_verificado,
+                             impressao_digital_ambiente, salvar_verificacao, verificar_arquivos)
+
+
+@pytest.fixture
+def pasta_do_programa(tmp_path, monkeypatch):
+    """Pasta com os arquivos do programa (o iniciador trabalha na pasta atual)."""
+    for arquivo in ARQUIVOS_NECESSARIOS + ['requirements.txt']:
+        (tmp_path / arquivo).write_text("", encoding='utf-8')
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def test_ambiente_nao_verificado(pasta_do_programa):
+    assert not ambiente_ja_verificado(impressao_digital_ambiente())
+
+
+def test_ambiente_verificado_e_reconhecido(pasta_do_programa):
+    salvar_verificacao(impressao_digital_ambiente())
+    assert (pasta_do_programa / ARQUIVO_VERIFICACAO).exists()
+    assert ambiente_ja_verificado(impressao_digital_ambiente())
+
+
+def test_arquivo_atualizado_invalida_a_verificacao(pasta_do_programa):
+    salvar_verificacao(impressao_digital_ambiente())
+    mtime = os.path.getmtime('main.py')
+    os.utime('main.py', (mtime + 10, mtime + 10))
+    assert not ambiente_ja_verificado(impressao_digital_ambiente())
+
+
+def test_arquivo_faltando_invalida_a_verificacao(pasta_do_programa, monkeypatch):
+    salvar_verificacao(impressao_digital_ambiente())
+    (pasta_do_programa / 'logger.py').unlink()
+    assert not ambiente_ja_verificado(impressao_digital_ambiente())
+    
+    monkeypatch.setattr('builtins.input', lambda prompt='': '')
+    assert not verificar_arquivos()
+
+
+def test_pacote_atualizado_invalida_a_verificacao(pasta_do_programa, monkeypatch):
+    salvar_verificacao(impressao_digital_ambiente())
+    versao = iniciar_sistema.importlib.metadata.version
+    monkeypatch.setattr(iniciar_sistema.importlib.metadata, 'version',
+                        lambda pacote: '0.0.1' if pacote == 'pandas' else versao(pacote))
+    assert not ambiente_ja_verificado(impressao_digital_ambiente())
+
+
+def test_arquivo_de_verificacao_corrompido(pasta_do_programa):
+    (pasta_do_programa / ARQUIVO_VERIFICACAO).write_text("{corrompido", encoding='utf-8')
+    assert not ambiente_ja_verificado(impressao_digital_ambiente())
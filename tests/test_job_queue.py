@@ -0,0 +1,129 @@
+"""
+Testes da fila de PDFs processados em paralelo (job_queue).
+"""
+import pandas as pd
+import pytest
+
+from cancellation import CancellationToken, OperationCancelled
+from job_queue import (JOB_CANCELLED, JOB_DONE, JOB_FAILED, PartialResults, WorkerPool, merge_job_results,
+                       process_pdf_files)
+from receipt_store import ReceiptDedupIndex
+
+
+@pytest.fixture
+def worker_pool():
+    pool = WorkerPool(2)
+    yield pool
+    pool.shutdown()
+
+
+def test_processa_varios_pdfs(tmp_path, pdf_recibos):
+    paths = [pdf_recibos("a.pdf", count=4), str(tmp_path / "inexistente.pdf"),
+             pdf_recibos("b.pdf", count=3, start=4510)]
+    estados = []
+    results = process_pdf_files(paths, status_callback=lambda job_id, status, message: estados.append((job_id, status)),
+                                max_workers=2)
+    
+    assert [r['status'] for r in results] == [JOB_DONE, JOB_FAILED, JOB_DONE]
+    assert results[1]['error']
+    assert [r['num_recibos'] for r in results] == [4, 0, 3]
+    assert results[0]['df']['Nº Recibo'].unique().tolist() == [f"{n:010d}" for n in range(4500, 4504)]
+    assert (0, JOB_DONE) in estados and (1, JOB_FAILED) in estados and (2, JOB_DONE) in estados
+
+
+def test_combina_resultados_sem_repetir_recibos(pdf_recibos):
+    # Relatório diário (4500-4502) e mensal (4500-4505) com recibos em comum
+    results = process_pdf_files([pdf_recibos("diario.pdf", count=3), pdf_recibos("mensal.pdf", count=6)],
+                                max_workers=2)
+    
+    df = merge_job_results(results)
+    assert df['Nº Recibo'].unique().tolist() == [f"{n:010d}" for n in range(4500, 4506)]
+    assert not df.duplicated().any()
+    assert results[1]['df']['Nº Recibo'].unique().tolist() == ['0000004503', '0000004504', '0000004505']
+
+
+def test_merge_sem_resultados():
+    assert merge_job_results([{'df': None}, {'df': pd.DataFrame()}]).empty
+
+
+def test_fila_cancelada_antes_de_comecar(pdf_recibos):
+    token = CancellationToken()
+    token.cancel()
+    estados = []
+    with pytest.raises(OperationCancelled):
+        process_pdf_files([pdf_recibos(count=2)], cancel_token=token,
+                          status_callback=lambda job_id, status, message: estados.append(status))
+    assert estados == [JOB_CANCELLED]
+
+
+def test_pool_reutilizado_entre_execucoes(worker_pool, pdf_recibos):
+    worker_pool.start()
+    processos = worker_pool._pool
+    
+    for name in ("a.pdf", "b.pdf"):
+        results = worker_pool.run([pdf_recibos(name, count=2)])
+        assert results[0]['status'] == JOB_DONE
+    assert worker_pool._pool is processos
+
+
+def test_processos_recarregam_o_indice_de_deduplicacao(tmp_path, worker_pool, pdf_recibos):
+    db_path = tmp_path / "recibos.db"
+    index = ReceiptDedupIndex(db_path)
+    path = pdf_recibos(count=3)
+    
+    results = worker_pool.run([path], dedup_db_path=db_path, dedup_version=index.version)
+    assert results[0]['num_recibos'] == 3
+    index.register(results[0]['recibos'], path)
+    
+    results = worker_pool.run([path], dedup_db_path=db_path, dedup_version=index.version)
+    assert (results[0]['num_recibos'], results[0]['num_ignorados']) == (0, 3)
+
+
+def test_cancelamento_recria_o_pool(worker_pool, pdf_recibos):
+    token = CancellationToken()
+    worker_pool.start()
+    processos = worker_pool._pool
+    
+    with pytest.raises(OperationCancelled):
+        worker_pool.run([pdf_recibos("a.pdf", count=6)], cancel_token=token,
+                        progress_callback=lambda job_id, current, total, message: token.cancel())
+    assert worker_pool.started and worker_pool._pool is not processos
+    
+    results = worker_pool.run([pdf_recibos("b.pdf", count=2)])
+    assert results[0]['status'] == JOB_DONE
+
+
+def test_token_ja_cancelado_mantem_o_pool(worker_pool, pdf_recibos):
+    token = CancellationToken()
+    token.cancel()
+    worker_pool.start()
+    processos = worker_pool._pool
+    
+    with pytest.raises(OperationCancelled):
+        worker_pool.run([pdf_recibos(count=2)], cancel_token=token)
+    assert worker_pool._pool is processos
+
+
+def test_resultados_parciais_formam_o_resultado_final(worker_pool, pdf_recibos):
+    lotes = []
+    results = worker_pool.run([pdf_recibos(count=6)], partial_callback=lambda job_id, df: lotes.append(df),
+                              preview_pages=2)
+    
+    assert lotes
+    parcial = pd.concat(lotes, ignore_index=True)
+    pd.testing.assert_frame_equal(parcial[results[0]['df'].columns], results[0]['df'], check_dtype=False)
+
+
+def test_resultados_parciais_sem_repetir_recibos(recibos_processados):
+    partial = PartialResults()
+    assert partial.snapshot() == (0, None, None)
+    
+    partial.add(0, recibos_processados.head(2))
+    partial.add(1, recibos_processados.tail(3))  # 0000004501 já enviado pelo job 0
+    partial.add(0, recibos_processados.iloc[[2]])
+    
+    version, df, summary = partial.snapshot()
+    assert version == partial.version == 3
+    assert df['Nº Recibo'].tolist() == ['0000004500', '0000004501', '0000004502', '0000004501']
+    assert summary['recibos'] == 3 and summary['linhas'] == 4
+    assert partial.snapshot()[1] is df  # Sem lotes novos, o DataFrame não é recalculado
@@ -0,0 +1,66 @@
+"""
+Testes da importação preguiçosa dos módulos pesados (lazy_modules).
+"""
+import sys
+
+import pytest
+
+import lazy_modules
+from lazy_modules import LazyModule, format_import_report, import_report, import_timed, warm_up
+
+
+@pytest.fixture
+def modulo_de_teste(tmp_path, monkeypatch):
+    """Módulo criado em tmp_path, ainda não importado."""
+    (tmp_path / "modulo_lento.py").write_text("VALOR = 42\n", encoding='utf-8')
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.delitem(sys.modules, "modulo_lento", raising=False)
+    yield "modulo_lento"
+    sys.modules.pop("modulo_lento", None)
+
+
+def test_importa_no_primeiro_acesso(modulo_de_teste):
+    modulo = LazyModule(modulo_de_teste)
+    assert not modulo.loaded
+    assert modulo_de_teste not in sys.modules
+    assert "não importado" in repr(modulo)
+    
+    assert modulo.VALOR == 42
+    assert modulo.loaded
+    assert modulo_de_teste in sys.modules
+
+
+def test_tempo_de_importacao_registrado_uma_vez(modulo_de_teste):
+    antes = len(import_report()[1])
+    import_timed(modulo_de_teste)
+    import_timed(modulo_de_teste)
+    
+    _, imports = import_report()
+    assert [name for name, _, _ in imports[antes:]] == [modulo_de_teste]
+    assert f"import {modulo_de_teste}:" in format_import_report()
+
+
+def test_aquecimento_em_segundo_plano(modulo_de_teste):
+    terminou = []
+    thread = warm_up([modulo_de_teste, "modulo_inexistente_xyz"], on_done=lambda: terminou.append(True))
+    thread.join(timeout=10)
+    
+    assert terminou == [True]
+    assert modulo_de_teste in sys.modules
+    milestones, imports = import_report()
+    assert any(name == modulo_de_teste and thread_name == "aquecimento" for name, _, thread_name in imports)
+    assert any(m.startswith("Falha ao importar modulo_inexistente_xyz") for m, _ in milestones)
+
+
+def test_erro_de_importacao_aparece_no_primeiro_uso():
+    modulo = LazyModule("modulo_inexistente_xyz")
+    with pytest.raises(ImportError):
+        modulo.VALOR
+    assert not modulo.loaded
+
+
+def test_marcos_da_inicializacao():
+    lazy_modules.mark("Janela aberta")
+    milestones, _ = import_report()
+    assert milestones[-1][0] == "Janela aberta"
+    assert milestones[-1][1] >= 0
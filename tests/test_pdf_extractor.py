@@ -0,0 +1,161 @@
+"""
+Testes da extração de recibos de PDFs e da seleção de páginas.
+"""
+import pytest
+
+from cancellation import CancellationToken, OperationCancelled
+from conftest import receipt_lines, write_pdf
+from data_processor import process_multiple_receipts
+from pdf_extractor import extract_from_pdf, parse_page_ranges, select_pages
+from receipt_store import ReceiptDedupIndex
+
+
+def test_extrai_um_recibo_por_pagina(pdf_recibos):
+    receipts = extract_from_pdf(pdf_recibos(count=3))
+    
+    assert [r['numero'] for r in receipts] == ['0000004500', '0000004501', '0000004502']
+    assert [r['vendedor'] for r in receipts] == ['JOAO SILVA', 'MARIA SOUZA', 'PEDRO LIMA']
+    assert receipts[1]['data_venda'] == '2025-10-02 10:01:00'
+    assert [(p['quantidade'], p['valor_unitario']) for p in receipts[2]['produtos']] == [
+        ('1,000', '900,00'), ('2,000', '1.080,00'), ('3,000', '3.100,00')]
+    
+    df = process_multiple_receipts(receipts)
+    assert len(df) == 6
+    assert df['Valor Unitário'].tolist() == [90000, 90000, 108000, 90000, 108000, 310000]
+
+
+def test_extracao_cancelada_durante_a_leitura(pdf_recibos):
+    token = CancellationToken()
+    progresso = []
+    
+    def progress_callback(current, total, message=""):
+        progresso.append(current)
+        if current >= 2:
+            token.cancel()
+    
+    with pytest.raises(OperationCancelled):
+        extract_from_pdf(pdf_recibos(count=6), progress_callback, cancel_token=token)
+    assert max(progresso) < 6
+
+
+def test_extracao_cancelada_antes_de_comecar(pdf_recibos):
+    token = CancellationToken()
+    token.cancel()
+    with pytest.raises(OperationCancelled):
+        extract_from_pdf(pdf_recibos(count=2), cancel_token=token)
+
+
+def test_processamento_cancelado(pdf_recibos):
+    receipts = extract_from_pdf(pdf_recibos(count=2))
+    token = CancellationToken()
+    token.cancel()
+    with pytest.raises(OperationCancelled):
+        process_multiple_receipts(receipts, cancel_token=token)
+
+
+
+def test_recibos_ja_importados_sao_pulados(tmp_path, pdf_recibos):
+    index = ReceiptDedupIndex(tmp_path / "recibos.db")
+    receipts = extract_from_pdf(pdf_recibos("a.pdf", count=4), dedup_index=index)
+    assert all(r['fingerprint'] for r in receipts)
+    index.register(receipts, "a.pdf")
+    
+    # Relatório seguinte: os 4 recibos anteriores e 2 novos
+    receipts = extract_from_pdf(pdf_recibos("b.pdf", count=6), dedup_index=index)
+    assert [r['numero'] for r in receipts] == ['0000004504', '0000004505']
+    assert index.skipped_count == 4
+
+
+def test_recibo_repetido_no_mesmo_pdf(tmp_path):
+    pages = [receipt_lines(0, 4500), receipt_lines(1, 4501), receipt_lines(0, 4500)]
+    write_pdf(tmp_path / "repetido.pdf", pages)
+    index = ReceiptDedupIndex(tmp_path / "recibos.db")
+    
+    receipts = extract_from_pdf(str(tmp_path / "repetido.pdf"), dedup_index=index)
+    assert [r['numero'] for r in receipts] == ['0000004500', '0000004501']
+    assert index.skipped_count == 1
+
+
+def test_recibo_alterado_e_extraido_novamente(tmp_path, pdf_recibos):
+    index = ReceiptDedupIndex(tmp_path / "recibos.db")
+    index.register(extract_from_pdf(pdf_recibos("a.pdf", count=2), dedup_index=index))
+    
+    corrigido = receipt_lines(1, 4501)
+    corrigido[2] = "Vendedor: PEDRO LIMA"
+    write_pdf(tmp_path / "corrigido.pdf", [receipt_lines(0, 4500), corrigido])
+    receipts = extract_from_pdf(str(tmp_path / "corrigido.pdf"), dedup_index=index)
+    assert [(r['numero'], r['vendedor']) for r in receipts] == [('0000004501', 'PEDRO LIMA')]
+
+
+@pytest.mark.parametrize('pages', [None, '', ' , '])
+def test_todas_as_paginas(pages):
+    assert parse_page_ranges(pages) is None
+    assert select_pages(pages, 4) == [0, 1, 2, 3]
+
+
+def test_intervalos_em_texto():
+    assert parse_page_ranges('1-3, 5; 8-') == [(1, 3), (5, 5), (8, None)]
+    assert parse_page_ranges('-4') == [(1, 4)]
+    assert parse_page_ranges(7) == [(7, 7)]
+    assert parse_page_ranges([2, '4-5']) == [(2, 2), (4, 5)]
+
+
+@pytest.mark.parametrize('pages', ['últimas 3', 'ultimas 3', 'last 3'])
+def test_ultimas_paginas(pages):
+    assert parse_page_ranges(pages) == [(-3, -1)]
+    assert select_pages(pages, 10) == [7, 8, 9]
+
+
+@pytest.mark.parametrize('pages', ['abc', '0', '3-0', '5-2', '1-2-3', 'últimas'])
+def test_selecao_invalida(pages):
+    with pytest.raises(ValueError):
+        parse_page_ranges(pages)
+
+
+def test_indices_ordenados_sem_repeticao():
+    assert select_pages('5, 1-3, 2', 10) == [0, 1, 2, 4]
+    assert select_pages('8-', 10) == [7, 8, 9]
+
+
+def test_paginas_alem_do_fim_sao_ignoradas():
+    assert select_pages('3-20', 5) == [2, 3, 4]
+    assert select_pages('últimas 50', 3) == [0, 1, 2]
+    with pytest.raises(ValueError):
+        select_pages('10-12', 5)
+
+
+def test_extracao_apenas_das_paginas_selecionadas(pdf_recibos):
+    path = pdf_recibos(count=6)
+    assert [r['numero'] for r in extract_from_pdf(path, pages='2-3')] == ['0000004501', '0000004502']
+    assert [r['numero'] for r in extract_from_pdf(path, pages='últimas 1')] == ['0000004505']
+    with pytest.raises(Exception, match='Nenhuma das páginas selecionadas'):
+        extract_from_pdf(path, pages='10-')
+
+
+def test_previa_rapida_das_primeiras_paginas(pdf_recibos):
+    enviados = []
+    previas = []
+    receipts = extract_from_pdf(pdf_recibos(count=6), receipt_callback=lambda r: enviados.append(r['numero']),
+                                preview_pages=3, preview_callback=previas.append)
+    
+    # O último recibo das páginas da prévia pode estar incompleto e fica para a extração completa
+    assert len(previas) == 1
+    assert [r['numero'] for r in previas[0]] == ['0000004500', '0000004501']
+    assert [r['numero'] for r in receipts] == [f"{n:010d}" for n in range(4500, 4506)]
+    assert enviados == [r['numero'] for r in receipts]
+
+
+def test_previa_rapida_conta_recibos_pulados_uma_vez(tmp_path, pdf_recibos):
+    index = ReceiptDedupIndex(tmp_path / "recibos.db")
+    index.register(extract_from_pdf(pdf_recibos("a.pdf", count=2), dedup_index=index))
+    
+    receipts = extract_from_pdf(pdf_recibos("b.pdf", count=6), dedup_index=index, preview_pages=3)
+    assert len(receipts) == 4
+    assert index.skipped_count == 2
+
+
+def test_previa_maior_que_o_pdf(pdf_recibos):
+    previas = []
+    receipts = extract_from_pdf(pdf_recibos(count=2), preview_pages=5, preview_callback=previas.append)
+    assert previas == []
+    assert len(receipts) == 2
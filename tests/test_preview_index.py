@@ -0,0 +1,78 @@
+"""
+Testes da busca e da ordenação do preview (PreviewIndex).
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from preview_index import PreviewIndex, tokenize
+
+
+@pytest.fixture
+def index():
+    return PreviewIndex(pd.DataFrame({
+        'Nº Recibo': ['0000004500', '0000004501', '0000004502', '0000004503'],
+        'Vendedor': ['JOÃO SILVA', 'MARIA SOUZA', 'joana lima', None],
+        'Cliente': ['CLÍNICA ÁGUA', 'FARMÁCIA BOA', 'CLINICA NOVA', 'FARMACIA BOA'],
+        'Descrição do Produto': ['TIRZEPATIDE 50 MG', 'TIRZEPATIDE 60 MG', 'SEMAGLUTIDA 5 MG', 'TIRZEPATIDE 50 MG'],
+        'Quantidade': [2000, np.nan, 1000, 3000],
+        'Data da Venda': pd.to_datetime(['2025-10-03', '2025-10-01', None, '2025-10-02']),
+    }))
+
+
+def test_tokenize_sem_acentos_e_sem_zeros_a_esquerda():
+    assert tokenize('Recibo 0000004500 - JOÃO') == ['recibo', '0000004500', 'joao', '4500']
+
+
+def test_busca_vazia_retorna_none(index):
+    assert index.filter('') is None
+    assert index.filter('  - ') is None
+    assert index.view() is None
+
+
+def test_busca_por_inicio_de_palavra_sem_acentos(index):
+    assert index.filter('jo').tolist() == [True, False, True, False]
+    assert index.filter('clinica').tolist() == [True, False, True, False]
+    assert index.filter('agua').tolist() == [True, False, False, False]
+    assert not index.filter('silvana').any()
+
+
+def test_todas_as_palavras_em_qualquer_coluna(index):
+    assert index.filter('farmacia 50').tolist() == [False, False, False, True]
+    assert index.filter('tirzepatide boa').tolist() == [False, True, False, True]
+
+
+def test_busca_por_numero_com_ou_sem_zeros(index):
+    assert index.filter('4501').tolist() == [False, True, False, False]
+    assert index.filter('0000004501').tolist() == [False, True, False, False]
+    assert index.filter('450').tolist() == [True, True, True, True]
+
+
+def test_ordena_texto_sem_diferenciar_acentos_e_maiusculas(index):
+    assert index.order('Vendedor').tolist() == [2, 0, 1, 3]
+    assert index.order('Vendedor', ascending=False).tolist() == [1, 0, 2, 3]
+
+
+def test_vazios_por_ultimo_nos_dois_sentidos(index):
+    assert index.order('Quantidade').tolist() == [2, 0, 3, 1]
+    assert index.order('Quantidade', ascending=False).tolist() == [3, 0, 2, 1]
+    assert index.order('Data da Venda').tolist() == [1, 3, 0, 2]
+    assert index.order('Data da Venda', ascending=False).tolist() == [0, 3, 1, 2]
+
+
+def test_ordenacao_estavel(index):
+    assert index.order('Descrição do Produto').tolist() == [2, 0, 3, 1]
+
+
+def test_view_filtra_e_ordena(index):
+    assert index.view('tirzepatide').tolist() == [0, 1, 3]
+    assert index.view('tirzepatide', 'Quantidade', ascending=False).tolist() == [3, 0, 1]
+    assert index.view('', 'Vendedor').tolist() == [2, 0, 1, 3]
+    assert index.view('jo', 'Coluna inexistente').tolist() == [0, 2]
+
+
+def test_build_calcula_indices_antecipadamente(index):
+    index.build(['Vendedor', 'Quantidade'])
+    assert set(index._token_indexes) == set(index.search_columns)
+    assert set(index._orders) == {('Vendedor', True), ('Vendedor', False),
+                                  ('Quantidade', True), ('Quantidade', False)}
@@ -0,0 +1,65 @@
+"""
+Testes do estado de progresso compartilhado (ProgressState).
+"""
+import threading
+
+import progress_state
+from progress_state import ProgressState
+
+
+class RecordingLogger:
+    def __init__(self):
+        self.lines = []
+    
+    def info(self, message):
+        self.lines.append(message)
+
+
+def test_snapshot_retorna_o_ultimo_progresso():
+    state = ProgressState()
+    assert state.snapshot() == (0, 0, 0, "")
+    
+    state.update(1, 10, "Lendo páginas...")
+    state.update(2, 10)
+    assert state.snapshot() == (2, 2, 10, "Lendo páginas...")
+
+
+def test_versao_muda_a_cada_atualizacao():
+    state = ProgressState()
+    
+    def worker():
+        for i in range(1000):
+            state.update(i, 1000)
+    
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert state.snapshot()[0] == 4000
+
+
+def test_vazao_registrada_em_intervalos(monkeypatch):
+    logger = RecordingLogger()
+    state = ProgressState("Processamento", "páginas", logger)
+    state.update(1, 10, "Lendo páginas...")
+    assert logger.lines == []
+    
+    monkeypatch.setattr(progress_state, 'THROUGHPUT_LOG_INTERVAL', 0.0)
+    state.update(5, 10)
+    assert len(logger.lines) == 1
+    assert logger.lines[0].startswith("Processamento: 5/10 páginas")
+    assert "2 evento(s) de progresso" in logger.lines[0]
+
+
+def test_finish_registra_uma_unica_vez():
+    logger = RecordingLogger()
+    state = ProgressState("Exportação", "linhas", logger)
+    state.update(10, 10)
+    assert not state.finished
+    
+    state.finish()
+    state.finish()
+    assert state.finished
+    assert len(logger.lines) == 1
+    assert "última fase 10/10 linhas" in logger.lines[0]
@@ -0,0 +1,112 @@
+"""
+Testes do armazenamento SQLite de recibos (ReceiptStore) e do índice
+persistente de recibos já importados (ReceiptDedupIndex).
+"""
+import sqlite3
+
+import pandas as pd
+import pytest
+
+from data_processor import calculate_seller_statistics
+from pdf_extractor import receipt_fingerprint
+from receipt_store import ReceiptDedupIndex, ReceiptStore
+
+RECIBO_TEXTO = "Nº 0000004500\nVendedor: JOAO SILVA\nTIRZEPATIDE 50 MG 1,000 900,00"
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return tmp_path / "recibos.db"
+
+
+def test_grava_e_consulta_no_formato_do_processamento(db_path, recibos_processados):
+    store = ReceiptStore(db_path)
+    assert store.save_dataframe(recibos_processados, 'a.pdf') == 3
+    
+    df = store.query_products()
+    pd.testing.assert_frame_equal(df, recibos_processados, check_dtype=False)
+
+
+def test_regravar_nao_duplica_recibos(db_path, recibos_processados):
+    store = ReceiptStore(db_path)
+    store.save_dataframe(recibos_processados)
+    corrigido = recibos_processados[recibos_processados['Nº Recibo'] == '0000004501'].head(1)
+    store.save_dataframe(corrigido)
+    
+    assert store.count_receipts() == 3
+    assert store.query_products(numero='0000004501')['Descrição do Produto'].tolist() == ['TIRZEPATIDE 50 MG']
+
+
+def test_filtros_da_consulta(db_path, recibos_processados):
+    store = ReceiptStore(db_path)
+    store.save_dataframe(recibos_processados)
+    
+    assert store.query_products(vendedor='JOAO SILVA')['Nº Recibo'].tolist() == ['0000004500', '0000004502']
+    assert store.query_products(produto='%60 MG')['Nº Recibo'].tolist() == ['0000004501']
+    assert store.query_products(inicio='2025-10-02', fim='2025-10-03')['Nº Recibo'].unique().tolist() == ['0000004501']
+    
+    stats = store.seller_statistics(vendedor='JOAO SILVA')
+    esperado = calculate_seller_statistics(recibos_processados[recibos_processados['Vendedor'] == 'JOAO SILVA'])
+    pd.testing.assert_frame_equal(stats, esperado)
+
+
+def test_recibo_desconhecido_nao_e_pulado(db_path):
+    index = ReceiptDedupIndex(db_path)
+    assert not index.should_skip("0000004500", receipt_fingerprint(RECIBO_TEXTO))
+    assert not index.should_skip(None, receipt_fingerprint(RECIBO_TEXTO))
+    assert index.skipped_count == 0
+
+
+def test_recibo_registrado_e_pulado(db_path):
+    index = ReceiptDedupIndex(db_path)
+    fingerprint = receipt_fingerprint(RECIBO_TEXTO)
+    assert index.register([{'numero': '0000004500', 'fingerprint': fingerprint}], 'a.pdf') == 1
+    
+    assert index.should_skip("0000004500", fingerprint)
+    assert index.skipped_count == 1
+
+
+def test_impressao_digital_ignora_espacos_e_paginacao(db_path):
+    index = ReceiptDedupIndex(db_path)
+    index.register([{'numero': '0000004500', 'fingerprint': receipt_fingerprint(RECIBO_TEXTO)}])
+    
+    mesmo_recibo = "Página 3 de 10\n" + RECIBO_TEXTO.replace("\n", "   \n ")
+    assert index.should_skip("0000004500", receipt_fingerprint(mesmo_recibo))
+
+
+def test_mesmo_numero_com_conteudo_diferente_e_processado(db_path):
+    index = ReceiptDedupIndex(db_path)
+    index.register([{'numero': '0000004500', 'fingerprint': receipt_fingerprint(RECIBO_TEXTO)}])
+    
+    corrigido = RECIBO_TEXTO.replace("1,000", "2,000")
+    assert not index.should_skip("0000004500", receipt_fingerprint(corrigido))
+    assert index.skipped_count == 0
+
+
+def test_registro_persiste_entre_instancias(db_path):
+    fingerprint = receipt_fingerprint(RECIBO_TEXTO)
+    ReceiptDedupIndex(db_path).register([
+        {'numero': '0000004500', 'fingerprint': fingerprint},
+        {'numero': None, 'fingerprint': fingerprint},
+    ])
+    
+    index = ReceiptDedupIndex(db_path)
+    assert index.should_skip("0000004500", fingerprint)
+    assert len(index._known) == 1
+
+
+def test_registro_atualiza_versao(db_path):
+    index = ReceiptDedupIndex(db_path)
+    assert index.register([]) == 0
+    assert index.version == 0
+    index.register([{'numero': '1', 'fingerprint': 'abc'}])
+    assert index.version == 1
+
+
+def test_somente_leitura_carrega_mas_nao_grava(db_path):
+    ReceiptDedupIndex(db_path).register([{'numero': '1', 'fingerprint': 'abc'}])
+    
+    index = ReceiptDedupIndex(db_path, read_only=True)
+    assert index.should_skip('1', 'abc')
+    with pytest.raises(sqlite3.OperationalError):
+        index.register([{'numero': '2', 'fingerprint': 'def'}])
@@ -0,0 +1,138 @@
+"""
+Leitura direta do XML de arquivos xlsx, compartilhada pela anexação incremental
+(excel_appender) e pela leitura rápida (excel_loader): localização das partes do
+pacote, textos compartilhados e leitura de abas pequenas (índice e agregados).
+"""
+import html
+import re
+import zipfile
+import xml.etree.ElementTree as ET
+from typing import Dict, List, Optional
+
+import pandas as pd
+from openpyxl.utils import column_index_from_string
+
+from data_processor import AGGREGATE_COLUMNS
+from excel_exporter import AGGREGATES_SHEET
+
+MAIN_NS = 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'
+REL_NS = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+PACKAGE_REL_NS = 'http://schemas.openxmlformats.org/package/2006/relationships'
+
+_CELL_RE = re.compile(rb'<c r="([A-Z]+)\d+"([^>]*?)(?<!/)>(.*?)</c>', re.S)
+_TEXT_RE = re.compile(rb'<t(?:\s[^>]*)?>([^<]*)</t>')
+_VALUE_RE = re.compile(rb'<v>([^<]*)</v>')
+
+
+def qname(tag: str) -> str:
+    """Nome qualificado no namespace principal da planilha."""
+    return f'{{{MAIN_NS}}}{tag}'
+
+
+class WorkbookParts:
+    """Localiza as partes do pacote xlsx (abas, estilos e textos compartilhados)."""
+    
+    def __init__(self, zin: zipfile.ZipFile):
+        rels_root = ET.fromstring(zin.read('xl/_rels/workbook.xml.rels'))
+        targets = {}
+        self.styles = 'xl/styles.xml'
+        self.shared_strings = None
+        for rel in rels_root.iter(f'{{{PACKAGE_REL_NS}}}Relationship'):
+            target = rel.get('Target', '')
+            # Destinos absolutos (/xl/...) ou relativos à pasta xl/
+            part = target.lstrip('/') if target.startswith('/') else f'xl/{target}'
+            targets[rel.get('Id')] = part
+            rel_type = rel.get('Type', '')
+            if rel_type.endswith('/styles'):
+                self.styles = part
+            elif rel_type.endswith('/sharedStrings'):
+                self.shared_strings = part
+        
+        workbook_root = ET.fromstring(zin.read('xl/workbook.xml'))
+        self.sheets: Dict[str, str] = {}
+        for sheet in workbook_root.iter(qname('sheet')):
+            self.sheets[sheet.get('name')] = targets.get(sheet.get(f'{{{REL_NS}}}id'))
+
+
+class SharedStrings:
+    """Textos compartilhados (arquivos salvos novamente pelo Excel), carregados só quando usados."""
+    
+    def __init__(self, zin: zipfile.ZipFile, part: Optional[str]):
+        self._zin = zin
+        self._part = part
+        self._strings: Optional[List[str]] = None
+        self._indexes: Optional[Dict[str, int]] = None
+    
+    def _load(self) -> List[str]:
+        if self._strings is None:
+            self._strings = []
+            if self._part is not None:
+                root = ET.fromstring(self._zin.read(self._part))
+                for si in root.iter(qname('si')):
+                    # Ignorar textos fonéticos (rPh)
+                    runs = [t.text or '' for t in si.iter(qname('t'))]
+                    phonetic = {id(t) for rph in si.iter(qname('rPh')) for t in rph.iter(qname('t'))}
+                    if phonetic:
+                        runs = [t.text or '' for t in si.iter(qname('t')) if id(t) not in phonetic]
+                    self._strings.append(''.join(runs))
+        return self._strings
+    
+    def get(self, index: int) -> str:
+        return self._load()[index]
+    
+    def index(self, text: str) -> Optional[int]:
+        """Índice de um texto na tabela compartilhada (None se não existir)."""
+        if self._indexes is None:
+            self._indexes = {}
+            for i, value in enumerate(self._load()):
+                self._indexes.setdefault(value, i)
+        return self._indexes.get(text)
+
+
+def cell_value(attrs: bytes, inner: bytes, shared: SharedStrings):
+    """Valor de uma célula a partir do XML (texto inline, compartilhado ou número)."""
+    if b'<t' in inner:
+        return html.unescape(b''.join(_TEXT_RE.findall(inner)).decode('utf-8'))
+    value = _VALUE_RE.search(inner)
+    if value is None:
+        return None
+    value = value.group(1).decode('utf-8')
+    if b't="s"' in attrs:
+        return shared.get(int(value))
+    if b't="str"' in attrs or b't="e"' in attrs:
+        return html.unescape(value)
+    return float(value)
+
+
+def row_values(row_xml: bytes, shared: SharedStrings) -> list:
+    """Valores das células de uma linha (conteúdo de <row>), nas posições das colunas."""
+    values = []
+    for letters, attrs, inner in _CELL_RE.findall(row_xml):
+        col = column_index_from_string(letters.decode('ascii')) - 1
+        values.extend([None] * (col + 1 - len(values)))
+        values[col] = cell_value(attrs, inner, shared)
+    return values
+
+
+def read_sheet_rows(xml: bytes, shared: SharedStrings) -> List[list]:
+    """Lê todas as linhas de uma aba pequena (lista de listas de valores)."""
+    return [row_values(row.group(1) or b'', shared)
+            for row in re.finditer(rb'<row\b[^>]*?(?:/>|>(.*?)</row>)', xml, re.S)]
+
+
+def aggregates_from_rows(rows: List[list]) -> pd.DataFrame:
+    """Reconstrói os agregados inteiros gravados na aba oculta."""
+    if not rows:
+        return pd.DataFrame(columns=AGGREGATE_COLUMNS)
+    header = [str(name) for name in rows[0]]
+    missing = [col for col in AGGREGATE_COLUMNS if col not in header]
+    if missing:
+        raise ValueError(f"Aba {AGGREGATES_SHEET} incompleta (faltando: {', '.join(missing)})")
+    width = len(header)
+    data = [row + [None] * (width - len(row)) for row in rows[1:]]
+    df = pd.DataFrame(data, columns=header)[AGGREGATE_COLUMNS]
+    df['Vendedor'] = df['Vendedor'].astype(str)
+    df['Produto'] = df['Produto'].astype(str)
+    for col in AGGREGATE_COLUMNS[2:]:
+        df[col] = pd.to_numeric(df[col]).fillna(0).round().astype('int64')
+    return df